@@ -1,3 +1,19 @@
-from .participants import router as participants_router
-from .carry_pools import router as carry_pools_router
-from .customers import router as customers_router
+import importlib
+
+# Routers are imported on demand so disabled ones never load their logic and models
+routers = {
+    "participants": "api.participants",
+    "carry_pools": "api.carry_pools",
+    "customers": "api.customers",
+    "admin": "api.admin",
+}
+
+
+def load_router(name: str):
+    return importlib.import_module(routers[name]).router
+
+
+def __getattr__(name: str):
+    if name.endswith("_router") and name[:-len("_router")] in routers:
+        return load_router(name[:-len("_router")])
+    raise AttributeError(name)
@@ -9,18 +9,24 @@ from fastapi.params import Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common import ObjRef
+from common.admission import admission_class
+from common.coalescer import WriteCoalescer
 from dependencies.accounts import get_balance_limit_per_account
+from dependencies.recharges import get_recharge_coalescer
 from dependencies.db import get_session, get_postgres_session
-from enums import SortOrder
+from enums import SortOrder, RouteClass
 from logic.accounts import Account
 from logic.accounts.business import RetrievedAccount, Address, UnverifiedController, AddressCollection, AddressListing, \
     ListLimit
 from logic.recharges.recharge import Recharge
+from repositories.addresses import address_ids
+from session.query_budget import query_budget
 
 router = APIRouter()
 
 
 @router.get("/accounts", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
 async def list_accounts(
         limit: ListLimit = Query(10, description=""),
         sort: SortOrder = Query(SortOrder.DESC, description=""),
@@ -43,6 +49,7 @@ async def list_accounts(
 
 
 @router.get("/accounts/{address}", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
 async def retrieve_account(address: Address = Path(..., description="Address to retrieve"),
                                session: AsyncSession = Depends(get_session)):
     async with session.begin():
@@ -50,14 +57,17 @@ async def retrieve_account(address: Address = Path(..., description="Address to
 
 
 @router.post("/accounts", status_code=http.HTTPStatus.CREATED)
+@query_budget(statements=3)
 async def create_account(account: Account = Body(..., description="Account data"),
                          balance_limit_per_account = Depends(get_balance_limit_per_account),
                              session: AsyncSession = Depends(get_session)):
     async with session.begin():
         await account.persist_to(session, balance_limit_per_account)
+    address_ids.invalidate(account.address)
 
 
 @router.post("/controllers/{participant_id}/verifications/{address}", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=3)
 async def verify_address_control(participant_id: UUID = Path(..., description="Participant ID"),
                            address: Address = Path(..., description="Address to request"),
                              session: AsyncSession = Depends(get_session)):
@@ -68,15 +78,21 @@ async def verify_address_control(participant_id: UUID = Path(..., description="P
 
 
 @router.post("/accounts/{address}/recharges", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=2)
 async def request_recharge(address: Address = Path(..., description="Address to request"),
-                           session: AsyncSession = Depends(get_session)):
+                           session: AsyncSession = Depends(get_session),
+                           coalescer: WriteCoalescer | None = Depends(get_recharge_coalescer)):
+    recharge = Recharge.waiting_for(address)
+    if coalescer is not None:
+        return ObjRef(id=await coalescer.submit(recharge))
     async with session.begin():
-        recharge = Recharge.waiting_for(address)
         recharge_id = await recharge.persist_to(session)
         return ObjRef(id=recharge_id)
 
 
 @router.patch("/accounts/balances", status_code=http.HTTPStatus.OK)
+@query_budget(statements=0)
+@admission_class(RouteClass.BULK)
 async def update_balances(new_balances: AddressCollection = Body(..., description="Balances to update"),
                           session: Connection = Depends(get_postgres_session)):
     async with session.transaction():
@@ -0,0 +1,80 @@
+import http
+from typing import List
+
+from fastapi import APIRouter, Body, Depends, Path, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.routing import APIRoute
+
+from common.admission import AdmissionStats, limiters
+from common.cache import CacheStats, registry
+from common.coalescer import CoalescerStats, coalescers
+from common.profiling import ProfilerStats, ProfileArming, RouteNotProfilable, profilers, get_profile
+from dependencies.profiling import require_profiling_token
+from dependencies.slow_queries import require_slow_query_token
+from enums import ProfileFormat
+from session.query_budget import query_budget
+from session.replicas import ReplicaRouterStats, replica_routers
+from session.slow_queries import SlowQueryLogStats, slow_query_logs
+
+router = APIRouter(prefix="/admin")
+
+
+@router.get("/caches", status_code=http.HTTPStatus.OK)
+@query_budget(statements=0)
+async def list_caches() -> List[CacheStats]:
+    return [cache.stats() for cache in registry.values()]
+
+
+@router.get("/admission", status_code=http.HTTPStatus.OK)
+@query_budget(statements=0)
+async def list_admission_limiters() -> List[AdmissionStats]:
+    return [limiter.stats() for limiter in limiters.values()]
+
+
+@router.get("/coalescers", status_code=http.HTTPStatus.OK)
+@query_budget(statements=0)
+async def list_write_coalescers() -> List[CoalescerStats]:
+    return [coalescer.stats() for coalescer in coalescers.values()]
+
+
+@router.get("/replicas", status_code=http.HTTPStatus.OK)
+@query_budget(statements=0)
+async def list_replica_routers() -> List[ReplicaRouterStats]:
+    return [replica_router.stats() for replica_router in replica_routers.values()]
+
+
+@router.get("/slow-queries", status_code=http.HTTPStatus.OK, dependencies=[Depends(require_slow_query_token)])
+@query_budget(statements=0)
+async def list_slow_queries() -> List[SlowQueryLogStats]:
+    return [slow_query_log.stats() for slow_query_log in slow_query_logs]
+
+
+@router.get("/profiles", status_code=http.HTTPStatus.OK, dependencies=[Depends(require_profiling_token)])
+@query_budget(statements=0)
+async def list_profiles() -> List[ProfilerStats]:
+    return [profiler.stats() for profiler in profilers]
+
+
+@router.post("/profiles/arm", status_code=http.HTTPStatus.OK, dependencies=[Depends(require_profiling_token)])
+@query_budget(statements=0)
+async def arm_profiler(request: Request, arming: ProfileArming = Body(...)) -> List[ProfilerStats]:
+    routes = {f"{method} {route.path}" for route in request.app.routes if isinstance(route, APIRoute)
+              for method in route.methods}
+    if arming.route not in routes:
+        raise RouteNotProfilable(arming.route)
+    for profiler in profilers:
+        profiler.arm(arming.route, arming.requests)
+    return [profiler.stats() for profiler in profilers]
+
+
+@router.get("/profiles/{profile_id}", status_code=http.HTTPStatus.OK, dependencies=[Depends(require_profiling_token)])
+@query_budget(statements=0)
+async def download_profile(profile_id: int = Path(..., description="Profile ID to download"),
+                           profile_format: ProfileFormat = Query(ProfileFormat.SPEEDSCOPE, alias="format",
+                                                                 description="collapsed stacks or a speedscope file")):
+    profile = get_profile(profile_id)
+    if profile_format == ProfileFormat.COLLAPSED:
+        return PlainTextResponse(profile.collapsed(), headers={
+            "Content-Disposition": f'attachment; filename="profile-{profile_id}.txt"'})
+    return JSONResponse(profile.speedscope(), headers={
+        "Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'})
@@ -12,11 +12,13 @@ from dependencies.db import get_session
 from dependencies.repositories import get_vesting_schedule_repository
 from logic.carry_pools import VestingSchedule
 from repositories.vesting_schedules import Repository
+from session.query_budget import query_budget
 
 router = APIRouter()
 
 
 @router.post("/vesting-schedules", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=2)
 async def create_vesting_schedule(vesting_schedule: VestingSchedule = Body(..., description="Vesting schedule data"),
                                   vesting_schedule_repository: Repository=Depends(get_vesting_schedule_repository),
                                   session: AsyncSession = Depends(get_session)):
@@ -1,6 +1,6 @@
 import http
 from datetime import datetime
-from typing import Set
+from typing import List, Set
 from uuid import UUID
 
 from fastapi import APIRouter, Query, Body
@@ -9,16 +9,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from common import ObjRef
 from dependencies.db import get_session
-from dependencies.repositories import get_customer_repository
+from dependencies.loaders import Loaders, get_loaders
+from dependencies.repositories import get_customer_repository, get_customer_read_repository
 from enums import SortOrder
-from logic.customers import Customer
+from logic.customers import Customer, CustomerListing
 from logic.participants import ListLimit
-from repositories.customers import Repository
+from repositories.customers import Repository, ReadOnlyRepository
+from session.query_budget import query_budget
 
 router = APIRouter()
 
 
 @router.post("/customers", status_code=http.HTTPStatus.CREATED)
+@query_budget(statements=1)
 async def create_customer(customer: Customer = Body(..., description="Customer Data"),
                           customer_repository: Repository=Depends(get_customer_repository),
                           session: AsyncSession = Depends(get_session)):
@@ -28,20 +31,26 @@ async def create_customer(customer: Customer = Body(..., description="Customer D
 
 
 @router.get("/customers/{customer_id}", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
 async def retrieve_customer(customer_id: UUID = Path(..., description="Customer ID"),
                           customer_repository: Repository=Depends(get_customer_repository),
+                          reads: ReadOnlyRepository | None = Depends(get_customer_read_repository),
                           session: AsyncSession = Depends(get_session)):
 
     class RetrievedCustomer(Customer, ObjRef):
         pass
 
-    async with session.begin():
-        customer = await customer_repository.retrieve(customer_id)
+    if reads:
+        customer = await reads.retrieve(customer_id)
+    else:
+        async with session.begin():
+            customer = await customer_repository.retrieve(customer_id)
     d = customer.dict()
     d["id"] = customer_id
     return RetrievedCustomer.parse_obj(d)
 
 @router.patch("/customers/{customer_id}", status_code=http.HTTPStatus.NO_CONTENT)
+@query_budget(statements=2)
 async def update_customer(customer_id: UUID = Path(..., description="Customer ID"),
                           customer: Customer = Body(..., description="Customer data to update"),
                           customer_repository: Repository=Depends(get_customer_repository),
@@ -51,6 +60,7 @@ async def update_customer(customer_id: UUID = Path(..., description="Customer ID
 
 
 @router.get("/customers", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
 async def list_customers(
         customer_repository: Repository=Depends(get_customer_repository),
         limit: ListLimit = Query(10, description=""),
@@ -60,7 +70,15 @@ async def list_customers(
         ),
         timestamp_lt: datetime | None = Query(
             None, description="Only include customers created with timestamps less than this value."
-        ), session: AsyncSession = Depends(get_session)):
+        ),
+        ids: List[UUID] | None = Query(
+            None, description="Return these customers, in this order, instead of a listing. Unknown ids are "
+                              "skipped and the other parameters are ignored."
+        ),
+        session: AsyncSession = Depends(get_session), loaders: Loaders = Depends(get_loaders)):
+    if ids:
+        async with session.begin():
+            return await CustomerListing.from_loader(loaders.customers, ids, ListLimit.le)
     async with session.begin():
         res = await customer_repository.list(limit=limit, sort=sort, timestamp_gt=timestamp_gt, timestamp_lt=timestamp_lt)
     return res
@@ -1,20 +1,36 @@
 import http
 from datetime import datetime
+from typing import List, Set
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Query
+from fastapi import APIRouter, Body, Query, Response
 from fastapi.params import Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.cache import RefreshingCache
+from common.coalescer import WriteCoalescer
+from dependencies.coalescers import get_participant_coalescer, get_app_settings
 from dependencies.db import get_session
-from enums import SortOrder
-from logic.participants import RetrievedParticipant, Participant, ParticipantListing, UpdateParticipant, ListLimit
+from dependencies.loaders import Loaders, get_loaders
+from dependencies.repositories import get_participant_read_repository
+from dependencies.stats import get_participant_stats_cache
+from enums import SortOrder, RouteClass, IdentificationType, ParticipantField
+from logic.participants import RetrievedParticipant, Participant, ParticipantListing, UpdateParticipant, ListLimit, \
+    SearchLimit, SearchTerm, IdentificationLookup, IdentificationMatches, ParticipantStats
+from logic.participants.natural_person import Identification
 from common import ObjRef
+from common.admission import admission_class
+from common.single_flight import single_flight
+from repositories import ParticipantReadOnlyRepository
+from session.query_budget import query_budget
+from settings import AppSettings
 
 router = APIRouter()
 
 
 @router.get("/participants", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
+@single_flight
 async def list_participants(
         limit: ListLimit = Query(10, description=""),
         sort: SortOrder = Query(SortOrder.DESC, description=""),
@@ -26,20 +42,86 @@ async def list_participants(
         ),
         timestamp_lt: datetime | None = Query(
             None, description="Only include participants created with timestamps less than this value."
-        ), session: AsyncSession = Depends(get_session)):
+        ),
+        ids: List[UUID] | None = Query(
+            None, description="Return these participants, in this order, instead of a listing. Unknown ids are "
+                              "skipped and the other parameters are ignored."
+        ),
+        fields: Set[ParticipantField] | None = Query(
+            None, description="Only return these fields of each participant. Fields a participant's type does not "
+                              "have are left out."
+        ),
+        session: AsyncSession = Depends(get_session), loaders: Loaders = Depends(get_loaders),
+        app_settings: AppSettings = Depends(get_app_settings)):
+    if ids:
+        async with session.begin():
+            return await ParticipantListing.from_loader(loaders.participants, ids)
+    if app_settings.database_json_rendering and not fields:
+        async with session.begin():
+            body = await ParticipantListing.render_from_persistance(
+                persistance=session, limit=limit, sort=sort, verified=verified, timestamp_gt=timestamp_gt,
+                timestamp_lt=timestamp_lt)
+        return Response(content=body, media_type="application/json")
     async with session.begin():
         res = await ParticipantListing.from_persistance(persistance=session, limit=limit, sort=sort, verified=verified,
-                                                        timestamp_gt=timestamp_gt, timestamp_lt=timestamp_lt)
+                                                        timestamp_gt=timestamp_gt, timestamp_lt=timestamp_lt,
+                                                        fields=fields)
     return res
 
+@router.get("/stats/participants", status_code=http.HTTPStatus.OK, response_model=ParticipantStats)
+@query_budget(statements=0)
+async def participant_stats(
+        estimated: bool = Query(False, description="Return the planner's estimated total instead of exact counts by "
+                                                   "type and verification. Instant on very large tables."),
+        stats: RefreshingCache = Depends(get_participant_stats_cache)):
+    return await stats.get(estimated)
+
+
+@router.get("/participants/search", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
+async def search_participants(
+        q: SearchTerm = Query(..., description="Name, DNI or CUIT (or part of one) to search for"),
+        limit: SearchLimit = Query(20, description="Maximum number of participants to return"),
+        session: AsyncSession = Depends(get_session)):
+    async with session.begin():
+        return await ParticipantListing.from_search(session, q, limit)
+
+
+@router.get("/participants/by-identification/{type}/{value}", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
+@single_flight
+async def retrieve_participant_by_identification(
+        type: IdentificationType = Path(..., description="Identification type"),
+        value: str = Path(..., description="Identification number"),
+        session: AsyncSession = Depends(get_session)):
+    async with session.begin():
+        return await RetrievedParticipant.from_identification(Identification(type=type, value=value), session)
+
+
+@router.post("/participants/by-identification", status_code=http.HTTPStatus.OK, response_model=IdentificationMatches)
+@query_budget(statements=1)
+@admission_class(RouteClass.BULK)
+async def lookup_participants_by_identification(
+        lookup: IdentificationLookup = Body(..., description="Identifications to look up"),
+        session: AsyncSession = Depends(get_session)):
+    async with session.begin():
+        return await lookup.from_persistance(session)
+
+
 @router.get("/participants/{participant_id}", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
+@single_flight
 async def retrieve_participant(participant_id: UUID = Path(..., description="Participant ID to retrieve"),
-                               session: AsyncSession = Depends(get_session)):
+                               session: AsyncSession = Depends(get_session),
+                               reads: ParticipantReadOnlyRepository | None = Depends(get_participant_read_repository)):
+    if reads:
+        return await reads.retrieve(participant_id)
     async with session.begin():
         return await RetrievedParticipant.from_persistance(participant_id, persistance=session)
 
 
 @router.patch("/participants/{participant_id}", status_code=http.HTTPStatus.NO_CONTENT)
+@query_budget(statements=1)
 async def update_participant(
         participant_id: UUID = Path(..., description="Participant ID to update"),
         participant: UpdateParticipant = Body(..., description="Participant data"),
@@ -49,16 +131,20 @@ async def update_participant(
 
 
 @router.post("/participants", status_code=http.HTTPStatus.CREATED)
+@query_budget(statements=1)
 async def create_participant(participant: Participant = Body(..., description="Participant data"),
-                             session: AsyncSession = Depends(get_session)):
+                             session: AsyncSession = Depends(get_session),
+                             coalescer: WriteCoalescer | None = Depends(get_participant_coalescer)):
+    if coalescer is not None:
+        return ObjRef(id=await coalescer.submit(participant))
     async with session.begin():
         participant_id = await participant.persist_to(session)
     return ObjRef(id=participant_id)
 
 
 @router.delete("/participants/{participant_id}", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=1)
 async def disable_participant(session: AsyncSession = Depends(get_session), participant_id: UUID = Path(..., description="Participant ID to disable"),):
     async with session.begin():
-        participant = await RetrievedParticipant.from_persistance(participant_id=participant_id, persistance=session)
-        participant.disable()
+        await RetrievedParticipant.disable(participant_id, persistance=session)
     return ObjRef(id=participant_id)
\ No newline at end of file
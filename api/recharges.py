@@ -3,21 +3,31 @@ from datetime import datetime
 from typing import Set
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 from fastapi.params import Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common import ObjRef
+from common.cache import RefreshingCache
+from common.coalescer import WriteCoalescer
+from dependencies.recharges import get_recharge_coalescer, get_recharge_stats_cache, get_recharge_read_repository
+from dependencies.coalescers import get_app_settings
 from dependencies.db import get_session
-from enums import SortOrder, RechargeStatus
+from dependencies.loaders import Loaders, get_loaders
+from enums import SortOrder, RechargeStatus, RechargeField
 from logic.accounts.business import Address
 from logic.participants import ListLimit
+from logic.recharges import RechargeStats
 from logic.recharges.recharge import Recharge, RetrievedRecharge, RetrievedWaitingRecharge, RechargeListing
+from repositories.recharges import ReadOnlyRepository as RechargeReadOnlyRepository
+from session.query_budget import query_budget
+from settings import AppSettings
 
 router = APIRouter()
 
 
 @router.get("/recharges", status_code=http.HTTPStatus.OK)
+@query_budget(statements=2)
 async def list_recharges(
         limit: ListLimit = Query(10, description=""),
         sort: SortOrder = Query(SortOrder.DESC, description=""),
@@ -31,23 +41,52 @@ async def list_recharges(
         timestamp_lt: datetime | None = Query(
             None, description="Only include recharges created with timestamps less than this value."
         ),
-        session: AsyncSession = Depends(get_session)):
+        with_participants: bool = Query(
+            False, description="Also return the participants controlling this page's addresses."
+        ),
+        fields: Set[RechargeField] | None = Query(None, description="Only return these fields of each recharge"),
+        session: AsyncSession = Depends(get_session), loaders: Loaders = Depends(get_loaders),
+        app_settings: AppSettings = Depends(get_app_settings)):
+    if app_settings.database_json_rendering and not fields and not with_participants:
+        async with session.begin():
+            body = await RechargeListing.render_from_persistance(
+                persistance=session, limit=limit, sort=sort, status=status, addresses=addresses,
+                recharge_ids=recharge_ids, participant_ids=participant_ids, timestamp_gt=timestamp_gt,
+                timestamp_lt=timestamp_lt)
+        return Response(content=body, media_type="application/json")
     async with session.begin():
         res = await RechargeListing.from_persistance(persistance=session, limit=limit, sort=sort, status=status,
                                                      addresses=addresses, recharge_ids=recharge_ids,
                                                      participant_ids=participant_ids, timestamp_gt=timestamp_gt,
-                                                     timestamp_lt=timestamp_lt)
+                                                     timestamp_lt=timestamp_lt, fields=fields,
+                                                     with_participants=with_participants)
+        if with_participants:
+            await res.load_participants(loaders.participants)
     return res
 
 
+@router.get("/stats/recharges", status_code=http.HTTPStatus.OK, response_model=RechargeStats)
+@query_budget(statements=0)
+async def recharge_stats(
+        estimated: bool = Query(False, description="Return the planner's estimated total instead of exact counts by "
+                                                   "status. Instant on very large tables."),
+        stats: RefreshingCache = Depends(get_recharge_stats_cache)):
+    return await stats.get(estimated)
+
+
 @router.get("/recharges/{recharge_id}", status_code=http.HTTPStatus.OK)
+@query_budget(statements=1)
 async def retrieve_recharge(recharge_id: UUID = Path(..., description="Recharge to retrieve"),
-                            session: AsyncSession = Depends(get_session)):
+                            session: AsyncSession = Depends(get_session),
+                            reads: RechargeReadOnlyRepository | None = Depends(get_recharge_read_repository)):
+    if reads:
+        return await reads.retrieve(recharge_id)
     async with session.begin():
         return await RetrievedRecharge.from_persistance(recharge_id, persistance=session)
 
 
 @router.post("/recharges/{recharge_id}/satisfy", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=3)
 async def satisfy_recharge(recharge_id: UUID = Path(..., description="Recharge ID"),
                              session: AsyncSession = Depends(get_session)):
     async with session.begin():
@@ -57,6 +96,7 @@ async def satisfy_recharge(recharge_id: UUID = Path(..., description="Recharge I
 
 
 @router.post("/recharges/{recharge_id}/reject", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=3)
 async def satisfy_recharge(recharge_id: UUID = Path(..., description="Recharge ID"),
                              session: AsyncSession = Depends(get_session)):
     async with session.begin():
@@ -66,9 +106,13 @@ async def satisfy_recharge(recharge_id: UUID = Path(..., description="Recharge I
 
 
 @router.post("/accounts/{address}/recharges", status_code=http.HTTPStatus.ACCEPTED)
+@query_budget(statements=2)
 async def request_recharge(address: Address = Path(..., description="Address to request"),
-                           session: AsyncSession = Depends(get_session)):
+                           session: AsyncSession = Depends(get_session),
+                           coalescer: WriteCoalescer | None = Depends(get_recharge_coalescer)):
+    recharge = Recharge.waiting_for(address)
+    if coalescer is not None:
+        return ObjRef(id=await coalescer.submit(recharge))
     async with session.begin():
-        recharge = Recharge.waiting_for(address)
         recharge_id = await recharge.persist_to(session)
         return ObjRef(id=recharge_id)
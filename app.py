@@ -1,12 +1,27 @@
-import sentry_sdk
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.starlette import StarletteIntegration
+from sqlalchemy.orm import configure_mappers
 
+from api import load_router, routers
+from common.admission import install_admission_control
+from common.profiling import install_profiling
+from common.single_flight import SingleFlightMiddleware
+from common.tracing import install_tracing
 from exceptions import install_handlers_into_app
+from session.replicas import STICKY_COOKIE
+from session.slow_queries import install_slow_query_log
 from settings import AppSettings
-from api import participants_router, carry_pools_router, customers_router
+
+
+def install_sentry(settings: AppSettings):
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.starlette import StarletteIntegration
+
+    sentry_sdk.init(
+        dsn=settings.sentry_dsn, integrations=[StarletteIntegration(), FastApiIntegration()]
+    )
+
 
 def get_app(settings: AppSettings, lifespan):
 
@@ -15,6 +30,15 @@ def get_app(settings: AppSettings, lifespan):
         lifespan=lifespan
     )
 
+    if settings.admission_control:
+        install_admission_control(app, settings)
+    # Clients that wrote recently read from the primary, so they must not share a replica read
+    app.add_middleware(SingleFlightMiddleware, routes=app.router.routes, bypass_cookies=(STICKY_COOKIE,))
+    if settings.slow_query_threshold_ms is not None:
+        install_slow_query_log(app, settings)
+    if settings.profiling:
+        install_profiling(app, settings)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.api_cors_origins,
@@ -23,12 +47,15 @@ def get_app(settings: AppSettings, lifespan):
         allow_headers=["*"],
     )
 
-    sentry_sdk.init(
-        dsn=settings.sentry_dsn, integrations=[StarletteIntegration(), FastApiIntegration()]
-    )
+    if settings.sentry_dsn:
+        install_sentry(settings)
+    if settings.tracing:
+        install_tracing(app, settings)
 
-    app.include_router(participants_router)
-    app.include_router(carry_pools_router)
-    app.include_router(customers_router)
+    for name in routers:
+        if name not in settings.disabled_routers:
+            app.include_router(load_router(name))
     install_handlers_into_app(app)
+    # Resolve ORM relationships now rather than on the first request that touches a model
+    configure_mappers()
     return app
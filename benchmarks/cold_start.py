@@ -0,0 +1,67 @@
+"""Measure cold start: time from launching ``server.py`` to the first successful ``GET /participants``.
+
+    python -m benchmarks.cold_start --runs 5 --workers 1
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.stats import percentile
+
+
+def measure(port: int, workers: int, timeout: float) -> dict:
+    env = dict(os.environ, SERVER_PORT=str(port), SERVER_WORKERS=str(workers), SERVER_HOST="127.0.0.1")
+    launched = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "server.py"], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        attempts = 0
+        while time.perf_counter() - launched < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode} before serving a request")
+            attempts += 1
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/participants", params={"limit": 1}, timeout=1)
+                if response.status_code == 200:
+                    return {"cold_start_s": round(time.perf_counter() - launched, 4), "attempts": attempts}
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"no successful GET /participants within {timeout}s")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        shutdown_started = time.perf_counter()
+        process.wait(timeout=60)
+        shutdown = time.perf_counter() - shutdown_started
+        print(f"shutdown took {shutdown:.3f}s", file=sys.stderr)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Measure server cold start time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    runs = [measure(args.port, args.workers, args.timeout) for _ in range(args.runs)]
+    timings = sorted(run["cold_start_s"] for run in runs)
+    print(json.dumps({
+        "workers": args.workers,
+        "runs": runs,
+        "p50_s": percentile(timings, 50),
+        "max_s": timings[-1],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
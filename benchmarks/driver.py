@@ -0,0 +1,207 @@
+"""Drive every API route at a controlled concurrency and report latency percentiles as JSON.
+
+    python -m benchmarks.driver --base-url http://localhost:8000 --concurrency 32 --duration 30
+
+Ids for path parameters are sampled from the database the app is running against,
+so seed it first with ``python -m benchmarks.seed``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+import asyncpg
+import httpx
+
+from benchmarks.stats import LatencyRecorder
+from settings import DatabaseSettings
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    build: Callable[["Fixtures", random.Random], dict]
+    weight: int = 1
+
+
+class Fixtures:
+    SAMPLE_SIZE = 1000
+
+    def __init__(self):
+        self.ids: Dict[str, List] = {}
+
+    async def load(self, settings: DatabaseSettings):
+        connection = await asyncpg.connect(user=settings.db_username, password=settings.db_password,
+                                           database=settings.db_name, host=settings.db_hostname,
+                                           port=settings.db_port)
+        try:
+            for key, query in {
+                "participants": "SELECT id FROM participants LIMIT $1",
+                "typed_participants": "SELECT id, type::text FROM participants WHERE disabled_at IS NULL LIMIT $1",
+                "customers": "SELECT id FROM customers LIMIT $1",
+                "milestones": "SELECT id FROM milestones LIMIT $1",
+                "addresses": "SELECT public_key FROM addresses LIMIT $1",
+                "controllers": "SELECT participant_id, a.public_key FROM account_controllers "
+                               "JOIN addresses a ON a.id = address_id LIMIT $1",
+                "recharges": "SELECT id FROM recharges LIMIT $1",
+            }.items():
+                try:
+                    self.ids[key] = [tuple(str(value) for value in row.values()) if len(row) > 1 else str(row[0])
+                                     for row in await connection.fetch(query, self.SAMPLE_SIZE)]
+                except (asyncpg.UndefinedTableError, asyncpg.UndefinedColumnError):
+                    self.ids[key] = []
+        finally:
+            await connection.close()
+
+    def pick(self, key: str, rng: random.Random):
+        values = self.ids.get(key)
+        if not values:
+            raise LookupError(key)
+        return rng.choice(values)
+
+
+def random_address(rng: random.Random):
+    return "0x" + "".join(rng.choice("0123456789abcdef") for _ in range(40))
+
+
+# Partial updates dispatch on ``type``, which has to match the participant's own
+UPDATE_BODIES = {
+    "NATURAL_PERSON": {"type": "NATURAL_PERSON", "last_name": "Renamed"},
+    "COMPANY": {"type": "COMPANY", "full_name": "Renamed"},
+    "GOVERNMENT_ORGANISM": {"type": "GOVERNMENT_ORGANISM", "full_name": "Renamed"},
+    "ACADEMIC": {"type": "ACADEMIC", "full_name": "Renamed"},
+}
+
+
+def participant_update(fixtures: "Fixtures", rng: random.Random):
+    participant_id, participant_type = fixtures.pick("typed_participants", rng)
+    return dict(url=f"/participants/{participant_id}", json=UPDATE_BODIES[participant_type])
+
+
+SCENARIOS = [
+    Scenario("GET /participants", "GET", lambda f, r: dict(url="/participants",
+                                                           params={"limit": r.choice([10, 100]), "sort": "desc"}),
+             weight=4),
+    Scenario("GET /participants/{participant_id}", "GET",
+             lambda f, r: dict(url=f"/participants/{f.pick('participants', r)}"), weight=4),
+    Scenario("POST /participants", "POST", lambda f, r: dict(url="/participants", json=r.choice([
+        {"type": "NATURAL_PERSON", "first_name": "Bench", "last_name": "Mark",
+         "identification": {"type": "DNI", "value": str(r.randint(10 ** 7, 10 ** 8 - 1))}},
+        {"type": "COMPANY", "full_name": "Bench Co", "cuit": str(r.randint(10 ** 10, 10 ** 11 - 1))},
+        {"type": "GOVERNMENT_ORGANISM", "full_name": "Bench Direction", "sector": "National"},
+        {"type": "ACADEMIC", "full_name": "Bench University", "education_level": "UNIVERSITY"},
+    ])), weight=2),
+    Scenario("PATCH /participants/{participant_id}", "PATCH", participant_update),
+    Scenario("DELETE /participants/{participant_id}", "DELETE",
+             lambda f, r: dict(url=f"/participants/{f.pick('participants', r)}")),
+    Scenario("GET /customers", "GET", lambda f, r: dict(url="/customers", params={"limit": 10})),
+    Scenario("GET /customers/{customer_id}", "GET",
+             lambda f, r: dict(url=f"/customers/{f.pick('customers', r)}"), weight=2),
+    Scenario("POST /customers", "POST", lambda f, r: dict(url="/customers", json={"name": "Bench customer"})),
+    Scenario("PATCH /customers/{customer_id}", "PATCH",
+             lambda f, r: dict(url=f"/customers/{f.pick('customers', r)}", json={"name": "Renamed customer"})),
+    Scenario("POST /vesting-schedules", "POST", lambda f, r: dict(url="/vesting-schedules", json={
+        "name": "Bench schedule", "description": None, "company": f.pick("customers", r),
+        "vesting_percentage": "10", "milestone": f.pick("milestones", r)})),
+    Scenario("GET /accounts", "GET", lambda f, r: dict(url="/accounts", params={"limit": 10}), weight=2),
+    Scenario("GET /accounts/{address}", "GET", lambda f, r: dict(url=f"/accounts/{f.pick('addresses', r)}"),
+             weight=2),
+    Scenario("POST /accounts", "POST", lambda f, r: dict(url="/accounts", json={
+        "address": random_address(r), "participant_id": f.pick("participants", r), "balance": "0"})),
+    Scenario("POST /controllers/{participant_id}/verifications/{address}", "POST",
+             lambda f, r: dict(url="/controllers/{}/verifications/{}".format(*f.pick("controllers", r)))),
+    Scenario("PATCH /accounts/balances", "PATCH", lambda f, r: dict(url="/accounts/balances", json={
+        "addresses": [{"address": f.pick("addresses", r), "balance": str(r.randint(0, 1000))} for _ in range(10)]})),
+    Scenario("POST /accounts/{address}/recharges", "POST",
+             lambda f, r: dict(url=f"/accounts/{f.pick('addresses', r)}/recharges"), weight=4),
+    Scenario("GET /recharges", "GET", lambda f, r: dict(url="/recharges", params={"limit": 10, "status": "WAITING"}),
+             weight=2),
+    Scenario("GET /recharges/{recharge_id}", "GET", lambda f, r: dict(url=f"/recharges/{f.pick('recharges', r)}"),
+             weight=2),
+    Scenario("POST /recharges/{recharge_id}/satisfy", "POST",
+             lambda f, r: dict(url=f"/recharges/{f.pick('recharges', r)}/satisfy")),
+    Scenario("POST /recharges/{recharge_id}/reject", "POST",
+             lambda f, r: dict(url=f"/recharges/{f.pick('recharges', r)}/reject")),
+]
+
+
+async def worker(client: httpx.AsyncClient, scenarios: List[Scenario], fixtures: Fixtures, recorder: LatencyRecorder,
+                 deadline: float, remaining: List[int], rng: random.Random):
+    weights = [scenario.weight for scenario in scenarios]
+    while time.perf_counter() < deadline and remaining[0] != 0:
+        remaining[0] -= 1
+        scenario = rng.choices(scenarios, weights)[0]
+        request = scenario.build(fixtures, rng)
+        started = time.perf_counter()
+        try:
+            response = await client.request(scenario.method, **request)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        recorder.record(scenario.name, time.perf_counter() - started, status)
+
+
+def has_fixtures(scenario: Scenario, fixtures: Fixtures) -> bool:
+    try:
+        scenario.build(fixtures, random.Random(0))
+    except LookupError:
+        return False
+    return True
+
+
+async def run(args, client: httpx.AsyncClient, fixtures: Fixtures):
+    scenarios = [scenario for scenario in SCENARIOS if not args.routes or any(r in scenario.name for r in args.routes)]
+    # Scenarios whose ids could not be sampled are left out up front rather than retried in a busy loop
+    skipped = [scenario.name for scenario in scenarios if not has_fixtures(scenario, fixtures)]
+    scenarios = [scenario for scenario in scenarios if scenario.name not in skipped]
+    recorder = LatencyRecorder()
+    remaining = [args.requests or -1]
+    started = time.perf_counter()
+    deadline = started + args.duration
+    if scenarios:
+        await asyncio.gather(*(worker(client, scenarios, fixtures, recorder, deadline, remaining,
+                                      random.Random(args.seed + i)) for i in range(args.concurrency)))
+    report = recorder.summary(time.perf_counter() - started)
+    report["concurrency"] = args.concurrency
+    report["skipped"] = skipped
+    return report
+
+
+async def main_async(args):
+    fixtures = Fixtures()
+    await fixtures.load(DatabaseSettings())
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        return await run(args, client, fixtures)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Exercise every route and report latency percentiles as JSON.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run for")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0: no limit)")
+    parser.add_argument("--routes", nargs="*", help="Only run scenarios whose name contains one of these")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    report = asyncio.run(main_async(args))
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(rendered)
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
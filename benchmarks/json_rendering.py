@@ -0,0 +1,84 @@
+"""Compare the ORM listing path behind ``GET /participants`` with Postgres rendering the response body.
+
+    python -m benchmarks.json_rendering --limit 1000 --concurrency 8 --duration 10
+
+Both paths produce the bytes the endpoint would send for the same listing, each in its own transaction,
+against the database from ``DatabaseSettings`` (seed it with ``benchmarks.seed`` first). The report has
+one entry per path and the size of the bodies they produced.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from benchmarks.stats import LatencyRecorder
+from enums import SortOrder
+from logic.participants import ParticipantListing
+from session.connection import generate_db_url, get_async_session, get_engine, dispose_engines
+from settings import DatabaseSettings
+
+
+async def render_with_orm(session, limit: int, sort: SortOrder) -> bytes:
+    listing = await ParticipantListing.from_persistance(session, limit=limit, sort=sort)
+    return JSONResponse(jsonable_encoder(listing)).body
+
+
+async def render_with_database(session, limit: int, sort: SortOrder) -> bytes:
+    return await ParticipantListing.render_from_persistance(session, limit=limit, sort=sort)
+
+
+PATHS = {"orm": render_with_orm, "database": render_with_database}
+
+
+async def worker(name: str, sessionmaker, recorder: LatencyRecorder, deadline: float, args, sizes: dict):
+    render = PATHS[name]
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        async with sessionmaker() as session, session.begin():
+            body = await render(session, args.limit, args.sort)
+        recorder.record(name, time.perf_counter() - started, 200)
+        sizes[name] = len(body)
+
+
+async def main_async(args):
+    database_url = generate_db_url(DatabaseSettings())
+    # The engine echoes every statement, which would dominate the measurement
+    get_engine(database_url).echo = False
+    sessionmaker = get_async_session(database_url)
+    report = {}
+    sizes = {}
+    try:
+        for name in args.paths:
+            recorder = LatencyRecorder()
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(name, sessionmaker, recorder, started + args.duration, args, sizes)
+                                   for _ in range(args.concurrency)))
+            report[name] = recorder.summary(time.perf_counter() - started)["routes"][name]
+            report[name]["body_bytes"] = sizes.get(name)
+    finally:
+        await dispose_engines()
+    report["limit"] = args.limit
+    report["concurrency"] = args.concurrency
+    return report
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Compare ORM and database-rendered participant listings.")
+    parser.add_argument("--limit", type=int, default=1000, help="Participants per listing")
+    parser.add_argument("--sort", type=SortOrder, default=SortOrder.DESC)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run each path for")
+    parser.add_argument("--paths", nargs="*", choices=list(PATHS), default=list(PATHS))
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare the write path behind ``POST /participants`` with the per-row ORM flush it replaced.
+
+    python -m benchmarks.participant_inserts --concurrency 16 --duration 10
+
+Both paths persist the same payloads as the driver's ``POST /participants`` scenario, each in its own
+transaction, against the database from ``DatabaseSettings``. The report has one entry per path.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.driver import SCENARIOS
+from benchmarks.stats import LatencyRecorder
+from logic.participants import Participant, NaturalPersonParticipant, AcademicParticipant
+from models import Participant as ParticipantModel, NaturalPerson, Identification, Company, GovernmentOrganism, \
+    Academic
+from session.connection import generate_db_url, get_async_session, get_engine, dispose_engines
+from settings import DatabaseSettings
+
+PAYLOAD_SCENARIO = next(scenario for scenario in SCENARIOS if scenario.name == "POST /participants")
+SUBTYPES = {"COMPANY": Company, "GOVERNMENT_ORGANISM": GovernmentOrganism, "ACADEMIC": Academic}
+
+
+async def persist_with_statement(participant: Participant, session):
+    await participant.persist_to(session)
+
+
+async def persist_with_flush(participant: Participant, session):
+    """The previous write path: one ORM object per table, inserted row by row at flush."""
+    participant = participant.__root__
+    if isinstance(participant, AcademicParticipant):
+        participant = participant.__root__
+    row = ParticipantModel(is_verified=False, type=participant.type)
+    session.add(row)
+    await session.flush()
+    values = participant.dict(exclude={"type", "identification"})
+    if isinstance(participant, NaturalPersonParticipant):
+        person = NaturalPerson(participant_id=row.id, **values)
+        session.add(person)
+        await session.flush()
+        session.add(Identification(person_id=person.id, **participant.identification.dict()))
+    else:
+        session.add(SUBTYPES[participant.type](participant_id=row.id, **values))
+    await session.flush()
+
+
+PATHS = {"statement": persist_with_statement, "flush": persist_with_flush}
+
+
+async def worker(name: str, sessionmaker, recorder: LatencyRecorder, deadline: float, rng: random.Random):
+    persist = PATHS[name]
+    while time.perf_counter() < deadline:
+        participant = Participant.parse_obj(PAYLOAD_SCENARIO.build(None, rng)["json"])
+        started = time.perf_counter()
+        async with sessionmaker() as session, session.begin():
+            await persist(participant, session)
+        recorder.record(name, time.perf_counter() - started, 201)
+
+
+async def main_async(args):
+    database_url = generate_db_url(DatabaseSettings())
+    # The engine echoes every statement, which would dominate the measurement
+    get_engine(database_url).echo = False
+    sessionmaker = get_async_session(database_url)
+    report = {}
+    try:
+        for name in args.paths:
+            recorder = LatencyRecorder()
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(name, sessionmaker, recorder, started + args.duration,
+                                          random.Random(args.seed + i)) for i in range(args.concurrency)))
+            report[name] = recorder.summary(time.perf_counter() - started)["routes"][name]
+    finally:
+        await dispose_engines()
+    report["concurrency"] = args.concurrency
+    return report
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Compare participant creation write paths.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run each path for")
+    parser.add_argument("--paths", nargs="*", choices=list(PATHS), default=list(PATHS))
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare single-entity lookups through the ORM session with the raw asyncpg read repositories.
+
+    python -m benchmarks.raw_reads --concurrency 16 --duration 10
+
+Each path looks up random existing participants (and customers, with ``--entities customers``) from the
+database in ``DatabaseSettings``, seeded with ``benchmarks.seed``, and builds the response model the
+endpoint returns. The report has one entry per entity and path.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import select
+
+from benchmarks.stats import LatencyRecorder
+from logic.participants import RetrievedParticipant
+from models import Participant as ParticipantModel
+from models.customers import Customer as CustomerModel
+from repositories import CustomerRepository, CustomerReadOnlyRepository, ParticipantReadOnlyRepository
+from session.connection import generate_db_url, get_async_session, get_engine, dispose_engines
+from settings import DatabaseSettings
+
+
+async def participant_with_orm(sessionmaker, _, participant_id):
+    async with sessionmaker() as session, session.begin():
+        return await RetrievedParticipant.from_persistance(participant_id, session)
+
+
+async def participant_with_raw_reads(_, engine, participant_id):
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        return await ParticipantReadOnlyRepository(raw_connection.driver_connection).retrieve(participant_id)
+
+
+async def customer_with_orm(sessionmaker, _, customer_id):
+    async with sessionmaker() as session, session.begin():
+        return await CustomerRepository(session).retrieve(customer_id)
+
+
+async def customer_with_raw_reads(_, engine, customer_id):
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        return await CustomerReadOnlyRepository(raw_connection.driver_connection).retrieve(customer_id)
+
+
+ENTITIES = {
+    "participants": (ParticipantModel, {"orm": participant_with_orm, "raw": participant_with_raw_reads}),
+    "customers": (CustomerModel, {"orm": customer_with_orm, "raw": customer_with_raw_reads}),
+}
+
+
+async def worker(key: str, lookup, sessionmaker, engine, ids, recorder: LatencyRecorder, deadline: float,
+                 rng: random.Random):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await lookup(sessionmaker, engine, rng.choice(ids))
+        recorder.record(key, time.perf_counter() - started, 200)
+
+
+async def main_async(args):
+    database_url = generate_db_url(DatabaseSettings())
+    engine = get_engine(database_url)
+    # The engine echoes every statement, which would dominate the measurement
+    engine.echo = False
+    sessionmaker = get_async_session(database_url)
+    report = {}
+    try:
+        for entity in args.entities:
+            model, paths = ENTITIES[entity]
+            async with sessionmaker() as session:
+                ids = (await session.execute(select(model.id).limit(args.ids))).scalars().all()
+            if not ids:
+                raise SystemExit(f"No {entity} to look up, seed the database first")
+            for name, lookup in paths.items():
+                key = f"{entity}:{name}"
+                recorder = LatencyRecorder()
+                started = time.perf_counter()
+                await asyncio.gather(*(worker(key, lookup, sessionmaker, engine, ids, recorder,
+                                              started + args.duration, random.Random(args.seed + i))
+                                       for i in range(args.concurrency)))
+                report[key] = recorder.summary(time.perf_counter() - started)["routes"][key]
+    finally:
+        await dispose_engines()
+    report["concurrency"] = args.concurrency
+    return report
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Compare ORM and raw asyncpg single-entity lookups.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run each path for")
+    parser.add_argument("--entities", nargs="*", choices=list(ENTITIES), default=["participants"])
+    parser.add_argument("--ids", type=int, default=10000, help="Existing ids to pick lookups from")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Replay a captured traffic log against the app and report latencies per route template.
+
+Each line of the log is a JSON object such as::
+
+    {"method": "GET", "path": "/participants?limit=10", "body": null, "timestamp": "2024-01-01T10:00:00Z", "status": 200}
+
+``timestamp`` may be an ISO datetime or epoch seconds; ``status`` is optional and, when
+present, responses whose status differs are reported under ``status_diff``. Paths are grouped
+by the route templates the target publishes in ``/openapi.json``.
+
+    python -m benchmarks.replay traffic.jsonl --in-process --pacing original --speed 2
+    python -m benchmarks.replay traffic.jsonl --base-url http://localhost:8000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+import httpx
+from pydantic import BaseModel
+from starlette.routing import compile_path
+
+from benchmarks.stats import LatencyRecorder
+
+
+class ReplayRecord(BaseModel):
+    method: str
+    path: str
+    body: dict | list | str | None = None
+    timestamp: datetime | float | None = None
+    status: int | None = None
+
+    @property
+    def offset(self) -> float | None:
+        if self.timestamp is None:
+            return None
+        if isinstance(self.timestamp, datetime):
+            return self.timestamp.timestamp()
+        return float(self.timestamp)
+
+
+def load_records(path: str) -> List[ReplayRecord]:
+    with open(path) as log:
+        return [ReplayRecord.parse_raw(line) for line in log if line.strip()]
+
+
+class RouteTemplates:
+    """Resolves concrete paths to the templated path of the app route that serves them."""
+
+    def __init__(self, templates: Iterable[Tuple[str, str]]):
+        self.templates = [(method.upper(), path, compile_path(path)[0]) for method, path in templates]
+
+    @classmethod
+    async def from_openapi(cls, client: httpx.AsyncClient) -> "RouteTemplates":
+        """The templates the server publishes, so replaying over HTTP does not need to build the app."""
+        res = await client.get("/openapi.json")
+        if res.status_code != 200:
+            return cls(())
+        return cls((method, path) for path, operations in res.json().get("paths", {}).items()
+                   for method in operations)
+
+    def resolve(self, method: str, path: str) -> str:
+        method, path = method.upper(), path.split("?", 1)[0]
+        for route_method, template, regex in self.templates:
+            if route_method == method and regex.match(path):
+                return f"{method} {template}"
+        return f"{method} {path}"
+
+
+class Replayer:
+    def __init__(self, client: httpx.AsyncClient, templates: RouteTemplates):
+        self.client = client
+        self.templates = templates
+        self.recorder = LatencyRecorder()
+        self.status_diff = defaultdict(Counter)
+
+    async def send(self, record: ReplayRecord):
+        route = self.templates.resolve(record.method, record.path)
+        kwargs = {}
+        if isinstance(record.body, (dict, list)):
+            kwargs["json"] = record.body
+        elif record.body is not None:
+            kwargs["content"] = record.body
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(record.method.upper(), record.path, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        self.recorder.record(route, time.perf_counter() - started, status)
+        if record.status is not None and record.status != status:
+            self.status_diff[route][f"{record.status}->{status}"] += 1
+
+    async def replay_paced(self, records: List[ReplayRecord], speed: float):
+        records = sorted(records, key=lambda record: record.offset or 0)
+        first = records[0].offset or 0
+        started = time.perf_counter()
+        pending = []
+        for record in records:
+            delay = ((record.offset or first) - first) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            pending.append(asyncio.create_task(self.send(record)))
+        await asyncio.gather(*pending)
+
+    async def replay_fast(self, records: List[ReplayRecord], concurrency: int):
+        queue = iter(records)
+
+        async def client_loop():
+            for record in queue:
+                await self.send(record)
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    def report(self, wall_time: float) -> dict:
+        report = self.recorder.summary(wall_time)
+        report["status_diff"] = {route: dict(diff) for route, diff in sorted(self.status_diff.items())}
+        return report
+
+
+async def replay(args, records: List[ReplayRecord]):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.in_process:
+        # Building the app needs the database settings, so only in-process replays import it
+        from main import app
+
+        client = httpx.AsyncClient(app=app, base_url="http://replay", timeout=args.timeout)
+        lifespan = app.router.lifespan_context(app)
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout)
+        lifespan = nullcontext()
+
+    async with client, lifespan:
+        templates = await RouteTemplates.from_openapi(client)
+        replayer = Replayer(client, templates)
+        started = time.perf_counter()
+        if args.pacing == "original":
+            await replayer.replay_paced(records, args.speed)
+        else:
+            await replayer.replay_fast(records, args.concurrency)
+        report = replayer.report(time.perf_counter() - started)
+    report["mode"] = "in-process" if args.in_process else args.base_url
+    report["pacing"] = args.pacing
+    return report
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Replay a JSONL traffic log against the app.")
+    parser.add_argument("log", help="JSONL file of method/path/body/timestamp records")
+    parser.add_argument("--in-process", action="store_true", help="Drive the ASGI app directly instead of over HTTP")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--pacing", choices=("original", "fast"), default="fast",
+                        help="original: keep the recorded inter-arrival times; fast: as fast as possible")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression factor for original pacing")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients for fast pacing")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    records = load_records(args.log)
+    report = asyncio.run(replay(args, records)) if records else {}
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(rendered)
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
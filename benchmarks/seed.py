@@ -0,0 +1,200 @@
+"""Seed a local Postgres with a synthetic dataset through COPY.
+
+    python -m benchmarks.seed --participants 100000 --accounts 50000 --recharges 200000
+
+Connection parameters come from DatabaseSettings (DB_* environment variables).
+The schema must already be migrated (``alembic upgrade head``). Accounts and recharges are only
+seeded where their tables exist, since no migration creates them yet.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import asyncpg
+
+from enums import ParticipantType, IdentificationType, AcademicType, RechargeStatus
+from settings import DatabaseSettings
+
+CHUNK_SIZE = 10000
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Carlos", "Lucia", "Pedro", "Sofia", "Diego", "Valentina"]
+LAST_NAMES = ["Perez", "Gomez", "Rodriguez", "Fernandez", "Lopez", "Martinez", "Garcia", "Sanchez", "Romero", "Diaz"]
+SECTORS = ["National", "Provincial", "Municipal"]
+ACCOUNT_TABLES = ["addresses", "account_controllers", "recharges", "recharge_statuses"]
+
+
+class Generator:
+    def __init__(self, seed: int, days: int):
+        self.rng = random.Random(seed)
+        self.now = datetime.now(tz=timezone.utc)
+        self.span = timedelta(days=days).total_seconds()
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self):
+        return self.now - timedelta(seconds=self.rng.random() * self.span)
+
+    def address(self):
+        return "0x" + "".join(self.rng.choice("0123456789abcdef") for _ in range(40))
+
+    def choice(self, values):
+        return self.rng.choice(values)
+
+    def digits(self, length):
+        return "".join(self.rng.choice("0123456789") for _ in range(length))
+
+
+class Seeder:
+    def __init__(self, connection: asyncpg.Connection, generator: Generator):
+        self.connection = connection
+        self.gen = generator
+        self.counts = {}
+
+    async def copy(self, table: str, columns, records):
+        buffer = []
+        for record in records:
+            buffer.append(record)
+            if len(buffer) >= CHUNK_SIZE:
+                await self._flush(table, columns, buffer)
+                buffer = []
+        if buffer:
+            await self._flush(table, columns, buffer)
+
+    async def _flush(self, table, columns, records):
+        await self.connection.copy_records_to_table(table, records=records, columns=columns)
+        self.counts[table] = self.counts.get(table, 0) + len(records)
+
+    async def participants(self, total: int):
+        participant_types = list(ParticipantType)
+        participants, subtypes = [], {participant_type: [] for participant_type in participant_types}
+        for i in range(total):
+            participant_type = participant_types[i % len(participant_types)]
+            participant_id = self.gen.uuid()
+            created_at = self.gen.timestamp()
+            is_verified = self.gen.rng.random() < 0.5
+            participants.append((participant_id, is_verified, created_at if is_verified else None,
+                                 participant_type.value, created_at, created_at))
+            subtypes[participant_type].append(participant_id)
+        await self.copy("participants", ["id", "is_verified", "date_of_verification", "type", "created_at",
+                                         "updated_at"], participants)
+
+        natural_persons = [(self.gen.uuid(), self.gen.choice(FIRST_NAMES), self.gen.choice(LAST_NAMES), participant_id)
+                           for participant_id in subtypes[ParticipantType.NATURAL_PERSON]]
+        await self.copy("natural_persons", ["id", "first_name", "last_name", "participant_id"], natural_persons)
+        # (type, value) is unique, so DNIs are drawn without replacement
+        dnis = self.gen.rng.sample(range(10 ** 7, 10 ** 8), len(natural_persons))
+        await self.copy("identifications", ["id", "type", "value", "person_id"],
+                        ((self.gen.uuid(), IdentificationType.DNI.value, str(dni), person[0])
+                         for dni, person in zip(dnis, natural_persons)))
+        await self.copy("companies", ["id", "full_name", "cuit", "participant_id"],
+                        ((self.gen.uuid(), f"Company {self.gen.digits(6)}", "20" + self.gen.digits(9), participant_id)
+                         for participant_id in subtypes[ParticipantType.COMPANY]))
+        await self.copy("government_organisms", ["id", "full_name", "sector", "participant_id"],
+                        ((self.gen.uuid(), f"Direction {self.gen.digits(4)}", self.gen.choice(SECTORS), participant_id)
+                         for participant_id in subtypes[ParticipantType.GOVERNMENT_ORGANISM]))
+        await self.copy("academics", ["id", "full_name", "education_level", "participant_id"],
+                        ((self.gen.uuid(), f"Institute {self.gen.digits(4)}", self.gen.choice(list(AcademicType)).value,
+                          participant_id)
+                         for participant_id in subtypes[ParticipantType.ACADEMIC]))
+        return [participant[0] for participant in participants]
+
+    async def customers(self, customers: int, funds: int, deals: int, vesting_schedules: int):
+        customer_ids = [self.gen.uuid() for _ in range(customers)]
+        await self.copy("customers", ["id", "name"],
+                        ((customer_id, f"Customer {i}") for i, customer_id in enumerate(customer_ids)))
+        if not customer_ids:
+            return
+
+        fund_ids = [(self.gen.uuid(), self.gen.choice(customer_ids)) for _ in range(funds)]
+        await self.copy("funds", ["id", "name", "customer_id"],
+                        ((fund_id, f"Fund {i}", customer_id) for i, (fund_id, customer_id) in enumerate(fund_ids)))
+        if fund_ids:
+            await self.copy("deals", ["id", "name", "fund_id", "capital_deployed"],
+                            ((self.gen.uuid(), f"Deal {i}", self.gen.choice(fund_ids)[0],
+                              Decimal(self.gen.rng.randint(1, 10 ** 7))) for i in range(deals)))
+
+        milestones = [(self.gen.uuid(), f"Milestone {i}", customer_id) for i, customer_id in enumerate(customer_ids)]
+        await self.copy("milestones", ["id", "name", "customer_id"], milestones)
+        schedules = [(self.gen.uuid(), self.gen.choice(milestones)) for _ in range(vesting_schedules)]
+        await self.copy("vesting_schedules", ["id", "customer_id", "name", "description"],
+                        ((schedule_id, milestone[2], f"Schedule {i}", None)
+                         for i, (schedule_id, milestone) in enumerate(schedules)))
+        await self.copy("milestone_vesting_schedules", ["id", "vesting_schedule_id", "milestone_id",
+                                                        "milestone_vesting_percentage"],
+                        ((self.gen.uuid(), schedule_id, milestone[0], Decimal(self.gen.rng.randint(1, 100)))
+                         for schedule_id, milestone in schedules))
+
+    async def accounts(self, participant_ids, accounts: int, recharges: int, max_statuses: int):
+        if not participant_ids or not accounts:
+            return
+        missing = [table for table in ACCOUNT_TABLES
+                   if await self.connection.fetchval("SELECT to_regclass($1)", table) is None]
+        if missing:
+            print(f"skipping accounts and recharges, missing tables: {', '.join(missing)}", file=sys.stderr)
+            return
+        address_ids = [self.gen.uuid() for _ in range(accounts)]
+        await self.copy("addresses", ["id", "public_key"],
+                        ((address_id, self.gen.address()) for address_id in address_ids))
+        await self.copy("account_controllers", ["id", "address_id", "participant_id"],
+                        ((self.gen.uuid(), address_id, self.gen.choice(participant_ids)) for address_id in address_ids))
+
+        recharge_rows, status_rows = [], []
+        for _ in range(recharges):
+            recharge_id, created_at = self.gen.uuid(), self.gen.timestamp()
+            recharge_rows.append((recharge_id, self.gen.choice(address_ids), created_at, created_at))
+            status_rows.append((self.gen.uuid(), recharge_id, RechargeStatus.WAITING.value, created_at))
+            if max_statuses > 1 and self.gen.rng.random() < 0.7:
+                final = self.gen.choice([RechargeStatus.SATISFIED, RechargeStatus.REJECTED])
+                status_rows.append((self.gen.uuid(), recharge_id, final.value,
+                                    created_at + timedelta(seconds=self.gen.rng.randint(1, 3600))))
+        await self.copy("recharges", ["id", "address_id", "created_at", "updated_at"], recharge_rows)
+        await self.copy("recharge_statuses", ["id", "recharge_id", "status", "created_at"], status_rows)
+
+
+async def seed(settings: DatabaseSettings, args):
+    connection = await asyncpg.connect(user=settings.db_username, password=settings.db_password,
+                                       database=settings.db_name, host=settings.db_hostname, port=settings.db_port)
+    try:
+        seeder = Seeder(connection, Generator(args.seed, args.days))
+        started = time.perf_counter()
+        async with connection.transaction():
+            participant_ids = await seeder.participants(args.participants)
+            await seeder.customers(args.customers, args.funds, args.deals, args.vesting_schedules)
+            await seeder.accounts(participant_ids, args.accounts, args.recharges, args.statuses_per_recharge)
+        await connection.execute("ANALYZE")
+        elapsed = time.perf_counter() - started
+    finally:
+        await connection.close()
+    for table, count in seeder.counts.items():
+        print(f"{table}: {count}")
+    print(f"seeded in {elapsed:.2f}s")
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Seed a local database with synthetic data for benchmarks.")
+    parser.add_argument("--participants", type=int, default=10000, help="Split evenly across participant types")
+    parser.add_argument("--customers", type=int, default=100)
+    parser.add_argument("--funds", type=int, default=500)
+    parser.add_argument("--deals", type=int, default=2000)
+    parser.add_argument("--vesting-schedules", type=int, default=1000)
+    parser.add_argument("--accounts", type=int, default=5000)
+    parser.add_argument("--recharges", type=int, default=20000)
+    parser.add_argument("--statuses-per-recharge", type=int, default=2, choices=(1, 2),
+                        help="1 keeps every recharge WAITING, 2 resolves most of them")
+    parser.add_argument("--days", type=int, default=365, help="Spread created_at over this many past days")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    asyncio.run(seed(DatabaseSettings(), args))
+
+
+if __name__ == "__main__":
+    main()
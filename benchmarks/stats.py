@@ -0,0 +1,46 @@
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+class LatencyRecorder:
+    """Collects per-key latencies (seconds) and status codes and summarizes them in milliseconds."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, key: str, elapsed: float, status: int | str):
+        self.latencies[key].append(elapsed)
+        self.statuses[key][str(status)] += 1
+
+    def summary(self, wall_time: float) -> dict:
+        results = {}
+        for key, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            errors = sum(count for status, count in self.statuses[key].items() if not status.startswith(("2", "3")))
+            results[key] = {
+                "requests": len(values),
+                "errors": errors,
+                "status_codes": dict(self.statuses[key]),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "throughput_rps": round(len(values) / wall_time, 3) if wall_time else 0.0,
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "wall_time_s": round(wall_time, 3),
+            "total_requests": total,
+            "throughput_rps": round(total / wall_time, 3) if wall_time else 0.0,
+            "routes": results,
+        }
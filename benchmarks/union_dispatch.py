@@ -0,0 +1,73 @@
+"""Time validating large batches of polymorphic bodies with and without discriminated dispatch.
+
+    python -m benchmarks.union_dispatch --items 10000 --repeat 5
+
+The undiscriminated models rebuild the plain ``__root__`` unions the request bodies used to be, so the
+report shows what trying each member in turn costs for the same payloads.
+"""
+import argparse
+import json
+import random
+import timeit
+import uuid
+from typing import List, Union
+
+from pydantic import BaseModel
+
+from benchmarks.participant_inserts import PAYLOAD_SCENARIO
+from logic.carry_pools import VestingSchedule, MilestoneBasedVestingSchedule, \
+    AcceleratedMilestoneBasedVestingSchedule, TimeBasedVestingSchedule
+from logic.participants import Participant, NaturalPersonParticipant, GovernmentOrganismParticipant, \
+    CompanyParticipant, UniversityParticipant, HighschoolParticipant, SchoolParticipant
+
+
+class UndiscriminatedParticipant(BaseModel):
+    __root__: Union[NaturalPersonParticipant, GovernmentOrganismParticipant, CompanyParticipant,
+                    UniversityParticipant, HighschoolParticipant, SchoolParticipant]
+
+
+class UndiscriminatedVestingSchedule(BaseModel):
+    __root__: Union[MilestoneBasedVestingSchedule, AcceleratedMilestoneBasedVestingSchedule, TimeBasedVestingSchedule]
+
+
+def vesting_schedule_payload(rng: random.Random):
+    body = {"name": "Bench schedule", "description": None, "company": str(uuid.UUID(int=rng.getrandbits(128))),
+            "vesting_percentage": "10"}
+    if rng.random() < 1 / 3:
+        return {**body, "period_duration": 3600, "sequence": 1}
+    return {**body, "milestone": str(uuid.UUID(int=rng.getrandbits(128))), "is_accelerated": rng.random() < 0.5}
+
+
+PAYLOADS = {
+    "participants": (lambda rng: PAYLOAD_SCENARIO.build(None, rng)["json"], Participant, UndiscriminatedParticipant),
+    "vesting_schedules": (vesting_schedule_payload, VestingSchedule, UndiscriminatedVestingSchedule),
+}
+
+
+def time_batch(model, payloads: List[dict], repeat: int) -> float:
+    return min(timeit.repeat(lambda: [model.parse_obj(payload) for payload in payloads], number=1, repeat=repeat))
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Compare discriminated and plain union validation.")
+    parser.add_argument("--items", type=int, default=10000, help="Bodies per batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    rng = random.Random(args.seed)
+    report = {"items": args.items}
+    for name, (build, discriminated, undiscriminated) in PAYLOADS.items():
+        payloads = [build(rng) for _ in range(args.items)]
+        plain = time_batch(undiscriminated, payloads, args.repeat)
+        dispatched = time_batch(discriminated, payloads, args.repeat)
+        report[name] = {"undiscriminated_ms": round(plain * 1000, 3), "discriminated_ms": round(dispatched * 1000, 3),
+                        "speedup": round(plain / dispatched, 2)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare participant creation with one transaction per writer against the write coalescer.
+
+    python -m benchmarks.write_coalescing --writers 1000 --rounds 5
+
+Each round starts ``--writers`` concurrent creates at once, as an onboarding burst would, and waits for
+all of them. The report has one entry per mode with the per-create latency and overall throughput.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.participant_inserts import PAYLOAD_SCENARIO
+from benchmarks.stats import LatencyRecorder
+from common.coalescer import WriteCoalescer
+from logic.participants import Participant
+from session.connection import generate_db_url, get_async_session, get_engine, dispose_engines
+from settings import DatabaseSettings
+
+
+async def write_directly(participant: Participant, async_session, _):
+    async with async_session() as session, session.begin():
+        return await participant.persist_to(session)
+
+
+async def write_coalesced(participant: Participant, _, coalescer: WriteCoalescer):
+    return await coalescer.submit(participant)
+
+
+MODES = {"direct": write_directly, "coalesced": write_coalesced}
+
+
+async def writer(name: str, participant: Participant, async_session, coalescer, recorder: LatencyRecorder):
+    started = time.perf_counter()
+    try:
+        await MODES[name](participant, async_session, coalescer)
+        status = 201
+    except Exception as e:
+        status = type(e).__name__
+    recorder.record(name, time.perf_counter() - started, status)
+
+
+async def main_async(args):
+    database_url = generate_db_url(DatabaseSettings())
+    # The engine echoes every statement, which would dominate the measurement
+    get_engine(database_url).echo = False
+    async_session = get_async_session(database_url)
+
+    async def flush(items):
+        async with async_session() as session, session.begin():
+            return await Participant.persist_batch(items, session)
+
+    rng = random.Random(args.seed)
+    report = {}
+    try:
+        for name in args.modes:
+            coalescer = WriteCoalescer(name, flush, args.max_batch, args.max_delay_ms / 1000)
+            recorder = LatencyRecorder()
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                participants = [Participant.parse_obj(PAYLOAD_SCENARIO.build(None, rng)["json"])
+                                for _ in range(args.writers)]
+                await asyncio.gather(*(writer(name, participant, async_session, coalescer, recorder)
+                                       for participant in participants))
+            report[name] = recorder.summary(time.perf_counter() - started)["routes"][name]
+            if name == "coalesced":
+                report[name]["coalescer"] = coalescer.stats().dict()
+    finally:
+        await dispose_engines()
+    report["writers"] = args.writers
+    return report
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="Compare per-request transactions with coalesced writes.")
+    parser.add_argument("--writers", type=int, default=1000, help="Concurrent writers per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-batch", type=int, default=128)
+    parser.add_argument("--max-delay-ms", type=float, default=3.0)
+    parser.add_argument("--modes", nargs="*", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import asyncio
+from collections import deque
+from typing import Dict, List
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from common.routing import match_endpoint
+from enums import RouteClass
+
+
+class AdmissionStats(BaseModel):
+    route_class: RouteClass
+    limit: int
+    queue_size: int
+    in_flight: int
+    waiting: int
+    admitted: int
+    queued: int
+    shed: int
+
+
+class ConcurrencyLimiter:
+    """Admits up to ``limit`` concurrent requests and parks up to ``queue_size`` more for ``timeout`` seconds.
+
+    Anything beyond that is shed right away, so a slow database turns into fast 503s instead of a pile
+    of coroutines waiting for a pooled connection.
+    """
+
+    def __init__(self, route_class: RouteClass, limit: int, queue_size: int, timeout: float):
+        self.route_class = route_class
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self._waiters = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the request was cancelled
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.admitted += 1
+        return True
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter so in_flight never dips below the limit under load
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(route_class=self.route_class, limit=self.limit, queue_size=self.queue_size,
+                              in_flight=self.in_flight, waiting=len(self._waiters), admitted=self.admitted,
+                              queued=self.queued, shed=self.shed)
+
+
+def admission_class(route_class: RouteClass):
+    """Overrides the route class a route is limited under (by default GETs are reads, anything else writes)."""
+    def decorator(endpoint):
+        endpoint.admission_class = route_class
+        return endpoint
+
+    return decorator
+
+
+class AdmissionControlMiddleware:
+
+    def __init__(self, app, routes: List, limiters: Dict[RouteClass, ConcurrencyLimiter], retry_after: int):
+        self.app = app
+        self.routes = routes
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    def classify(self, scope) -> RouteClass | None:
+        if scope["method"] in ("OPTIONS", "HEAD"):
+            return None
+        declared = getattr(match_endpoint(self.routes, scope), "admission_class", None)
+        if declared is not None:
+            return declared
+        return RouteClass.READ if scope["method"] == "GET" else RouteClass.WRITE
+
+    async def __call__(self, scope, receive, send):
+        route_class = self.classify(scope) if scope["type"] == "http" else None
+        limiter = self.limiters.get(route_class)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            response = JSONResponse({"detail": f"Too many concurrent {route_class.value} requests, retry later"},
+                                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                    headers={"Retry-After": str(self.retry_after)})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+limiters: Dict[RouteClass, ConcurrencyLimiter] = {}
+
+
+def install_admission_control(app, settings):
+    limiters.clear()
+    limiters.update({
+        RouteClass.READ: ConcurrencyLimiter(RouteClass.READ, settings.admission_read_limit,
+                                            settings.admission_read_queue, settings.admission_queue_timeout),
+        RouteClass.WRITE: ConcurrencyLimiter(RouteClass.WRITE, settings.admission_write_limit,
+                                             settings.admission_write_queue, settings.admission_queue_timeout),
+        RouteClass.BULK: ConcurrencyLimiter(RouteClass.BULK, settings.admission_bulk_limit,
+                                            settings.admission_bulk_queue, settings.admission_queue_timeout),
+    })
+    app.add_middleware(AdmissionControlMiddleware, routes=app.router.routes, limiters=limiters,
+                       retry_after=settings.admission_retry_after)
@@ -0,0 +1,170 @@
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    max_size: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+class LookupCache:
+    """Bounded LRU cache for immutable key -> value lookups.
+
+    Missing values (loader returned None) are cached as well, but only for
+    ``negative_ttl`` seconds, so a row created by another process shows up
+    without an explicit invalidation.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, name: str, max_size: int, negative_ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._negative: Dict[Hashable, float] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        registry[name] = self
+
+    def __len__(self):
+        return len(self._entries) + len(self._negative)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.get(key, self._MISSING)
+        if value is not self._MISSING:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+        expires_at = self._negative.get(key)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                self.negative_hits += 1
+                return None
+            del self._negative[key]
+        self.misses += 1
+        return default
+
+    def contains(self, key: Hashable) -> bool:
+        if key in self._entries:
+            return True
+        expires_at = self._negative.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def put(self, key: Hashable, value: Any):
+        self._negative.pop(key, None)
+        if value is None:
+            if self.negative_ttl > 0:
+                self._negative[key] = time.monotonic() + self.negative_ttl
+                self._evict()
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+        self._negative.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._negative.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.contains(key):
+            return self.get(key)
+        self.misses += 1
+        value = await loader()
+        self.put(key, value)
+        return value
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.negative_hits + self.misses
+        return CacheStats(name=self.name, size=len(self), max_size=self.max_size, hits=self.hits,
+                          negative_hits=self.negative_hits, misses=self.misses, evictions=self.evictions,
+                          hit_rate=(self.hits + self.negative_hits) / lookups if lookups else 0.0)
+
+    def _evict(self):
+        if self._negative:
+            now = time.monotonic()
+            for key in [key for key, expires_at in self._negative.items() if expires_at <= now]:
+                del self._negative[key]
+        while len(self) > self.max_size:
+            if self._negative:
+                self._negative.pop(next(iter(self._negative)))
+            else:
+                self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+registry: Dict[str, LookupCache] = {}
+
+
+class RefreshingCache:
+    """Caches ``load(key)`` for ``ttl`` seconds.
+
+    Expired values keep being served while a background task reloads them, so only the first request for a
+    key waits, and concurrent first requests share a single load.
+    """
+
+    def __init__(self, name: str, ttl: float, load: Callable[[Hashable], Awaitable[Any]]):
+        self.name = name
+        self.ttl = ttl
+        self.load = load
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return await asyncio.shield(self._refresh(key))
+        loaded_at, value = entry
+        if time.monotonic() - loaded_at >= self.ttl:
+            self._refresh(key)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def _refresh(self, key: Hashable) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            # A fresh context keeps the load's statements out of whichever request happened to trigger it
+            task = asyncio.get_running_loop().create_task(self._load(key), context=contextvars.Context())
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._loaded(key, done))
+        return task
+
+    async def _load(self, key: Hashable):
+        value = await self.load(key)
+        self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def _loaded(self, key: Hashable, task: asyncio.Task):
+        self._loading.pop(key, None)
+        # Failed background refreshes keep serving the previous value until the next attempt
+        if not task.cancelled():
+            task.exception()
+
+
+refreshing_caches: Dict[str, RefreshingCache] = {}
+
+
+def get_refreshing_cache(name: str, build: Callable[[], RefreshingCache]) -> RefreshingCache:
+    cache = refreshing_caches.get(name)
+    if cache is None:
+        cache = refreshing_caches[name] = build()
+    return cache
@@ -0,0 +1,101 @@
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy.exc import DataError, IntegrityError
+
+# Raised because of what one of the items holds, so retrying the rest without it can succeed
+ITEM_ERRORS = (IntegrityError, DataError)
+
+
+class CoalescerStats(BaseModel):
+    name: str
+    max_batch: int
+    max_delay_ms: float
+    pending: int
+    submitted: int
+    batches: int
+    splits: int
+    largest_batch: int
+
+
+class WriteCoalescer:
+    """Collects items submitted within ``max_delay`` seconds (or until ``max_batch`` of them) and writes them
+    with a single ``flush`` call, so a burst of creates shares one transaction and one commit.
+
+    ``flush`` receives the items and returns one result per item, in order. If it raises one of ``item_errors``,
+    the batch is split in halves and retried, so a failing item only fails its own caller. Any other error, such as
+    a lost connection or a timeout, fails every item of the batch at once.
+    """
+
+    def __init__(self, name: str, flush: Callable[[List], Awaitable[List]], max_batch: int, max_delay: float,
+                 item_errors: Tuple[Type[Exception], ...] = ITEM_ERRORS):
+        self.name = name
+        self.flush = flush
+        self.item_errors = item_errors
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self.submitted = 0
+        self.batches = 0
+        self.splits = 0
+        self.largest_batch = 0
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self.submitted += 1
+        if len(self._pending) >= self.max_batch:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_pending)
+        return await future
+
+    def _flush_pending(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # A fresh context keeps the batch's statements out of whichever request happened to trigger it
+        task = asyncio.get_running_loop().create_task(self._write(batch), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, batch):
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1 or not isinstance(e, self.item_errors):
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            self.splits += 1
+            middle = len(batch) // 2
+            await asyncio.gather(self._write(batch[:middle]), self._write(batch[middle:]))
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> CoalescerStats:
+        return CoalescerStats(name=self.name, max_batch=self.max_batch, max_delay_ms=self.max_delay * 1000,
+                              pending=len(self._pending), submitted=self.submitted, batches=self.batches,
+                              splits=self.splits, largest_batch=self.largest_batch)
+
+
+coalescers: Dict[str, WriteCoalescer] = {}
+
+
+def get_coalescer(name: str, build: Callable[[], WriteCoalescer]) -> WriteCoalescer:
+    coalescer = coalescers.get(name)
+    if coalescer is None:
+        coalescer = coalescers[name] = build()
+    return coalescer
@@ -0,0 +1,49 @@
+"""SQL expressions that render JSON text byte for byte as the API's ``JSONResponse`` encodes the same values.
+
+``json_build_object`` pads keys and values with spaces, so objects are concatenated from ``to_json`` fragments
+instead, in the field order of the pydantic model being rendered.
+"""
+import json
+from typing import Any, Dict, Type
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import func, cast, case, literal, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+
+def encode(value: Any) -> str:
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def json_value(column):
+    return cast(func.to_json(column), Text)
+
+
+def json_timestamp(column):
+    """``datetime.isoformat()`` of a timestamptz as the driver returns it, in UTC and without zero microseconds."""
+    utc = func.timezone("UTC", column)
+    fraction = case((func.date_trunc("second", column) == column, ""), else_=func.to_char(utc, ".US"))
+    return literal('"') + func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS') + fraction + literal('+00:00"')
+
+
+def json_object(model: Type[BaseModel], values: Dict[str, Any]):
+    """A JSON object with a value for each of ``model``'s fields, in the order pydantic serialises them."""
+    assert values.keys() == model.__fields__.keys(), f"{model.__name__} fields and rendered values differ"
+    expression = literal("{")
+    for i, name in enumerate(model.__fields__):
+        expression = expression + literal(("," if i else "") + encode(name) + ":") + func.coalesce(values[name], "null")
+    return expression + literal("}")
+
+
+def json_array(element, order_by):
+    return func.coalesce(literal("[") + func.string_agg(element, aggregate_order_by(literal(","), order_by)) +
+                         literal("]"), "[]")
+
+
+def render_object(model: Type[BaseModel], **values) -> bytes:
+    """``model``'s JSON with the given values, where ``bytes`` values are already rendered JSON."""
+    assert values.keys() == model.__fields__.keys(), f"{model.__name__} fields and rendered values differ"
+    members = (encode(name) + ":" + (values[name].decode() if isinstance(values[name], bytes) else encode(values[name]))
+               for name in model.__fields__)
+    return ("{" + ",".join(members) + "}").encode()
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List
+
+
+class DataLoader:
+    """Collects the keys requested during one event-loop tick and resolves them with a single ``batch_load`` call.
+
+    ``batch_load`` receives the distinct keys and returns a mapping from key to value; keys missing from it
+    resolve to ``None``. Results are cached for the loader's lifetime, so create one per request.
+    """
+
+    def __init__(self, batch_load: Callable[[List], Awaitable[Dict]]):
+        self.batch_load = batch_load
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._queue = []
+        self.batches = 0
+
+    async def load(self, key):
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Runs after every load already scheduled for this tick has queued its key
+                loop.call_soon(self._dispatch)
+        return await future
+
+    async def load_many(self, keys: Iterable) -> List:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self):
+        keys, self._queue = self._queue, []
+        asyncio.get_running_loop().create_task(self._resolve(keys))
+
+    async def _resolve(self, keys):
+        self.batches += 1
+        try:
+            values = await self.batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                self._futures.pop(key).set_exception(e)
+            return
+        for key in keys:
+            self._futures[key].set_result(values.get(key))
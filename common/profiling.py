@@ -0,0 +1,242 @@
+import asyncio
+import hmac
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, Field, PositiveInt
+
+from common.routing import match_route
+from enums import ProfileTrigger
+from exceptions import ResourceNotFound, Forbidden
+
+PROFILE_HEADER = b"x-profile-token"
+# Stands for the samples taken while the request was waiting on I/O or the loop was running other requests
+SUSPENDED = ("<suspended>", "", 0)
+
+Frame = Tuple[str, str, int]
+
+
+class ProfileNotFound(ResourceNotFound):
+    def __init__(self, profile_id: int):
+        super().__init__(f"Profile not found. ID: {profile_id}")
+
+
+class ProfilingForbidden(Forbidden):
+    def __init__(self):
+        super().__init__("Profiling requires a valid X-Profile-Token")
+
+
+class RouteNotProfilable(ResourceNotFound):
+    def __init__(self, route: str):
+        super().__init__(f"No route to profile. Route: {route}")
+
+
+class ProfileArming(BaseModel):
+    route: str = Field(..., description="Method and path template, such as \"GET /participants\"")
+    requests: PositiveInt = Field(1, description="How many of the route's next requests to profile")
+
+
+class ProfileSummary(BaseModel):
+    id: int
+    route: str
+    trigger: ProfileTrigger
+    recorded_at: datetime
+    duration_ms: float
+    interval_ms: float
+    samples: int
+
+
+class ProfilerStats(BaseModel):
+    interval_ms: float
+    latency_threshold_ms: float | None
+    armed: Dict[str, int]
+    profiling: int
+    profiles: List[ProfileSummary]
+
+
+class Profile:
+    """Stacks sampled from the event loop thread while one request ran, weighted by how often each was seen."""
+
+    def __init__(self, profile_id: int, route: str, trigger: ProfileTrigger, interval: float):
+        self.id = profile_id
+        self.route = route
+        self.trigger = trigger
+        self.interval = interval
+        self.task = asyncio.current_task()
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+        self.recorded_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.stacks: Counter[Tuple[Frame, ...]] = Counter()
+
+    def summary(self) -> ProfileSummary:
+        return ProfileSummary(id=self.id, route=self.route, trigger=self.trigger, recorded_at=self.recorded_at,
+                              duration_ms=round(self.duration * 1000, 3), interval_ms=self.interval * 1000,
+                              samples=sum(self.stacks.values()))
+
+    def collapsed(self) -> str:
+        """One ``root;...;leaf count`` line per stack, as flamegraph.pl and speedscope import it."""
+        return "".join(f"{';'.join(f'{name} ({file}:{line})' if file else name for name, file, line in stack)} "
+                       f"{count}\n" for stack, count in self.stacks.most_common())
+
+    def speedscope(self) -> dict:
+        frames: Dict[Frame, int] = {}
+        samples = [[frames.setdefault(frame, len(frames)) for frame in stack] for stack in self.stacks]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.route} #{self.id}",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": name, "file": file, "line": line} for name, file, line in frames]},
+            "profiles": [{
+                "type": "sampled", "name": self.route, "unit": "milliseconds", "startValue": 0,
+                "endValue": sum(self.stacks.values()) * self.interval * 1000, "samples": samples,
+                "weights": [count * self.interval * 1000 for count in self.stacks.values()],
+            }],
+        }
+
+
+def get_stack(frame) -> Tuple[Frame, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+class Profiler:
+    """Samples the stacks of the requests it is asked to profile from a background thread.
+
+    A request is profiled when its route was armed for a number of requests, when it carries ``X-Profile-Token``
+    matching ``token``, or, with a ``latency_threshold``, always, keeping only the profiles of requests slower than
+    that. A sample counts for a request only while its own task is the one running on the loop. The sampler thread
+    only runs while some request is being profiled.
+    """
+
+    def __init__(self, interval: float, latency_threshold: float | None, token: str | None, keep: int):
+        self.interval = interval
+        self.latency_threshold = latency_threshold
+        self.token = token.encode() if token else None
+        self.armed: Dict[str, int] = {}
+        self.profiles: deque[Profile] = deque(maxlen=keep)
+        self._active: Dict[int, Profile] = {}
+        self._lock = threading.Lock()
+        self._sampler: threading.Thread | None = None
+        self._ids = itertools.count(1)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.armed) or self.latency_threshold is not None or self.token is not None
+
+    def arm(self, route: str, requests: int):
+        self.armed[route] = requests
+
+    def trigger_for(self, route: str, headers) -> ProfileTrigger | None:
+        if self.armed.get(route):
+            self.armed[route] -= 1
+            if not self.armed[route]:
+                del self.armed[route]
+            return ProfileTrigger.ARMED
+        if self.token is not None:
+            token = next((value for name, value in headers if name == PROFILE_HEADER), None)
+            if token is not None and hmac.compare_digest(token, self.token):
+                return ProfileTrigger.HEADER
+        if self.latency_threshold is not None:
+            return ProfileTrigger.LATENCY
+        return None
+
+    def start(self, route: str, trigger: ProfileTrigger) -> Profile:
+        profile = Profile(next(self._ids), route, trigger, self.interval)
+        with self._lock:
+            self._active[profile.id] = profile
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+                self._sampler.start()
+        return profile
+
+    def stop(self, profile: Profile):
+        profile.duration = time.perf_counter() - profile.started
+        with self._lock:
+            del self._active[profile.id]
+        if profile.trigger != ProfileTrigger.LATENCY or profile.duration * 1000 >= self.latency_threshold:
+            self.profiles.append(profile)
+
+    def _sample(self):
+        while True:
+            # Under the lock so a stopped profile never gets a late sample
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                frames = sys._current_frames()
+                stacks = {}
+                for profile in self._active.values():
+                    if asyncio.current_task(profile.loop) is not profile.task or profile.thread_id not in frames:
+                        profile.stacks[(SUSPENDED,)] += 1
+                        continue
+                    if profile.thread_id not in stacks:
+                        stacks[profile.thread_id] = get_stack(frames[profile.thread_id])
+                    profile.stacks[stacks[profile.thread_id]] += 1
+                del frames
+            time.sleep(self.interval)
+
+    def stats(self) -> ProfilerStats:
+        return ProfilerStats(interval_ms=self.interval * 1000,
+                             latency_threshold_ms=self.latency_threshold, armed=dict(self.armed),
+                             profiling=len(self._active),
+                             profiles=[profile.summary() for profile in reversed(self.profiles)])
+
+
+class ProfilingMiddleware:
+    """Profiles the requests the profiler picks; costs one attribute check per request while nothing is armed."""
+
+    def __init__(self, app, routes: List, profiler: Profiler):
+        self.app = app
+        self.routes = routes
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+        route, _ = match_route(self.routes, scope)
+        label = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+        trigger = self.profiler.trigger_for(label, scope["headers"])
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        profile = self.profiler.start(label, trigger)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.stop(profile)
+
+
+profilers: List[Profiler] = []
+
+
+def is_profiling_token(token: str | None, expected: str | None) -> bool:
+    return bool(token and expected) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+def get_profile(profile_id: int) -> Profile:
+    for profiler in profilers:
+        for profile in profiler.profiles:
+            if profile.id == profile_id:
+                return profile
+    raise ProfileNotFound(profile_id)
+
+
+def install_profiling(app, settings):
+    profilers.clear()
+    token = settings.profiling_token.get_secret_value() if settings.profiling_token else None
+    profiler = Profiler(settings.profiling_interval_ms / 1000, settings.profiling_latency_threshold_ms, token,
+                        settings.profiling_keep)
+    profilers.append(profiler)
+    app.add_middleware(ProfilingMiddleware, routes=app.router.routes, profiler=profiler)
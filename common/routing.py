@@ -0,0 +1,17 @@
+from typing import Callable, List, Tuple
+
+from starlette.routing import BaseRoute, Match
+
+
+def match_route(routes: List, scope) -> Tuple[BaseRoute | None, dict]:
+    """Route the router will dispatch ``scope`` to and its child scope, for middlewares that run before routing."""
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route, child_scope
+    return None, {}
+
+
+def match_endpoint(routes: List, scope) -> Callable | None:
+    """Endpoint the router will dispatch ``scope`` to, for middlewares that run before routing."""
+    return match_route(routes, scope)[1].get("endpoint")
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Dict, List, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.requests import cookie_parser
+
+from common.routing import match_endpoint
+
+
+def single_flight(endpoint):
+    """Opts a GET route into sharing one execution between identical concurrent requests."""
+    endpoint.single_flight = True
+    return endpoint
+
+
+def normalize_query(query_string: bytes) -> str:
+    return urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+
+
+class SingleFlightMiddleware:
+    """Coalesces concurrent GETs with the same path and normalized query parameters.
+
+    The first request (the leader) runs normally while its response messages are recorded; requests
+    for the same key arriving before it finishes wait for it and replay the recorded response instead
+    of running the handler and its queries again. If the leader fails, the waiting requests run on
+    their own.
+
+    Requests carrying any of ``bypass_cookies`` always run on their own, as their response may differ from
+    another client's for the same key (such as a client that must read its own recent writes).
+    """
+
+    def __init__(self, app, routes: List, bypass_cookies: Sequence[str] = ()):
+        self.app = app
+        self.routes = routes
+        self.bypass_cookies = bypass_cookies
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def has_bypass_cookie(self, scope) -> bool:
+        if not self.bypass_cookies:
+            return False
+        cookies = cookie_parser(b"; ".join(value for name, value in scope["headers"] if name == b"cookie")
+                                .decode("latin-1"))
+        return any(name in cookies for name in self.bypass_cookies)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" \
+                or not getattr(match_endpoint(self.routes, scope), "single_flight", False) \
+                or self.has_bypass_cookie(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], normalize_query(scope["query_string"]))
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            self.followers += 1
+            messages = await asyncio.shield(leader)
+            if messages is None:
+                await self.app(scope, receive, send)
+                return
+            for message in messages:
+                await send(message)
+            return
+
+        self.leaders += 1
+        result = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = result
+        messages = []
+
+        async def recording_send(message):
+            messages.append(message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, recording_send)
+        except BaseException:
+            result.set_result(None)
+            raise
+        else:
+            result.set_result(messages)
+        finally:
+            del self._in_flight[key]
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+from sqlalchemy import select, func, table, column, Float
+
+
+class Stats(BaseModel):
+    total: int
+    estimated: bool
+    computed_at: datetime
+
+
+pg_class = table("pg_class", column("oid"), column("reltuples", Float))
+
+
+def get_estimated_count_query(relation: str):
+    """Row count the planner keeps for ``relation`` (a table or index), as of the last VACUUM or ANALYZE.
+
+    ``reltuples`` is -1 until the relation is first analysed, which is reported as 0.
+    """
+    return select(func.greatest(func.round(pg_class.c.reltuples), 0).label("total")) \
+        .where(pg_class.c.oid == func.to_regclass(relation))
@@ -0,0 +1,52 @@
+import functools
+import os
+
+from opentelemetry import trace
+
+from enums import TracingExporter
+
+# A no-op until install_tracing sets a tracer provider, so decorated calls cost next to nothing without it
+tracer = trace.get_tracer("carry_pools")
+
+
+def traced(function):
+    """Runs a coroutine function inside a span named after its qualified name."""
+    attributes = {"code.namespace": function.__module__, "code.function": function.__name__}
+
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(function.__qualname__, attributes=attributes):
+            return await function(*args, **kwargs)
+
+    return wrapper
+
+
+def get_span_exporter(settings):
+    if settings.tracing_exporter == TracingExporter.FILE:
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter(out=open(settings.tracing_file, "a"),
+                                   formatter=lambda span: span.to_json(indent=None) + os.linesep)
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+    return OTLPSpanExporter()
+
+
+def install_tracing(app, settings):
+    from opentelemetry.instrumentation.asyncpg import AsyncPGInstrumentor
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    # Requests that arrive with a sampled trace context are always followed, so the ratio only applies to new traces
+    provider = TracerProvider(resource=Resource.create(),
+                              sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)))
+    provider.add_span_processor(BatchSpanProcessor(get_span_exporter(settings)))
+    trace.set_tracer_provider(provider)
+    instrumentor = AsyncPGInstrumentor()
+    if not instrumentor.is_instrumented_by_opentelemetry:
+        instrumentor.instrument(tracer_provider=provider)
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider)
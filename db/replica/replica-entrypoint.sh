@@ -0,0 +1,10 @@
+#!/bin/bash
+# Clones the primary on first start and follows it as a hot standby
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup -h db -U "$POSTGRES_USER" -D "$PGDATA" -R -X stream; do
+        sleep 1
+    done
+    chmod 0700 "$PGDATA"
+fi
+exec postgres
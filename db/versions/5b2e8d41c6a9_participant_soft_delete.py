@@ -0,0 +1,27 @@
+"""participant soft delete
+
+Revision ID: 5b2e8d41c6a9
+Revises: 8c4475763ab1
+Create Date: 2026-10-19 14:03:17.220931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e8d41c6a9'
+down_revision = '8c4475763ab1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('participants', sa.Column('disabled_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.create_index('participants_active_created_at_idx', 'participants', ['created_at'],
+                    postgresql_where=sa.text('disabled_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('participants_active_created_at_idx', table_name='participants')
+    op.drop_column('participants', 'disabled_at')
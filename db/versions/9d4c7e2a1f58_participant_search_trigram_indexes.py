@@ -0,0 +1,39 @@
+"""participant search trigram indexes
+
+Revision ID: 9d4c7e2a1f58
+Revises: 5b2e8d41c6a9
+Create Date: 2026-10-19 16:41:05.873214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4c7e2a1f58'
+down_revision = '5b2e8d41c6a9'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = [
+    ('identifications_value_trgm_idx', 'identifications', 'value'),
+    ('government_organisms_full_name_trgm_idx', 'government_organisms', 'full_name'),
+    ('companies_full_name_trgm_idx', 'companies', 'full_name'),
+    ('companies_cuit_trgm_idx', 'companies', 'cuit'),
+    ('academics_full_name_trgm_idx', 'academics', 'full_name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(name, table, [column], postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+    # Natural persons are searched by their full name, so one expression index covers first and last names
+    op.create_index('natural_persons_full_name_trgm_idx', 'natural_persons',
+                    [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('natural_persons_full_name_trgm_idx', table_name='natural_persons')
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,25 @@
+"""identification type value unique
+
+Revision ID: c81f5a3e9b07
+Revises: 9d4c7e2a1f58
+Create Date: 2026-10-19 17:25:48.114637
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f5a3e9b07'
+down_revision = '9d4c7e2a1f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fails if two people already share an identification; those have to be reconciled by hand first
+    op.create_index('identifications_type_value_uidx', 'identifications', ['type', 'value'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('identifications_type_value_uidx', table_name='identifications')
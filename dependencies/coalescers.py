@@ -0,0 +1,28 @@
+from fastapi import Depends
+
+from common.coalescer import WriteCoalescer, get_coalescer
+from dependencies.db import get_db_settings, get_db_url, get_app_settings
+from logic.participants import Participant
+from session.connection import get_async_session
+from settings import AppSettings, DatabaseSettings
+
+
+def build_coalescer(name: str, persist_batch, db_url, db_settings: DatabaseSettings, app_settings: AppSettings):
+    async_session = get_async_session(db_url, db_settings.db_statement_timeout_ms)
+
+    async def flush(items):
+        async with async_session() as session, session.begin():
+            return await persist_batch(items, session)
+
+    return WriteCoalescer(name, flush, app_settings.write_coalescing_max_batch,
+                          app_settings.write_coalescing_max_delay_ms / 1000)
+
+
+def get_participant_coalescer(db_url: str = Depends(get_db_url),
+                              db_settings: DatabaseSettings = Depends(get_db_settings),
+                              app_settings: AppSettings = Depends(get_app_settings)) -> WriteCoalescer | None:
+    if not app_settings.write_coalescing:
+        return None
+    return get_coalescer("participants", lambda: build_coalescer(
+        "participants", Participant.persist_batch, db_url, db_settings, app_settings))
+
@@ -1,9 +1,12 @@
 import asyncpg
-from fastapi import Depends
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from session.connection import get_async_session, generate_db_url
-from settings import DatabaseSettings
+from session.connection import get_async_session, generate_db_url, get_engine, generate_replica_db_urls
+from session.replicas import ReplicaRouter, get_replica_router as get_router
+from settings import DatabaseSettings, AppSettings
+
+READ_METHODS = ("GET", "HEAD")
 
 
 def get_db_settings():
@@ -13,14 +16,58 @@ def get_db_url(db_settings: DatabaseSettings = Depends(get_db_settings)):
     return generate_db_url(db_settings)
 
 
-async def get_session(db_url: str = Depends(get_db_url)) -> AsyncSession:
-    async_session = get_async_session(db_url)
+def get_replica_router(db_url: str = Depends(get_db_url),
+                       db_settings: DatabaseSettings = Depends(get_db_settings)) -> ReplicaRouter | None:
+    if not db_settings.db_replica_hostnames:
+        return None
+    return get_router(db_url, lambda: ReplicaRouter(
+        db_url, generate_replica_db_urls(db_settings), db_settings.db_replica_strategy,
+        db_settings.db_replica_max_lag_s, db_settings.db_replica_lag_check_interval_s,
+        db_settings.db_replica_sticky_window_s, db_settings.db_statement_timeout_ms))
+
+
+async def get_routed_db_url(request: Request, response: Response, db_url: str = Depends(get_db_url),
+                            replicas: ReplicaRouter | None = Depends(get_replica_router)):
+    """The primary for writes, and for reads within the sticky window after this client's last write; a replica
+    for other reads."""
+    if replicas is None:
+        return db_url
+    if request.method not in READ_METHODS:
+        replicas.stick(response)
+        return db_url
+    if replicas.is_sticky(request.cookies):
+        return db_url
+    return replicas.choose()
+
+
+async def get_session(db_url: str = Depends(get_routed_db_url),
+                      db_settings: DatabaseSettings = Depends(get_db_settings)) -> AsyncSession:
+    async_session = get_async_session(db_url, db_settings.db_statement_timeout_ms)
     async with async_session() as session:
         yield session
 
 
 
+def get_app_settings():
+    return AppSettings()
+
+
+async def get_read_connection(db_url: str = Depends(get_routed_db_url),
+                              db_settings: DatabaseSettings = Depends(get_db_settings),
+                              app_settings: AppSettings = Depends(get_app_settings)) -> asyncpg.Connection | None:
+    """The asyncpg connection under a pooled engine connection, when raw reads are enabled."""
+    if not app_settings.raw_reads:
+        yield None
+        return
+    async with get_engine(db_url, db_settings.db_statement_timeout_ms).connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        yield raw_connection.driver_connection
+
+
 async def get_postgres_session(db_settings: DatabaseSettings = Depends(get_db_settings)):
-    con = await asyncpg.connect(user=db_settings.db_username, password=db_settings.db_password, database=db_settings.db_name, host=db_settings.db_hostname, port=db_settings.db_port)
+    server_settings = {}
+    if db_settings.db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(db_settings.db_statement_timeout_ms)
+    con = await asyncpg.connect(user=db_settings.db_username, password=db_settings.db_password, database=db_settings.db_name, host=db_settings.db_hostname, port=db_settings.db_port, server_settings=server_settings)
     yield con
     await con.close()
\ No newline at end of file
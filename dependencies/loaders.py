@@ -0,0 +1,32 @@
+import asyncio
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.loader import DataLoader
+from dependencies.db import get_session
+from logic.participants import RetrievedParticipant
+from repositories.customers import Repository as CustomerRepository
+
+
+class Loaders:
+    """Request-scoped loaders sharing the request's session, one ``IN`` query per entity type and tick."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        # An AsyncSession runs one statement at a time, so loaders dispatching in the same tick take turns
+        self._lock = asyncio.Lock()
+        self.participants = DataLoader(self._load_participants)
+        self.customers = DataLoader(self._load_customers)
+
+    async def _load_participants(self, participant_ids):
+        async with self._lock:
+            return await RetrievedParticipant.from_persistance_many(participant_ids, persistance=self.session)
+
+    async def _load_customers(self, customer_ids):
+        async with self._lock:
+            return await CustomerRepository(self.session).retrieve_many(customer_ids)
+
+
+def get_loaders(session: AsyncSession = Depends(get_session)) -> Loaders:
+    return Loaders(session)
@@ -0,0 +1,12 @@
+from fastapi import Depends, Header
+
+from common.profiling import ProfilingForbidden, is_profiling_token
+from dependencies.db import get_app_settings
+from settings import AppSettings
+
+
+def require_profiling_token(token: str | None = Header(None, alias="X-Profile-Token"),
+                            app_settings: AppSettings = Depends(get_app_settings)):
+    expected = app_settings.profiling_token.get_secret_value() if app_settings.profiling_token else None
+    if not is_profiling_token(token, expected):
+        raise ProfilingForbidden()
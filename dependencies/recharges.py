@@ -0,0 +1,32 @@
+from asyncpg import Connection
+from fastapi import Depends
+
+from common.cache import RefreshingCache, get_refreshing_cache
+from common.coalescer import WriteCoalescer, get_coalescer
+from dependencies.coalescers import build_coalescer, get_app_settings
+from dependencies.db import get_db_settings, get_db_url, get_read_connection
+from dependencies.stats import build_stats_cache
+from logic.recharges import RechargeStats
+from logic.recharges.recharge import Recharge
+from repositories.recharges import ReadOnlyRepository as RechargeReadOnlyRepository
+from settings import AppSettings, DatabaseSettings
+
+
+def get_recharge_coalescer(db_url: str = Depends(get_db_url),
+                           db_settings: DatabaseSettings = Depends(get_db_settings),
+                           app_settings: AppSettings = Depends(get_app_settings)) -> WriteCoalescer | None:
+    if not app_settings.write_coalescing:
+        return None
+    return get_coalescer("recharges", lambda: build_coalescer(
+        "recharges", Recharge.persist_batch, db_url, db_settings, app_settings))
+
+
+def get_recharge_stats_cache(db_url: str = Depends(get_db_url),
+                             db_settings: DatabaseSettings = Depends(get_db_settings),
+                             app_settings: AppSettings = Depends(get_app_settings)) -> RefreshingCache:
+    return get_refreshing_cache("recharge_stats", lambda: build_stats_cache(
+        "recharge_stats", RechargeStats.from_persistance, db_url, db_settings, app_settings))
+
+
+def get_recharge_read_repository(connection: Connection | None = Depends(get_read_connection)):
+    return RechargeReadOnlyRepository(connection) if connection else None
@@ -1,9 +1,10 @@
+from asyncpg import Connection
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from dependencies.db import get_session
+from dependencies.db import get_session, get_read_connection
 from repositories import VestingScheduleRepository
-from repositories import CustomerRepository
+from repositories import CustomerRepository, CustomerReadOnlyRepository, ParticipantReadOnlyRepository
 
 
 def get_vesting_schedule_repository(session: AsyncSession = Depends(get_session)):
@@ -11,3 +12,11 @@ def get_vesting_schedule_repository(session: AsyncSession = Depends(get_session)
 
 def get_customer_repository(session: AsyncSession = Depends(get_session)):
     return CustomerRepository(session)
+
+
+def get_customer_read_repository(connection: Connection | None = Depends(get_read_connection)):
+    return CustomerReadOnlyRepository(connection) if connection else None
+
+
+def get_participant_read_repository(connection: Connection | None = Depends(get_read_connection)):
+    return ParticipantReadOnlyRepository(connection) if connection else None
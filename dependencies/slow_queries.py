@@ -0,0 +1,14 @@
+import hmac
+
+from fastapi import Depends, Header
+
+from dependencies.db import get_app_settings
+from session.slow_queries import SlowQueriesForbidden
+from settings import AppSettings
+
+
+def require_slow_query_token(token: str | None = Header(None, alias="X-Slow-Query-Token"),
+                             app_settings: AppSettings = Depends(get_app_settings)):
+    expected = app_settings.slow_query_token.get_secret_value() if app_settings.slow_query_token else None
+    if not (token and expected and hmac.compare_digest(token.encode(), expected.encode())):
+        raise SlowQueriesForbidden()
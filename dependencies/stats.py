@@ -0,0 +1,26 @@
+from fastapi import Depends
+
+from common.cache import RefreshingCache, get_refreshing_cache
+from dependencies.coalescers import get_app_settings
+from dependencies.db import get_db_settings, get_db_url
+from logic.participants import ParticipantStats
+from session.connection import get_async_session
+from settings import AppSettings, DatabaseSettings
+
+
+def build_stats_cache(name: str, from_persistance, db_url, db_settings: DatabaseSettings,
+                      app_settings: AppSettings) -> RefreshingCache:
+    async_session = get_async_session(db_url, db_settings.db_statement_timeout_ms)
+
+    async def load(estimated: bool):
+        async with async_session() as session, session.begin():
+            return await from_persistance(session, estimated)
+
+    return RefreshingCache(name, app_settings.stats_cache_ttl, load)
+
+
+def get_participant_stats_cache(db_url: str = Depends(get_db_url),
+                                db_settings: DatabaseSettings = Depends(get_db_settings),
+                                app_settings: AppSettings = Depends(get_app_settings)) -> RefreshingCache:
+    return get_refreshing_cache("participant_stats", lambda: build_stats_cache(
+        "participant_stats", ParticipantStats.from_persistance, db_url, db_settings, app_settings))
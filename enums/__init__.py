@@ -40,4 +40,51 @@ class RechargeStatus(str, Enum):
 
 class CarryPoolStatus(str, Enum):
     DRAFT = "DRAFT"
-    APPROVED = "DRAFT"
\ No newline at end of file
+    APPROVED = "DRAFT"
+
+class ParticipantField(str, Enum):
+    ID = "id"
+    TYPE = "type"
+    CREATED_AT = "created_at"
+    IS_VERIFIED = "is_verified"
+    FIRST_NAME = "first_name"
+    LAST_NAME = "last_name"
+    IDENTIFICATION = "identification"
+    FULL_NAME = "full_name"
+    SECTOR = "sector"
+    CUIT = "cuit"
+    EDUCATION_LEVEL = "education_level"
+
+
+class RechargeField(str, Enum):
+    ID = "id"
+    CREATED_AT = "created_at"
+    STATUS = "status"
+    ADDRESS = "address"
+
+
+class ReplicaStrategy(str, Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"
+
+
+class RouteClass(str, Enum):
+    READ = "read"
+    WRITE = "write"
+    BULK = "bulk"
+
+
+class ProfileTrigger(str, Enum):
+    ARMED = "armed"
+    HEADER = "header"
+    LATENCY = "latency"
+
+
+class ProfileFormat(str, Enum):
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+
+class TracingExporter(str, Enum):
+    OTLP = "otlp"
+    FILE = "file"
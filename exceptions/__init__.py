@@ -1,8 +1,10 @@
-from .general import ResourceNotFound, UnprocessableEntity, resource_not_found_handler, generic_unprocessable_entity_handler
+from .general import ResourceNotFound, UnprocessableEntity, Forbidden, resource_not_found_handler, \
+    generic_unprocessable_entity_handler, forbidden_handler
 
 handlers = {
     ResourceNotFound: resource_not_found_handler,
     UnprocessableEntity: generic_unprocessable_entity_handler,
+    Forbidden: forbidden_handler,
 }
 
 
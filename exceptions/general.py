@@ -9,9 +9,17 @@ class UnprocessableEntity(Exception):
     pass
 
 
+class Forbidden(Exception):
+    pass
+
+
 async def resource_not_found_handler(_, exc: ResourceNotFound):
     return JSONResponse({"detail": str(exc)}, status_code=status.HTTP_404_NOT_FOUND)
 
 
 async def generic_unprocessable_entity_handler(_, exc: UnprocessableEntity):
-    return JSONResponse({"detail": str(exc)}, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
\ No newline at end of file
+    return JSONResponse({"detail": str(exc)}, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+async def forbidden_handler(_, exc: Forbidden):
+    return JSONResponse({"detail": str(exc)}, status_code=status.HTTP_403_FORBIDDEN)
\ No newline at end of file
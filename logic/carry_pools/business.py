@@ -5,7 +5,7 @@ from datetime import timedelta
 from _decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, validator, parse_obj_as
 
 
 class BaseVestingSchedule(BaseModel):
@@ -51,6 +51,27 @@ class AcceleratedMilestoneBasedVestingSchedule(MilestoneBasedVestingSchedule):
 class VestingSchedule(BaseModel):
     __root__: MilestoneBasedVestingSchedule | AcceleratedMilestoneBasedVestingSchedule | TimeBasedVestingSchedule
 
+    class Config:
+        # Lets the schedule picked below through without being tried against the other members again
+        smart_union = True
+
+    @validator("__root__", pre=True)
+    def dispatch_on_is_accelerated(cls, value):
+        # Only milestone based schedules have is_accelerated, so a body matches exactly one member
+        if not isinstance(value, dict):
+            return value
+        milestone_based = "milestone" in value
+        is_accelerated = parse_obj_as(bool, value.get("is_accelerated", False))
+        for field in cls.__fields__["__root__"].sub_fields:
+            schedule = field.type_
+            accelerated_field = schedule.__fields__.get("is_accelerated")
+            if accelerated_field is None:
+                if not milestone_based:
+                    return schedule.parse_obj(value)
+            elif milestone_based and accelerated_field.default == is_accelerated:
+                return schedule.parse_obj(value)
+        return value
+
     def is_named(self, name):
         return self.__root__.is_named(name)
 
@@ -1,2 +1,2 @@
-from .business import Customer, RetrievedCustomer
+from .business import Customer, RetrievedCustomer, CustomerListing
 from .exceptions import CustomerNotFound
\ No newline at end of file
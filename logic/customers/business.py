@@ -1,8 +1,13 @@
 from datetime import datetime
 
+from typing import List
+from uuid import UUID
+
 from pydantic import BaseModel
 
-from common import ObjRef
+from common import ObjRef, Listing
+from common.tracing import traced
+from exceptions import UnprocessableEntity
 
 
 class Customer(BaseModel):
@@ -12,6 +17,18 @@ class Customer(BaseModel):
         return self.name == name
 
 
-class RetrievedCustomer(Customer):
+class RetrievedCustomer(Customer, ObjRef):
     created_at: datetime
     updated_at: datetime
+
+
+class CustomerListing(Listing):
+    results: List[RetrievedCustomer]
+
+    @staticmethod
+    @traced
+    async def from_loader(loader, customer_ids: List[UUID], max_ids: int):
+        if len(customer_ids) > max_ids:
+            raise UnprocessableEntity(f"At most {max_ids} ids can be requested at once")
+        customers = await loader.load_many(dict.fromkeys(customer_ids))
+        return CustomerListing(results=[customer for customer in customers if customer is not None], next_url=None)
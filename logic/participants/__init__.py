@@ -2,5 +2,9 @@ from .company import CompanyParticipant, RetrievedCompanyParticipant, UpdateComp
 from .academic import AcademicParticipant, UpdateAcademicParticipant, RetrievedAcademicParticipant, RetrievedHighschoolParticipant, RetrievedUniversityParticipant, RetrievedSchoolParticipant, SchoolParticipant, UniversityParticipant, HighschoolParticipant
 from .natural_person import NaturalPersonParticipant, UpdateNaturalPersonParticipant, RetrievedNaturalPerson
 from .government import GovernmentOrganismParticipant, RetrievedGovernmentOrganismParticipant, UpdateGovernmentOrganismParticipant
-from .business import Participant, ParticipantListing, UpdateParticipant, RetrievedParticipant, ListLimit
-from .exceptions import ParticipantNotFound
\ No newline at end of file
+from .business import Participant, ParticipantListing, UpdateParticipant, RetrievedParticipant, ListLimit, \
+    SparseParticipantListing
+from .exceptions import ParticipantNotFound, IdentificationNotFound, IdentificationAlreadyRegistered
+from .search import SearchLimit, SearchTerm
+from .identifications import IdentificationLookup, IdentificationMatches
+from .stats import ParticipantStats, ParticipantCount
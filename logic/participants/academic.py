@@ -1,12 +1,12 @@
 from typing import Union
-from uuid import uuid4, UUID
-from sqlalchemy import select
+from uuid import UUID
 from typing_extensions import Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enums import AcademicType, ParticipantType
-from logic.participants.common import RetrievedParticipantBase
-from models import Participant as ParticipantModel, Academic as AcademicModel
-from logic.participants.exceptions import ParticipantNotFound
+from logic.participants.common import RetrievedParticipantBase, get_participant_rows, insert_participant, update_subtype, \
+    add_subtype_field_columns, get_subtype_field_values, get_participant_json_values
+from common.json_rendering import json_object, json_value
+from models import Academic as AcademicModel
 
 
 class AcademicParticipantBase(BaseModel):
@@ -19,29 +19,29 @@ class AcademicParticipantBase(BaseModel):
 
 
 class UniversityParticipant(AcademicParticipantBase):
-    education_level: AcademicType = AcademicType.UNIVERSITY
+    education_level: Literal[AcademicType.UNIVERSITY] = AcademicType.UNIVERSITY
 
 
 class HighschoolParticipant(AcademicParticipantBase):
-    education_level: AcademicType = AcademicType.HIGHSCHOOL
+    education_level: Literal[AcademicType.HIGHSCHOOL] = AcademicType.HIGHSCHOOL
 
 
 class SchoolParticipant(AcademicParticipantBase):
-    education_level: AcademicType = AcademicType.SCHOOL
+    education_level: Literal[AcademicType.SCHOOL] = AcademicType.SCHOOL
 
 
 class AcademicParticipant(BaseModel):
-    __root__: Union[UniversityParticipant, HighschoolParticipant, SchoolParticipant]
+    __root__: Union[UniversityParticipant, HighschoolParticipant, SchoolParticipant] = Field(
+        ..., discriminator="education_level")
+
+    def get_values(self):
+        return dict(full_name=self.__root__.full_name, education_level=self.__root__.education_level)
 
     async def persist_to(self, persistence):
-        participant = ParticipantModel(id=uuid4(), is_verified=False, type=self.__root__.type)
-        academic = AcademicModel(full_name=self.__root__.full_name,
-                                 education_level=self.__root__.education_level,
-                                 id=uuid4(),
-                                 participant_id=participant.id)
-        persistence.add(participant)
-        persistence.add(academic)
-        return participant.id
+        return await insert_participant(persistence, self.__root__.type, AcademicModel, self.get_values())
+
+    def get_rows(self, participant_id: UUID):
+        return get_participant_rows(participant_id, self.__root__.type, AcademicModel, self.get_values())
 
 
 class RetrievedHighschoolParticipant(HighschoolParticipant, RetrievedParticipantBase):
@@ -56,8 +56,12 @@ class RetrievedSchoolParticipant(SchoolParticipant, RetrievedParticipantBase):
     pass
 
 
+ACADEMIC_FIELDS = {"full_name", "education_level"}
+
+
 class RetrievedAcademicParticipant(AcademicParticipant):
-    __root__: Union[RetrievedUniversityParticipant, RetrievedHighschoolParticipant, RetrievedSchoolParticipant]
+    __root__: Union[RetrievedUniversityParticipant, RetrievedHighschoolParticipant, RetrievedSchoolParticipant] = Field(
+        ..., discriminator="education_level")
 
     def is_named(self, full_name):
         return self.__root__.full_name == full_name
@@ -75,6 +79,21 @@ class RetrievedAcademicParticipant(AcademicParticipant):
         query = query.join(AcademicModel, isouter=True)
         return query
 
+    @staticmethod
+    def add_field_columns_to_query(query, fields):
+        return add_subtype_field_columns(query, AcademicModel, ParticipantType.ACADEMIC, fields & ACADEMIC_FIELDS)
+
+    @staticmethod
+    def from_field_row(row, fields):
+        return get_subtype_field_values(row, ParticipantType.ACADEMIC, fields & ACADEMIC_FIELDS)
+
+    @staticmethod
+    def get_json_object():
+        # Every education level renders the same fields, in the same order
+        return json_object(RetrievedUniversityParticipant, dict(
+            get_participant_json_values(), full_name=json_value(AcademicModel.full_name),
+            education_level=json_value(AcademicModel.education_level)))
+
     @staticmethod
     def from_row(row):
         participant, academic = row
@@ -89,13 +108,4 @@ class UpdateAcademicParticipant(BaseModel):
     type: Literal[ParticipantType.ACADEMIC] = ParticipantType.ACADEMIC
 
     async def update_to_persistance(self, participant_id: UUID, persistance):
-        values = self.dict(exclude_none=True)
-        query = select(AcademicModel).select_from(AcademicModel).filter(AcademicModel.participant_id == participant_id)
-        res = await persistance.execute(query)
-
-        try:
-            company = res.all()[0][0]
-            for field, value in values.items():
-                setattr(company, field, value)
-        except IndexError:
-            raise ParticipantNotFound(participant_id)
+        await update_subtype(AcademicModel, participant_id, self.dict(exclude={"type"}, exclude_none=True), persistance)
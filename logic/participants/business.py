@@ -1,23 +1,33 @@
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Union, List
-from uuid import UUID
+from functools import lru_cache
+from typing import Union, List, Dict, Set, Any
+from uuid import uuid4, UUID
 
-from pydantic import BaseModel, ConstrainedInt
-from sqlalchemy import select, asc, desc
+from pydantic import BaseModel, ConstrainedInt, Field
+from sqlalchemy import select, asc, desc, update, func, insert, case
+from sqlalchemy.exc import IntegrityError
 
 from common import Listing
-from enums import ParticipantType, SortOrder
-from models.participants import Participant as ParticipantModel
+from common.json_rendering import json_array, render_object
+from common.tracing import traced
+from exceptions import UnprocessableEntity
+from enums import SortOrder, ParticipantField
+from models.participants import Participant as ParticipantModel, Identification as IdentificationModel
 
 from logic.participants.academic import AcademicParticipant, RetrievedAcademicParticipant, UpdateAcademicParticipant
 from logic.participants.company import CompanyParticipant, RetrievedCompanyParticipant, UpdateCompanyParticipant
-from logic.participants.exceptions import ParticipantNotFound
+from logic.participants.exceptions import ParticipantNotFound, IdentificationNotFound
 from logic.participants.government import GovernmentOrganismParticipant, RetrievedGovernmentOrganismParticipant, \
     UpdateGovernmentOrganismParticipant
-from logic.participants.natural_person import UpdateNaturalPersonParticipant, NaturalPersonParticipant, RetrievedNaturalPerson
+from logic.participants.natural_person import UpdateNaturalPersonParticipant, NaturalPersonParticipant, RetrievedNaturalPerson, \
+    Identification
+from logic.participants.search import get_search_query
 
 
 MAX_PARTICIPANT_LIST_LIMIT = 1000
+# Fields every participant has, read from the participants table itself
+PARTICIPANT_FIELDS = {"id", "type", "created_at", "is_verified"}
 
 
 class ListLimit(ConstrainedInt):
@@ -25,31 +35,59 @@ class ListLimit(ConstrainedInt):
     le = MAX_PARTICIPANT_LIST_LIMIT
 
 
+@lru_cache
+def get_union_members(model) -> Dict:
+    """Discriminator value to member class of a discriminated ``__root__`` union, as pydantic dispatches it."""
+    return {value: field.type_ for value, field in model.__fields__["__root__"].sub_fields_mapping.items()}
+
+
 class Participant(BaseModel):
-    __root__: Union[NaturalPersonParticipant, GovernmentOrganismParticipant, CompanyParticipant, AcademicParticipant]
+    __root__: Union[NaturalPersonParticipant, GovernmentOrganismParticipant, CompanyParticipant, AcademicParticipant] = Field(
+        ..., discriminator="type")
 
+    @traced
     async def persist_to(self, persistence):
         res = await self.__root__.persist_to(persistence)
         return res
 
+    @staticmethod
+    @traced
+    async def persist_batch(participants: List["Participant"], persistence) -> List[UUID]:
+        """Persists many participants with one multi-row INSERT per table, parents first."""
+        participant_ids = []
+        rows = defaultdict(list)
+        for participant in participants:
+            participant_id = uuid4()
+            participant_ids.append(participant_id)
+            for model, row in participant.__root__.get_rows(participant_id):
+                rows[model].append(row)
+        try:
+            for model, values in rows.items():
+                await persistence.execute(insert(model.__table__).values(values))
+        except IntegrityError as e:
+            # Failing batches are retried item by item, so a lone natural person gets a proper error
+            identification = getattr(participants[0].__root__, "identification", None)
+            if len(participants) == 1 and identification is not None:
+                identification.raise_if_taken(e)
+            raise
+        return participant_ids
+
 
 class UpdateParticipant(BaseModel):
-    __root__: Union[UpdateNaturalPersonParticipant, UpdateCompanyParticipant, UpdateGovernmentOrganismParticipant, UpdateAcademicParticipant]
+    __root__: Union[UpdateNaturalPersonParticipant, UpdateCompanyParticipant, UpdateGovernmentOrganismParticipant, UpdateAcademicParticipant] = Field(
+        ..., discriminator="type")
 
+    @traced
     async def update_to_persistance(self, participant_id: UUID, persistance):
         await self.__root__.update_to_persistance(participant_id, persistance)
 
 
 class RetrievedParticipant(BaseModel):
-    __root__: Union[RetrievedNaturalPerson, RetrievedGovernmentOrganismParticipant, RetrievedCompanyParticipant, RetrievedAcademicParticipant]
-    _types = {
-        ParticipantType.COMPANY: RetrievedCompanyParticipant,
-        ParticipantType.GOVERNMENT_ORGANISM: RetrievedGovernmentOrganismParticipant,
-        ParticipantType.ACADEMIC: RetrievedAcademicParticipant,
-        ParticipantType.NATURAL_PERSON: RetrievedNaturalPerson,
-    }
+    __root__: Union[RetrievedNaturalPerson, RetrievedGovernmentOrganismParticipant, RetrievedCompanyParticipant, RetrievedAcademicParticipant] = Field(
+        ..., discriminator="type")
 
     @staticmethod
+    @traced
     async def from_persistance(participant_id: UUID, persistance):
         new_query = RetrievedParticipant.get_retrieval_query().filter(ParticipantModel.id == participant_id)
         res = await persistance.execute(new_query)
@@ -60,18 +98,79 @@ class RetrievedParticipant(BaseModel):
             return returnable
         raise ParticipantNotFound(participant_id)
 
+    @staticmethod
+    @traced
+    async def from_identification(identification: Identification, persistance):
+        # The retrieval query already joins identifications, so the unique (type, value) index drives it
+        query = RetrievedParticipant.get_retrieval_query().filter(IdentificationModel.type == identification.type,
+                                                                  IdentificationModel.value == identification.value)
+        res = await persistance.execute(query)
+        row = res.first()
+        if row is None:
+            raise IdentificationNotFound(identification.type, identification.value)
+        return RetrievedParticipant.retrieve_participant_from_row(row)
+
+    @staticmethod
+    @traced
+    async def from_persistance_many(participant_ids: List[UUID], persistance) -> Dict[UUID, "RetrievedParticipant"]:
+        query = RetrievedParticipant.get_retrieval_query().filter(ParticipantModel.id.in_(participant_ids))
+        res = await persistance.execute(query)
+        participants = (RetrievedParticipant.retrieve_participant_from_row(row) for row in res.all())
+        return {participant.id: participant for participant in participants}
+
+    @staticmethod
+    @traced
+    async def disable(participant_id: UUID, persistance):
+        participants = ParticipantModel.__table__
+        query = update(participants).where(participants.c.id == participant_id, participants.c.disabled_at.is_(None)) \
+            .values(disabled_at=func.current_timestamp()).returning(participants.c.id)
+        res = await persistance.execute(query)
+        if res.first() is None:
+            raise ParticipantNotFound(participant_id)
+
     @staticmethod
     def get_retrieval_query():
-        new_query = select(ParticipantModel).select_from(ParticipantModel)
-        for sub_field in RetrievedParticipant._types.values():
+        new_query = select(ParticipantModel).select_from(ParticipantModel).filter(ParticipantModel.disabled_at.is_(None))
+        for sub_field in get_union_members(RetrievedParticipant).values():
             new_query = sub_field.add_columns_to_query(new_query)
             new_query = sub_field.add_joins_to_query(new_query)
         return new_query
 
+    @staticmethod
+    def get_json_retrieval_query():
+        """Each participant rendered to JSON text by Postgres, as ``participant``."""
+        members = get_union_members(RetrievedParticipant)
+        participant = case(*((ParticipantModel.type == participant_type, sub_field.get_json_object())
+                             for participant_type, sub_field in members.items()))
+        query = select(participant.label("participant"), ParticipantModel.created_at) \
+            .select_from(ParticipantModel).filter(ParticipantModel.disabled_at.is_(None))
+        for sub_field in members.values():
+            query = sub_field.add_joins_to_query(query)
+        return query
+
+    @staticmethod
+    def get_field_query(fields: Set[str]):
+        """Selects only ``fields``, joining only the subtype tables they come from.
+
+        ``type`` is always read to tell which subtype's fields a row carries.
+        """
+        base_fields = sorted(fields & PARTICIPANT_FIELDS - {"type"})
+        query = select(ParticipantModel.type, *(getattr(ParticipantModel, field).label(field) for field in base_fields)) \
+            .select_from(ParticipantModel).filter(ParticipantModel.disabled_at.is_(None))
+        for sub_field in get_union_members(RetrievedParticipant).values():
+            query = sub_field.add_field_columns_to_query(query, fields)
+        return query
+
+    @staticmethod
+    def retrieve_fields_from_row(row, fields: Set[str]) -> Dict[str, Any]:
+        values = {field: row._mapping[field] for field in fields & PARTICIPANT_FIELDS}
+        parser = get_union_members(RetrievedParticipant)[row.type]
+        return {**values, **parser.from_field_row(row, fields)}
+
     @staticmethod
     def retrieve_participant_from_row(row):
         participant = row[0]
-        parser = RetrievedParticipant._types[participant.type]
+        parser = get_union_members(RetrievedParticipant)[participant.type]
         the_rest = [column for column in row if column is not None]
         returnable = parser.from_row(the_rest)
         return returnable
@@ -85,16 +184,55 @@ class ParticipantListing(Listing):
     next_url: str | None
 
     @staticmethod
+    @traced
     async def from_persistance(persistance, limit: int = 10,
                                verified: bool | None = None,
                                sort: SortOrder = SortOrder.ASC,
                                timestamp_gt: Union[datetime, int] | None = None,
-                               timestamp_lt: Union[datetime, int] | None = None, ):
+                               timestamp_lt: Union[datetime, int] | None = None,
+                               fields: Set[ParticipantField] | None = None):
+        timestamp_gt = ParticipantListing.validate_timestamp_param(timestamp_gt)
+        timestamp_lt = ParticipantListing.validate_timestamp_param(timestamp_lt)
+
+        if fields:
+            fields = {field.value for field in fields}
+            query = RetrievedParticipant.get_field_query(fields)
+        else:
+            query = RetrievedParticipant.get_retrieval_query()
+        query = ParticipantListing.filter_query(query, limit, verified, sort, timestamp_gt, timestamp_lt)
+
+        results = await persistance.execute(query)
+        all_res = results.all()
+        if fields:
+            return SparseParticipantListing(
+                results=[RetrievedParticipant.retrieve_fields_from_row(res, fields) for res in all_res], next_url=None)
+        returnable = []
+        for res in all_res:
+            participant = RetrievedParticipant.retrieve_participant_from_row(res)
+            returnable.append(participant)
+
+        return ParticipantListing(results=returnable, next_url=None)
+
+    @staticmethod
+    @traced
+    async def render_from_persistance(persistance, limit: int = 10,
+                                      verified: bool | None = None,
+                                      sort: SortOrder = SortOrder.ASC,
+                                      timestamp_gt: Union[datetime, int] | None = None,
+                                      timestamp_lt: Union[datetime, int] | None = None) -> bytes:
+        """The JSON body ``from_persistance`` would be encoded into, built by Postgres in a single statement."""
         timestamp_gt = ParticipantListing.validate_timestamp_param(timestamp_gt)
         timestamp_lt = ParticipantListing.validate_timestamp_param(timestamp_lt)
 
-        query = RetrievedParticipant.get_retrieval_query()
+        query = RetrievedParticipant.get_json_retrieval_query()
+        page = ParticipantListing.filter_query(query, limit, verified, sort, timestamp_gt, timestamp_lt).subquery("page")
+        order = asc(page.c.created_at) if sort == SortOrder.ASC else desc(page.c.created_at)
+        res = await persistance.execute(select(json_array(page.c.participant, order)))
+        return render_object(ParticipantListing, results=res.scalar_one().encode(), next_url=None)
 
+    @staticmethod
+    def filter_query(query, limit: int, verified: bool | None, sort: SortOrder, timestamp_gt: datetime | None,
+                     timestamp_lt: datetime | None):
         if timestamp_gt:
             query = query.filter(ParticipantModel.created_at > timestamp_gt)
         if timestamp_lt:
@@ -110,12 +248,27 @@ class ParticipantListing(Listing):
 
         if limit > 0:
             query = query.limit(limit)
+        return query
 
+    @staticmethod
+    async def from_search(persistance, term: str, limit: int = 20):
+        ranked = get_search_query(term, limit).subquery("ranked")
+        query = RetrievedParticipant.get_retrieval_query() \
+            .join(ranked, ranked.c.participant_id == ParticipantModel.id) \
+            .order_by(desc(ranked.c.score), desc(ParticipantModel.created_at))
         results = await persistance.execute(query)
-        all_res = results.all()
-        returnable = []
-        for res in all_res:
-            participant = RetrievedParticipant.retrieve_participant_from_row(res)
-            returnable.append(participant)
-
+        returnable = [RetrievedParticipant.retrieve_participant_from_row(res) for res in results.all()]
         return ParticipantListing(results=returnable, next_url=None)
+
+    @staticmethod
+    @traced
+    async def from_loader(loader, participant_ids: List[UUID]):
+        if len(participant_ids) > MAX_PARTICIPANT_LIST_LIMIT:
+            raise UnprocessableEntity(f"At most {MAX_PARTICIPANT_LIST_LIMIT} ids can be requested at once")
+        participants = await loader.load_many(dict.fromkeys(participant_ids))
+        return ParticipantListing(results=[participant for participant in participants if participant is not None],
+                                  next_url=None)
+
+
+class SparseParticipantListing(ParticipantListing):
+    results: List[Dict[str, Any]]
@@ -1,7 +1,87 @@
 from datetime import datetime
+from typing import Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import update, insert, select, literal, exists
+
 from common import ObjRef
+from common.json_rendering import json_value, json_timestamp
+from enums import ParticipantType
+from logic.participants.exceptions import ParticipantNotFound
+from models import Participant as ParticipantModel
 
 
 class RetrievedParticipantBase(ObjRef):
     created_at: datetime
     is_verified: bool
+
+
+def is_active_participant(participant_id_column):
+    """Whether the participant ``participant_id_column`` references exists and was not disabled."""
+    participants = ParticipantModel.__table__
+    return exists().where(participants.c.id == participant_id_column, participants.c.disabled_at.is_(None))
+
+
+def get_subtype_update_query(model, participant_id: UUID, values: dict):
+    table = model.__table__
+    # An empty patch still has to tell whether the participant exists, so it assigns participant_id to itself
+    values = values or {table.c.participant_id: table.c.participant_id}
+    return update(table).where(table.c.participant_id == participant_id, is_active_participant(table.c.participant_id)) \
+        .values(values).returning(table.c.id)
+
+
+async def update_subtype(model, participant_id: UUID, values: dict, persistance):
+    res = await persistance.execute(get_subtype_update_query(model, participant_id, values))
+    if res.first() is None:
+        raise ParticipantNotFound(participant_id)
+
+
+def get_participant_rows(participant_id: UUID, participant_type, subtype_model, values: dict,
+                         subtype_id: UUID | None = None):
+    """Participant and subtype rows for a multi-row INSERT, from the same ``values`` the single insertion uses."""
+    return [(ParticipantModel, dict(id=participant_id, is_verified=False, type=participant_type)),
+            (subtype_model, dict(id=subtype_id or uuid4(), participant_id=participant_id, **values))]
+
+
+def get_child_insertion_cte(model, values: dict, parent, parent_column: str, name: str):
+    """INSERT of one ``model`` row whose ``parent_column`` is taken from the id RETURNING-ed by the ``parent`` CTE."""
+    table = model.__table__
+    row = select(*(literal(value, table.c[field].type) for field, value in values.items()), parent.c.id)
+    return insert(table).from_select([*values, parent_column], row).returning(table.c.id).cte(name)
+
+
+def get_insertion_query(participant_type, subtype_model, values: dict):
+    """Participant and subtype rows inserted in one statement; returns the query and the subtype CTE to chain on."""
+    participants = ParticipantModel.__table__
+    participant = insert(participants).values(is_verified=False, type=participant_type) \
+        .returning(participants.c.id).cte("participant")
+    subtype = get_child_insertion_cte(subtype_model, values, participant, "participant_id", "subtype")
+    return select(participant.c.id).add_cte(subtype), subtype
+
+
+async def insert_participant(persistence, participant_type, subtype_model, values: dict):
+    query, _ = get_insertion_query(participant_type, subtype_model, values)
+    res = await persistence.execute(query)
+    return res.scalar_one()
+
+
+def get_field_label(participant_type: ParticipantType, field: str) -> str:
+    return f"{participant_type.value.lower()}_{field}"
+
+
+def add_subtype_field_columns(query, model, participant_type: ParticipantType, fields: Set[str]):
+    """Selects the requested ``fields`` of a subtype table, joining it only if any was requested."""
+    if not fields:
+        return query
+    query = query.join(model, isouter=True)
+    return query.add_columns(*(getattr(model, field).label(get_field_label(participant_type, field))
+                               for field in sorted(fields)))
+
+
+def get_subtype_field_values(row, participant_type: ParticipantType, fields: Set[str]) -> dict:
+    return {field: row._mapping[get_field_label(participant_type, field)] for field in fields}
+
+
+def get_participant_json_values() -> dict:
+    return {"id": json_value(ParticipantModel.id), "created_at": json_timestamp(ParticipantModel.created_at),
+            "is_verified": json_value(ParticipantModel.is_verified), "type": json_value(ParticipantModel.type)}
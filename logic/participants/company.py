@@ -1,15 +1,15 @@
 from datetime import datetime
-from uuid import uuid4, UUID
+from uuid import UUID
 
-from sqlalchemy import select
 from typing_extensions import Literal
 
 from pydantic import BaseModel
 
 from enums import ParticipantType
-from logic.participants.common import RetrievedParticipantBase
-from models import Participant as ParticipantModel, Company as CompanyModel
-from logic.participants.exceptions import ParticipantNotFound
+from logic.participants.common import RetrievedParticipantBase, get_participant_rows, insert_participant, update_subtype, \
+    add_subtype_field_columns, get_subtype_field_values, get_participant_json_values
+from common.json_rendering import json_object, json_value
+from models import Company as CompanyModel
 
 
 class CompanyParticipant(BaseModel):
@@ -17,12 +17,17 @@ class CompanyParticipant(BaseModel):
     cuit: str
     type: Literal[ParticipantType.COMPANY] = ParticipantType.COMPANY
 
+    def get_values(self):
+        return dict(full_name=self.full_name, cuit=self.cuit)
+
     async def persist_to(self, persistence):
-        participant = ParticipantModel(id=uuid4(), is_verified=False, type=self.type)
-        company = CompanyModel(full_name=self.full_name, cuit=self.cuit, participant_id=participant.id, id=uuid4())
-        persistence.add(participant)
-        persistence.add(company)
-        return participant.id
+        return await insert_participant(persistence, self.type, CompanyModel, self.get_values())
+
+    def get_rows(self, participant_id: UUID):
+        return get_participant_rows(participant_id, self.type, CompanyModel, self.get_values())
+
+
+COMPANY_FIELDS = {"full_name", "cuit"}
 
 
 class RetrievedCompanyParticipant(CompanyParticipant, RetrievedParticipantBase):
@@ -42,6 +47,19 @@ class RetrievedCompanyParticipant(CompanyParticipant, RetrievedParticipantBase):
         query = query.join(CompanyModel, isouter=True)
         return query
 
+    @staticmethod
+    def add_field_columns_to_query(query, fields):
+        return add_subtype_field_columns(query, CompanyModel, ParticipantType.COMPANY, fields & COMPANY_FIELDS)
+
+    @staticmethod
+    def from_field_row(row, fields):
+        return get_subtype_field_values(row, ParticipantType.COMPANY, fields & COMPANY_FIELDS)
+
+    @staticmethod
+    def get_json_object():
+        return json_object(RetrievedCompanyParticipant, dict(get_participant_json_values(), full_name=json_value(CompanyModel.full_name),
+                                                             cuit=json_value(CompanyModel.cuit)))
+
     @staticmethod
     def from_row(row):
         participant, company = row
@@ -56,13 +74,4 @@ class UpdateCompanyParticipant(BaseModel):
     type: Literal[ParticipantType.COMPANY] = ParticipantType.COMPANY
 
     async def update_to_persistance(self, participant_id: UUID, persistance):
-        values = self.dict(exclude_none=True)
-        query = select(CompanyModel).select_from(CompanyModel).filter(CompanyModel.participant_id == participant_id)
-        res = await persistance.execute(query)
-
-        try:
-            company = res.all()[0][0]
-            for field, value in values.items():
-                setattr(company, field, value)
-        except IndexError:
-            raise ParticipantNotFound(participant_id)
+        await update_subtype(CompanyModel, participant_id, self.dict(exclude={"type"}, exclude_none=True), persistance)
@@ -1,8 +1,20 @@
 from uuid import UUID
 
-from exceptions import ResourceNotFound
+from exceptions import ResourceNotFound, UnprocessableEntity
 
 
 class ParticipantNotFound(ResourceNotFound):
     def __init__(self, participant_id: UUID):
         super().__init__(f"Participant not found. ID: {participant_id}")
+
+
+class IdentificationNotFound(ResourceNotFound):
+    def __init__(self, identification_type, value: str):
+        super().__init__(f"Participant not found. Identification: {identification_type.value} {value}")
+
+
+class IdentificationAlreadyRegistered(UnprocessableEntity):
+    def __init__(self, identification_type=None, value: str | None = None):
+        # Partial updates may only know one of the two
+        identification = " ".join(part for part in (identification_type and identification_type.value, value) if part)
+        super().__init__(f"Identification already registered: {identification}")
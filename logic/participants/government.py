@@ -1,15 +1,15 @@
 from datetime import datetime
-from uuid import uuid4, UUID
+from uuid import UUID
 
-from sqlalchemy import select
 from typing_extensions import Literal
 
 from pydantic import BaseModel
 
 from enums import ParticipantType
-from logic.participants.common import RetrievedParticipantBase
-from models import Participant as ParticipantModel, GovernmentOrganism as GovernmentOrganismModel
-from logic.participants.exceptions import ParticipantNotFound
+from logic.participants.common import RetrievedParticipantBase, get_participant_rows, insert_participant, update_subtype, \
+    add_subtype_field_columns, get_subtype_field_values, get_participant_json_values
+from common.json_rendering import json_object, json_value
+from models import GovernmentOrganism as GovernmentOrganismModel
 
 
 class GovernmentOrganismParticipant(BaseModel):
@@ -17,13 +17,17 @@ class GovernmentOrganismParticipant(BaseModel):
     sector: str
     type: Literal[ParticipantType.GOVERNMENT_ORGANISM] = ParticipantType.GOVERNMENT_ORGANISM
 
+    def get_values(self):
+        return dict(full_name=self.full_name, sector=self.sector)
+
     async def persist_to(self, persistence):
-        participant = ParticipantModel(id=uuid4(), is_verified=False, type=self.type)
-        government_organism = GovernmentOrganismModel(full_name=self.full_name, sector=self.sector, id=uuid4(),
-                                                      participant_id=participant.id)
-        persistence.add(participant)
-        persistence.add(government_organism)
-        return participant.id
+        return await insert_participant(persistence, self.type, GovernmentOrganismModel, self.get_values())
+
+    def get_rows(self, participant_id: UUID):
+        return get_participant_rows(participant_id, self.type, GovernmentOrganismModel, self.get_values())
+
+
+GOVERNMENT_ORGANISM_FIELDS = {"full_name", "sector"}
 
 
 class RetrievedGovernmentOrganismParticipant(GovernmentOrganismParticipant, RetrievedParticipantBase):
@@ -44,6 +48,21 @@ class RetrievedGovernmentOrganismParticipant(GovernmentOrganismParticipant, Retr
         query = query.join(GovernmentOrganismModel, isouter=True)
         return query
 
+    @staticmethod
+    def add_field_columns_to_query(query, fields):
+        return add_subtype_field_columns(query, GovernmentOrganismModel, ParticipantType.GOVERNMENT_ORGANISM,
+                                         fields & GOVERNMENT_ORGANISM_FIELDS)
+
+    @staticmethod
+    def from_field_row(row, fields):
+        return get_subtype_field_values(row, ParticipantType.GOVERNMENT_ORGANISM, fields & GOVERNMENT_ORGANISM_FIELDS)
+
+    @staticmethod
+    def get_json_object():
+        return json_object(RetrievedGovernmentOrganismParticipant, dict(
+            get_participant_json_values(), full_name=json_value(GovernmentOrganismModel.full_name),
+            sector=json_value(GovernmentOrganismModel.sector)))
+
     @staticmethod
     def from_row(row):
         participant, organism = row
@@ -57,13 +76,4 @@ class UpdateGovernmentOrganismParticipant(BaseModel):
     type: Literal[ParticipantType.GOVERNMENT_ORGANISM] = ParticipantType.GOVERNMENT_ORGANISM
 
     async def update_to_persistance(self, participant_id: UUID, persistance):
-        values = self.dict(exclude_none=True)
-        query = select(GovernmentOrganismModel).select_from(GovernmentOrganismModel).filter(GovernmentOrganismModel.participant_id == participant_id)
-        res = await persistance.execute(query)
-
-        try:
-            company = res.all()[0][0]
-            for field, value in values.items():
-                setattr(company, field, value)
-        except IndexError:
-            raise ParticipantNotFound(participant_id)
+        await update_subtype(GovernmentOrganismModel, participant_id, self.dict(exclude={"type"}, exclude_none=True), persistance)
@@ -0,0 +1,59 @@
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from sqlalchemy import select, func, cast, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from common.tracing import traced
+from logic.participants.natural_person import Identification
+from models import Participant as ParticipantModel, NaturalPerson as NaturalPersonModel, \
+    Identification as IdentificationModel
+from models.enums import identification_type
+
+MAX_IDENTIFICATION_LOOKUPS = 10000
+
+
+class IdentificationMatch(Identification):
+    participant_id: UUID | None
+
+
+class IdentificationMatches(BaseModel):
+    results: List[IdentificationMatch]
+
+
+class IdentificationLookup(BaseModel):
+    identifications: List[Identification] = Field(..., max_items=MAX_IDENTIFICATION_LOOKUPS)
+
+    @traced
+    async def from_persistance(self, persistance) -> IdentificationMatches:
+        """One match per requested identification, in order, with ``participant_id`` None when nobody has it."""
+        requested = list(dict.fromkeys((identification.type, identification.value)
+                                       for identification in self.identifications))
+        participant_ids = {}
+        if requested:
+            res = await persistance.execute(self.get_lookup_query(), {
+                "types": [identification_type.value for identification_type, _ in requested],
+                "values": [value for _, value in requested],
+            })
+            participant_ids = {(row.type, row.value): row.participant_id for row in res}
+        return IdentificationMatches(results=[
+            IdentificationMatch(type=identification.type, value=identification.value,
+                                participant_id=participant_ids.get((identification.type, identification.value)))
+            for identification in self.identifications
+        ])
+
+    @staticmethod
+    def get_lookup_query():
+        # Two array parameters however many identifications are looked up; each unnested pair probes the unique
+        # (type, value) index
+        lookups = select(
+            func.unnest(cast(bindparam("types", type_=ARRAY(String)), ARRAY(identification_type)),
+                        type_=identification_type).label("type"),
+            func.unnest(cast(bindparam("values", type_=ARRAY(String)), ARRAY(String)), type_=String).label("value"),
+        ).subquery("lookups")
+        return select(IdentificationModel.type, IdentificationModel.value, NaturalPersonModel.participant_id) \
+            .join(lookups, (IdentificationModel.type == lookups.c.type) & (IdentificationModel.value == lookups.c.value)) \
+            .join(NaturalPersonModel, NaturalPersonModel.id == IdentificationModel.person_id) \
+            .join(ParticipantModel, ParticipantModel.id == NaturalPersonModel.participant_id) \
+            .where(ParticipantModel.disabled_at.is_(None))
@@ -1,21 +1,32 @@
 from datetime import datetime
 from uuid import uuid4, UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from typing_extensions import Literal
 
 from pydantic import BaseModel
 
 from enums import IdentificationType, ParticipantType
-from logic.participants.common import RetrievedParticipantBase
-from models import Participant as ParticipantModel, NaturalPerson as NaturalPersonModel, \
-    Identification as IdentificationModel
+from logic.participants.common import RetrievedParticipantBase, get_child_insertion_cte, get_insertion_query, \
+    get_participant_rows, get_subtype_update_query, add_subtype_field_columns, get_subtype_field_values, get_field_label, \
+    get_participant_json_values, is_active_participant
+from common.json_rendering import json_object, json_value
+from logic.participants.exceptions import ParticipantNotFound, IdentificationAlreadyRegistered
+from models import NaturalPerson as NaturalPersonModel, Identification as IdentificationModel
+
+
+IDENTIFICATION_UNIQUE_INDEX = "identifications_type_value_uidx"
 
 
 class Identification(BaseModel):
     value: str
     type: IdentificationType
 
+    def raise_if_taken(self, error: IntegrityError):
+        if IDENTIFICATION_UNIQUE_INDEX in str(error.orig):
+            raise IdentificationAlreadyRegistered(self.type, self.value) from error
+
 
 class IdentificationUpdate(BaseModel):
     value: str | None
@@ -29,17 +40,32 @@ class UpdateNaturalPersonParticipant(BaseModel):
     type: Literal[ParticipantType.NATURAL_PERSON] = ParticipantType.NATURAL_PERSON
 
     async def update_to_persistance(self, participant_id: UUID, persistance):
-        values = self.dict(exclude={"identification"}, exclude_none=True)
-        query = select(IdentificationModel, NaturalPersonModel).select_from(IdentificationModel).join(NaturalPersonModel, isouter=False).filter(NaturalPersonModel.participant_id == participant_id)
-        res = await persistance.execute(query)
-
-        identification, person = res.all()[0]
-        for field, value in values.items():
-            setattr(person, field, value)
-
-        if self.identification:
-            for field, value in self.identification.dict(exclude_none=True).items():
-                setattr(identification, field, value)
+        try:
+            res = await persistance.execute(self.get_update_query(participant_id))
+        except IntegrityError as e:
+            if self.identification and IDENTIFICATION_UNIQUE_INDEX in str(e.orig):
+                raise IdentificationAlreadyRegistered(self.identification.type, self.identification.value) from e
+            raise
+        if res.first() is None:
+            raise ParticipantNotFound(participant_id)
+
+    def get_update_query(self, participant_id: UUID):
+        values = self.dict(exclude={"identification", "type"}, exclude_none=True)
+        identification_values = self.identification.dict(exclude_none=True) if self.identification else {}
+        if values or not identification_values:
+            person = get_subtype_update_query(NaturalPersonModel, participant_id, values)
+        else:
+            persons = NaturalPersonModel.__table__
+            person = select(persons.c.id).where(persons.c.participant_id == participant_id,
+                                                is_active_participant(persons.c.participant_id))
+        if not identification_values:
+            return person
+
+        # Both tables are patched in one statement: the person row feeds the identification UPDATE through a CTE
+        person = person.cte("person")
+        identifications = IdentificationModel.__table__
+        return update(identifications).where(identifications.c.person_id == person.c.id) \
+            .values(identification_values).returning(identifications.c.person_id)
 
 
 class NaturalPersonParticipant(BaseModel):
@@ -48,16 +74,27 @@ class NaturalPersonParticipant(BaseModel):
     type: Literal[ParticipantType.NATURAL_PERSON] = ParticipantType.NATURAL_PERSON
     identification: Identification
 
+    def get_values(self):
+        return dict(first_name=self.first_name, last_name=self.last_name)
+
     async def persist_to(self, persistence):
-        participant = ParticipantModel(id=uuid4(), is_verified=False, type=self.type)
-        person = NaturalPersonModel(first_name=self.first_name, last_name=self.last_name, participant_id=participant.id,
-                                    id=uuid4())
-        identification = IdentificationModel(type=self.identification.type, value=self.identification.value,
-                                             person_id=person.id)
-        persistence.add(participant)
-        persistence.add(person)
-        persistence.add(identification)
-        return participant.id
+        query, person = get_insertion_query(self.type, NaturalPersonModel, self.get_values())
+        identification = get_child_insertion_cte(IdentificationModel, self.identification.dict(), person, "person_id",
+                                                 "identification")
+        try:
+            res = await persistence.execute(query.add_cte(identification))
+        except IntegrityError as e:
+            self.identification.raise_if_taken(e)
+            raise
+        return res.scalar_one()
+
+    def get_rows(self, participant_id: UUID):
+        person_id = uuid4()
+        return [*get_participant_rows(participant_id, self.type, NaturalPersonModel, self.get_values(), person_id),
+                (IdentificationModel, dict(id=uuid4(), person_id=person_id, **self.identification.dict()))]
+
+
+NATURAL_PERSON_FIELDS = {"first_name", "last_name"}
 
 
 class RetrievedNaturalPerson(NaturalPersonParticipant, RetrievedParticipantBase):
@@ -78,6 +115,36 @@ class RetrievedNaturalPerson(NaturalPersonParticipant, RetrievedParticipantBase)
         query = query.join(NaturalPersonModel,isouter=True).join(IdentificationModel, isouter=True)
         return query
 
+    @staticmethod
+    def add_field_columns_to_query(query, fields):
+        query = add_subtype_field_columns(query, NaturalPersonModel, ParticipantType.NATURAL_PERSON,
+                                          fields & NATURAL_PERSON_FIELDS)
+        if "identification" not in fields:
+            return query
+        # The identification is reached through the person row, which may not have been joined for its own fields
+        if not fields & NATURAL_PERSON_FIELDS:
+            query = query.join(NaturalPersonModel, isouter=True)
+        return query.join(IdentificationModel, isouter=True).add_columns(
+            IdentificationModel.type.label(get_field_label(ParticipantType.NATURAL_PERSON, "identification_type")),
+            IdentificationModel.value.label(get_field_label(ParticipantType.NATURAL_PERSON, "identification_value")))
+
+    @staticmethod
+    def from_field_row(row, fields):
+        values = get_subtype_field_values(row, ParticipantType.NATURAL_PERSON, fields & NATURAL_PERSON_FIELDS)
+        if "identification" in fields:
+            values["identification"] = dict(
+                type=row._mapping[get_field_label(ParticipantType.NATURAL_PERSON, "identification_type")],
+                value=row._mapping[get_field_label(ParticipantType.NATURAL_PERSON, "identification_value")])
+        return values
+
+    @staticmethod
+    def get_json_object():
+        identification = json_object(Identification, dict(type=json_value(IdentificationModel.type),
+                                                          value=json_value(IdentificationModel.value)))
+        return json_object(RetrievedNaturalPerson, dict(
+            get_participant_json_values(), first_name=json_value(NaturalPersonModel.first_name),
+            last_name=json_value(NaturalPersonModel.last_name), identification=identification))
+
     @staticmethod
     def from_row(row):
         participant, natural_person, identification = row
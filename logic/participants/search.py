@@ -0,0 +1,50 @@
+from pydantic import ConstrainedInt, ConstrainedStr
+from sqlalchemy import select, func, or_, union_all, literal_column, desc
+
+from models import Participant as ParticipantModel, NaturalPerson as NaturalPersonModel, \
+    Identification as IdentificationModel, Company as CompanyModel, GovernmentOrganism as GovernmentOrganismModel, \
+    Academic as AcademicModel
+
+MAX_SEARCH_LIMIT = 100
+
+
+class SearchLimit(ConstrainedInt):
+    ge = 1
+    le = MAX_SEARCH_LIMIT
+
+
+class SearchTerm(ConstrainedStr):
+    # Shorter terms have no trigrams to use the indexes with
+    strip_whitespace = True
+    min_length = 3
+    max_length = 200
+
+
+def get_natural_person_full_name():
+    # Must stay the same expression as natural_persons_full_name_trgm_idx for the planner to use it
+    return NaturalPersonModel.first_name.op("||")(literal_column("' '")).op("||")(NaturalPersonModel.last_name)
+
+
+def get_matches(column, participant_id, term: str, pattern: str):
+    """Rows whose ``column`` contains ``term`` or is trigram-similar to it, scored by similarity."""
+    return select(participant_id.label("participant_id"), func.similarity(column, term).label("score")) \
+        .where(or_(column.ilike(pattern, escape="\\"), column.op("%")(term)))
+
+
+def get_search_query(term: str, limit: int):
+    """Ids of the best matching active participants with their score, best first."""
+    pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    matches = union_all(
+        get_matches(get_natural_person_full_name(), NaturalPersonModel.participant_id, term, pattern),
+        get_matches(IdentificationModel.value, NaturalPersonModel.participant_id, term, pattern)
+        .join_from(IdentificationModel, NaturalPersonModel),
+        get_matches(CompanyModel.full_name, CompanyModel.participant_id, term, pattern),
+        get_matches(CompanyModel.cuit, CompanyModel.participant_id, term, pattern),
+        get_matches(GovernmentOrganismModel.full_name, GovernmentOrganismModel.participant_id, term, pattern),
+        get_matches(AcademicModel.full_name, AcademicModel.participant_id, term, pattern),
+    ).subquery("matches")
+    score = func.max(matches.c.score).label("score")
+    return select(matches.c.participant_id, score) \
+        .join(ParticipantModel, ParticipantModel.id == matches.c.participant_id) \
+        .where(ParticipantModel.disabled_at.is_(None)) \
+        .group_by(matches.c.participant_id).order_by(desc(score)).limit(limit)
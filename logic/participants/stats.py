@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy import select, func
+
+from common.stats import Stats, get_estimated_count_query
+from common.tracing import traced
+from enums import ParticipantType
+from models import Participant as ParticipantModel
+
+# Partial index over active participants, so its planner row count excludes disabled ones
+ACTIVE_PARTICIPANTS_INDEX = "participants_active_created_at_idx"
+
+
+class ParticipantCount(BaseModel):
+    type: ParticipantType
+    is_verified: bool
+    count: int
+
+
+class ParticipantStats(Stats):
+    counts: List[ParticipantCount] | None = None
+
+    @staticmethod
+    @traced
+    async def from_persistance(persistance, estimated: bool = False) -> "ParticipantStats":
+        computed_at = datetime.now(timezone.utc)
+        if estimated:
+            res = await persistance.execute(get_estimated_count_query(ACTIVE_PARTICIPANTS_INDEX))
+            return ParticipantStats(total=res.scalar() or 0, estimated=True, computed_at=computed_at)
+        res = await persistance.execute(ParticipantStats.get_counts_query())
+        counts = [ParticipantCount(type=row.type, is_verified=row.is_verified, count=row.count) for row in res]
+        return ParticipantStats(total=sum(count.count for count in counts), estimated=False,
+                                computed_at=computed_at, counts=counts)
+
+    @staticmethod
+    def get_counts_query():
+        return select(ParticipantModel.type, ParticipantModel.is_verified, func.count().label("count")) \
+            .where(ParticipantModel.disabled_at.is_(None)) \
+            .group_by(ParticipantModel.type, ParticipantModel.is_verified) \
+            .order_by(ParticipantModel.type, ParticipantModel.is_verified)
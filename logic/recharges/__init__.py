@@ -1,2 +1,3 @@
 from .exceptions import RechargeNotFound
-from .recharge import Recharge, RetrievedRecharge, RetrievedSatisfiedRecharge, RetrievedRejectedRecharge, RetrievedWaitingRecharge
\ No newline at end of file
+from .recharge import Recharge, RetrievedRecharge, RetrievedSatisfiedRecharge, RetrievedRejectedRecharge, RetrievedWaitingRecharge
+from .stats import RechargeStats, RechargeCount
@@ -1,21 +1,25 @@
 import urllib
 from datetime import datetime
-from typing import List, Union, Set, Optional
+from typing import List, Union, Set, Optional, Tuple, Dict, Any
 from uuid import uuid4, UUID
 
-from pydantic import BaseModel
-from sqlalchemy import select, func, asc, desc
+from pydantic import BaseModel, PrivateAttr
+from sqlalchemy import select, func, asc, desc, insert, literal
 from typing_extensions import Literal
 
 from common import ObjRef, Listing
-from enums import RechargeStatus, SortOrder
+from common.json_rendering import json_array, json_object, json_timestamp, json_value, render_object
+from common.tracing import traced
+from enums import RechargeStatus, SortOrder, RechargeField
 from logic.accounts import Address
 from logic.accounts.exceptions import AccountNotFound
+from logic.participants import RetrievedParticipant
 from logic.recharges.exceptions import RechargeNotFound
 from models import AccountController as AccountControllerModel
 from models.recharge import Recharge as RechargeModel, RechargeStatus as RechargeStatusModel
 from models.accounts import Address as AddressModel
 from models.participants import Participant as ParticipantModel
+from repositories.addresses import address_ids
 
 
 class Recharge(BaseModel):
@@ -26,18 +30,28 @@ class Recharge(BaseModel):
     def waiting_for(address: Address):
         return Recharge(address=address, status=RechargeStatus.WAITING)
 
+    @traced
     async def persist_to(self, persistance):
-        query_address = select(AddressModel).select_from(AddressModel).filter(AddressModel.public_key == self.address)
-        res = await persistance.execute(query_address)
-        try:
-            address_model = res.all()[0][0]
-            recharge = RechargeModel(id=uuid4(), address_id=address_model.id)
-            recharge_status = RechargeStatusModel(recharge_id=recharge.id, status=RechargeStatus.WAITING)
-            persistance.add(recharge)
-            persistance.add(recharge_status)
-            return recharge.id
-        except IndexError:
+        address_id = await address_ids.resolve(self.address, persistance)
+        if address_id is None:
             raise AccountNotFound(self.address)
+        res = await persistance.execute(self.get_insertion_query(address_id))
+        return res.scalar_one()
+
+    @staticmethod
+    @traced
+    async def persist_batch(recharges: List["Recharge"], persistance) -> List[UUID]:
+        return [await recharge.persist_to(persistance) for recharge in recharges]
+
+    def get_insertion_query(self, address_id: UUID):
+        # The recharge and its first status in one statement
+        recharge = insert(RechargeModel.__table__).values(id=uuid4(), address_id=address_id) \
+            .returning(RechargeModel.id).cte("recharge")
+        recharge_status = insert(RechargeStatusModel.__table__).from_select(
+            [RechargeStatusModel.recharge_id, RechargeStatusModel.status],
+            select(recharge.c.id, literal(self.status, RechargeStatusModel.status.type))
+        ).cte("recharge_status")
+        return select(recharge.c.id).add_cte(recharge_status)
 
 
 class RetrievedRecharge(ObjRef):
@@ -49,6 +63,7 @@ class RetrievedRecharge(ObjRef):
         return self.address == address
 
     @classmethod
+    @traced
     async def from_persistance(cls, recharge_id, persistance):
         query = cls.get_retrieval_query().filter(RechargeModel.id == recharge_id)
         res = await persistance.execute(query)
@@ -56,20 +71,31 @@ class RetrievedRecharge(ObjRef):
             res_all = res.all()[0]
             return cls.retrieve_recharge_from_row(res_all)
         except IndexError:
-            return RechargeNotFound(recharge_id)
+            raise RechargeNotFound(recharge_id)
 
+    @traced
     async def persist_to(self, persistance):
         recharge_status = RechargeStatusModel(recharge_id=self.id, status=self.status)
         persistance.add(recharge_status)
 
     @classmethod
     def get_retrieval_query(cls):
+        query = select(RechargeModel, AddressModel.public_key, RechargeStatusModel.status).select_from(RechargeModel).join(AddressModel)
+        return cls.join_current_status(query)
+
+    @staticmethod
+    def join_current_status(query):
         latest_status_subquery = select(
             RechargeStatusModel.recharge_id,
             func.max(RechargeStatusModel.created_at).label("last_status_date"),
         ).select_from(RechargeStatusModel).group_by(RechargeStatusModel.recharge_id).subquery()
-        query = select(RechargeModel, AddressModel.public_key, RechargeStatusModel.status, latest_status_subquery).select_from(RechargeModel).join(AddressModel).join(RechargeStatusModel).join(latest_status_subquery, RechargeModel.id == latest_status_subquery.c.recharge_id).filter(RechargeStatusModel.created_at == latest_status_subquery.c.last_status_date)
-        return query
+        return query.join(RechargeStatusModel).join(latest_status_subquery, RechargeModel.id == latest_status_subquery.c.recharge_id).filter(RechargeStatusModel.created_at == latest_status_subquery.c.last_status_date)
+
+    @staticmethod
+    def get_json_object():
+        return json_object(RetrievedRecharge, dict(
+            id=json_value(RechargeModel.id), created_at=json_timestamp(RechargeModel.created_at),
+            status=json_value(RechargeStatusModel.status), address=json_value(AddressModel.public_key)))
 
     @classmethod
     def retrieve_recharge_from_row(cls, row):
@@ -99,8 +125,11 @@ class RetrievedSatisfiedRecharge(RetrievedRecharge):
 
 class RechargeListing(Listing):
     results: List[RetrievedRecharge]
+    participants: List[RetrievedParticipant] | None = None
+    _participant_ids: List[UUID] = PrivateAttr(default_factory=list)
 
     @classmethod
+    @traced
     async def from_persistance(cls, persistance,
                                limit: int = 10,
                                sort: SortOrder = SortOrder.ASC,
@@ -109,12 +138,76 @@ class RechargeListing(Listing):
                                participant_ids: Optional[Set[UUID]] = None,
                                status: Optional[Set[RechargeStatus]] = None,
                                timestamp_gt: Union[datetime, int] | None = None,
-                               timestamp_lt: Union[datetime, int] | None = None, ):
+                               timestamp_lt: Union[datetime, int] | None = None,
+                               fields: Optional[Set[RechargeField]] = None,
+                               with_participants: bool = False):
+        timestamp_gt = cls.validate_timestamp_param(timestamp_gt)
+        timestamp_lt = cls.validate_timestamp_param(timestamp_lt)
+
+        selected = {field.value for field in fields or RechargeField}
+        query = cls.get_listing_query(selected, join_address=bool(addresses), join_status=bool(status),
+                                      join_participant=bool(participant_ids) or with_participants)
+        if with_participants:
+            query = query.add_columns(ParticipantModel.id.label("participant_id"))
+
+        query = cls.filter_query(query, limit, sort, recharge_ids, addresses, participant_ids, status, timestamp_gt,
+                                 timestamp_lt)
+
+        results = await persistance.execute(query)
+        all_res = results.all()
+        returnable = []
+        for res in all_res:
+            values = {field: res._mapping[field] for field in selected}
+            returnable.append(values if fields else RetrievedRecharge.parse_obj(values))
+
+        listing_class = SparseRechargeListing if fields else cls
+        if len(all_res) == 0:
+            return listing_class(results=[], next_url=None)
+
+        # The cursor is read from created_at, which is selected even when it is not one of the fields
+        next_url = cls.get_next_url(all_res[-1].cursor, limit, sort, recharge_ids, addresses, participant_ids, status,
+                                    timestamp_gt, timestamp_lt, fields)
+        listing = listing_class(results=returnable, next_url=next_url)
+        if with_participants:
+            listing._participant_ids = [res.participant_id for res in all_res]
+        return listing
+
+    @classmethod
+    @traced
+    async def render_from_persistance(cls, persistance,
+                                      limit: int = 10,
+                                      sort: SortOrder = SortOrder.ASC,
+                                      recharge_ids: Optional[Set[UUID]] = None,
+                                      addresses: Optional[Set[Address]] = None,
+                                      participant_ids: Optional[Set[UUID]] = None,
+                                      status: Optional[Set[RechargeStatus]] = None,
+                                      timestamp_gt: Union[datetime, int] | None = None,
+                                      timestamp_lt: Union[datetime, int] | None = None) -> bytes:
+        """The JSON body ``from_persistance`` would be encoded into, with the results built by Postgres."""
         timestamp_gt = cls.validate_timestamp_param(timestamp_gt)
         timestamp_lt = cls.validate_timestamp_param(timestamp_lt)
 
-        query = RetrievedRecharge.get_retrieval_query().add_columns(AccountControllerModel, ParticipantModel).join(AccountControllerModel).join(ParticipantModel)
+        query = cls.get_listing_query(set(), join_address=True, join_status=True,
+                                      join_participant=bool(participant_ids))
+        query = query.add_columns(RetrievedRecharge.get_json_object().label("recharge"))
+        page = cls.filter_query(query, limit, sort, recharge_ids, addresses, participant_ids, status, timestamp_gt,
+                                timestamp_lt).subquery("page")
+        if sort == SortOrder.ASC:
+            res = await persistance.execute(select(json_array(page.c.recharge, asc(page.c.cursor)),
+                                                   func.max(page.c.cursor)))
+        else:
+            res = await persistance.execute(select(json_array(page.c.recharge, desc(page.c.cursor)),
+                                                   func.min(page.c.cursor)))
+        results, cursor = res.one()
+        next_url = None
+        if cursor is not None:
+            next_url = cls.get_next_url(cursor, limit, sort, recharge_ids, addresses, participant_ids, status,
+                                        timestamp_gt, timestamp_lt)
+        return render_object(cls, next_url=next_url, results=results.encode(), participants=None)
 
+    @staticmethod
+    def filter_query(query, limit: int, sort: SortOrder, recharge_ids, addresses, participant_ids, status,
+                     timestamp_gt: datetime | None, timestamp_lt: datetime | None):
         if timestamp_gt:
             query = query.filter(RechargeModel.created_at > timestamp_gt)
         if timestamp_lt:
@@ -140,17 +233,11 @@ class RechargeListing(Listing):
 
         if limit > 0:
             query = query.limit(limit)
+        return query
 
-        results = await persistance.execute(query)
-        all_res = results.all()
-        returnable = []
-        for res in all_res:
-            participant = RetrievedRecharge.retrieve_recharge_from_row(res)
-            returnable.append(participant)
-
-        if len(all_res) == 0:
-            return cls(results=[], next_url=None)
-
+    @staticmethod
+    def get_next_url(cursor: datetime, limit: int, sort: SortOrder, recharge_ids, addresses, participant_ids, status,
+                     timestamp_gt: datetime | None, timestamp_lt: datetime | None, fields=None) -> str:
         next_params = {
             "limit": limit,
             "sort": sort.value,
@@ -160,13 +247,36 @@ class RechargeListing(Listing):
             "status": [x.value for x in status] if status else None,
             "timestamp_gt": timestamp_gt,
             "timestamp_lt": timestamp_lt,
-
+            "fields": [x.value for x in fields] if fields else None,
         }
         if sort == SortOrder.ASC:
-            next_params["timestamp_gt"] = returnable[-1].created_at
+            next_params["timestamp_gt"] = cursor
         else:
-            next_params["timestamp_lt"] = returnable[-1].created_at
+            next_params["timestamp_lt"] = cursor
         next_params = {k: v for k, v in next_params.items() if v is not None}
-        next_url = urllib.parse.urlencode(next_params, doseq=True)
+        return urllib.parse.urlencode(next_params, doseq=True)
+
+    @staticmethod
+    def get_listing_query(fields: Set[str], join_address: bool = False, join_status: bool = False,
+                          join_participant: bool = False):
+        """Selects only ``fields`` and adds only the joins they and the active filters need."""
+        columns = {"id": RechargeModel.id, "created_at": RechargeModel.created_at,
+                   "status": RechargeStatusModel.status, "address": AddressModel.public_key}
+        query = select(RechargeModel.created_at.label("cursor"),
+                       *(columns[field].label(field) for field in sorted(fields))).select_from(RechargeModel)
+        if "address" in fields or join_address or join_participant:
+            query = query.join(AddressModel)
+        if "status" in fields or join_status:
+            query = RetrievedRecharge.join_current_status(query)
+        if join_participant:
+            query = query.join(AccountControllerModel).join(ParticipantModel)
+        return query
+
+    async def load_participants(self, loader):
+        """Fills ``participants`` with the controllers of this page's addresses through a batching loader."""
+        participants = await loader.load_many(dict.fromkeys(self._participant_ids))
+        self.participants = [participant for participant in participants if participant is not None]
+
 
-        return cls(results=returnable, next_url=next_url)
+class SparseRechargeListing(RechargeListing):
+    results: List[Dict[str, Any]]
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy import select, func, desc
+
+from common.stats import Stats, get_estimated_count_query
+from common.tracing import traced
+from enums import RechargeStatus
+from models.recharge import Recharge as RechargeModel, RechargeStatus as RechargeStatusModel
+
+
+class RechargeCount(BaseModel):
+    status: RechargeStatus
+    count: int
+
+
+class RechargeStats(Stats):
+    counts: List[RechargeCount] | None = None
+
+    @staticmethod
+    @traced
+    async def from_persistance(persistance, estimated: bool = False) -> "RechargeStats":
+        computed_at = datetime.now(timezone.utc)
+        if estimated:
+            res = await persistance.execute(get_estimated_count_query(RechargeModel.__tablename__))
+            return RechargeStats(total=res.scalar() or 0, estimated=True, computed_at=computed_at)
+        res = await persistance.execute(RechargeStats.get_counts_query())
+        counts = [RechargeCount(status=row.status, count=row.count) for row in res]
+        return RechargeStats(total=sum(count.count for count in counts), estimated=False,
+                             computed_at=computed_at, counts=counts)
+
+    @staticmethod
+    def get_counts_query():
+        # A recharge's status is its latest status row
+        current_status = select(RechargeStatusModel.status) \
+            .distinct(RechargeStatusModel.recharge_id) \
+            .order_by(RechargeStatusModel.recharge_id, desc(RechargeStatusModel.created_at)) \
+            .subquery("current_status")
+        return select(current_status.c.status, func.count().label("count")) \
+            .group_by(current_status.c.status) \
+            .order_by(current_status.c.status)
@@ -4,14 +4,28 @@ from typing import Generator, Any
 from fastapi import FastAPI
 
 from app import get_app
-from settings import DatabaseSettings, AppSettings
+from session.connection import get_async_session, generate_db_url, dispose_engines
+from settings import DatabaseSettings, AppSettings, AccountsSettings
 
 db_settings = DatabaseSettings()
 app_settings = AppSettings()
+accounts_settings = AccountsSettings()
+
+
+async def warm_up_caches():
+    from repositories.addresses import address_ids
+
+    async_session = get_async_session(generate_db_url(db_settings))
+    async with async_session() as session:
+        async with session.begin():
+            await address_ids.warm_up(session)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> Generator[Any, Any, None]:
+    if accounts_settings.address_cache_warm_up:
+        await warm_up_caches()
     yield
+    await dispose_engines()
 
 app = get_app(app_settings, lifespan)
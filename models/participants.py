@@ -1,4 +1,4 @@
-from sqlalchemy import Column, func, Boolean, ForeignKey
+from sqlalchemy import Column, func, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship, mapped_column
 from sqlalchemy.types import String, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
@@ -15,6 +15,12 @@ class Participant(BaseModel):
     is_verified = Column(Boolean, default=False, nullable=False)
     date_of_verification = Column(TIMESTAMP(timezone=True), nullable=True)
     type = Column(participant_type, nullable=False)
+    disabled_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    # Listings only ever walk active participants by creation time
+    __table_args__ = (
+        Index("participants_active_created_at_idx", "created_at", postgresql_where=text("disabled_at IS NULL")),
+    )
 
 
 class Identification(BaseModel):
@@ -25,6 +31,12 @@ class Identification(BaseModel):
     person_id = mapped_column(ForeignKey("natural_persons.id"), nullable=False)
     person = relationship("NaturalPerson", back_populates="identifications")
 
+    __table_args__ = (
+        Index("identifications_type_value_uidx", "type", "value", unique=True),
+        Index("identifications_value_trgm_idx", "value", postgresql_using="gin",
+              postgresql_ops={"value": "gin_trgm_ops"}),
+    )
+
 
 class NaturalPerson(Base):
     __tablename__ = "natural_persons"
@@ -35,6 +47,11 @@ class NaturalPerson(Base):
     participant_id = mapped_column(ForeignKey("participants.id"), nullable=False)
     participant = relationship("Participant")
 
+    __table_args__ = (
+        Index("natural_persons_full_name_trgm_idx", text("(first_name || ' ' || last_name) gin_trgm_ops"),
+              postgresql_using="gin"),
+    )
+
 
 class GovernmentOrganism(Base):
     __tablename__ = "government_organisms"
@@ -44,6 +61,11 @@ class GovernmentOrganism(Base):
     participant_id = mapped_column(ForeignKey("participants.id"), nullable=False)
     participant = relationship("Participant")
 
+    __table_args__ = (
+        Index("government_organisms_full_name_trgm_idx", "full_name", postgresql_using="gin",
+              postgresql_ops={"full_name": "gin_trgm_ops"}),
+    )
+
 
 class Company(Base):
     __tablename__ = "companies"
@@ -53,6 +75,13 @@ class Company(Base):
     participant_id = mapped_column(ForeignKey("participants.id"), nullable=False)
     participant = relationship("Participant")
 
+    __table_args__ = (
+        Index("companies_full_name_trgm_idx", "full_name", postgresql_using="gin",
+              postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("companies_cuit_trgm_idx", "cuit", postgresql_using="gin",
+              postgresql_ops={"cuit": "gin_trgm_ops"}),
+    )
+
 
 class Academic(Base):
     __tablename__ = "academics"
@@ -61,3 +90,8 @@ class Academic(Base):
     education_level = Column(academic_type, nullable=False)
     participant_id = mapped_column(ForeignKey("participants.id"), nullable=False)
     participant = relationship("Participant")
+
+    __table_args__ = (
+        Index("academics_full_name_trgm_idx", "full_name", postgresql_using="gin",
+              postgresql_ops={"full_name": "gin_trgm_ops"}),
+    )
@@ -1,2 +1,3 @@
 from .vesting_schedules import Repository as VestingScheduleRepository
-from .customers import Repository as CustomerRepository
\ No newline at end of file
+from .customers import Repository as CustomerRepository, ReadOnlyRepository as CustomerReadOnlyRepository
+from .participants import ReadOnlyRepository as ParticipantReadOnlyRepository
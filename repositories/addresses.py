@@ -0,0 +1,35 @@
+from uuid import UUID
+
+from sqlalchemy import select, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.cache import LookupCache
+from models.accounts import Address as AddressModel
+from settings import AccountsSettings
+
+
+class AddressIdCache(LookupCache):
+    """Maps an address public key to its ``addresses.id`` row id."""
+
+    async def resolve(self, public_key: str, session: AsyncSession) -> UUID | None:
+        async def load():
+            query = select(AddressModel.id).filter(AddressModel.public_key == public_key)
+            res = await session.execute(query)
+            return res.scalar_one_or_none()
+
+        return await self.get_or_load(public_key, load)
+
+    async def warm_up(self, session: AsyncSession, size: int | None = None):
+        query = select(AddressModel.public_key, AddressModel.id).order_by(desc(AddressModel.created_at)).limit(
+            size or self.max_size)
+        res = await session.execute(query)
+        for public_key, address_id in reversed(res.all()):
+            self.put(public_key, address_id)
+
+
+def build_address_id_cache(settings: AccountsSettings):
+    return AddressIdCache("address_ids", max_size=settings.address_cache_size,
+                          negative_ttl=settings.address_cache_negative_ttl)
+
+
+address_ids = build_address_id_cache(AccountsSettings())
@@ -1,8 +1,11 @@
 from datetime import datetime
 
+from asyncpg import Connection, Record
 from sqlalchemy import Select, Column
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from session.query_budget import record_statement
+
 class Persistable:
     @classmethod
     def build_from(cls, buildable):
@@ -15,6 +18,21 @@ class BaseRepository:
         self.async_session = async_session
 
 
+class ReadRepository:
+    """Read-only lookups run as plain SQL on an asyncpg connection checked out of the engine's pool.
+
+    asyncpg prepares each statement once per connection and reuses it, and records are mapped straight into
+    response models, skipping the session, the ORM and validation of rows that the database already typed.
+    """
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+    async def fetch_one(self, statement: str, *args) -> Record | None:
+        record_statement()
+        return await self.connection.fetchrow(statement, *args)
+
+
 class Filter:
     
     def filter(self, query: Select, column: Column):
@@ -1,14 +1,16 @@
 from datetime import datetime
+from typing import Dict, List
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.tracing import traced
 from enums import SortOrder
 from logic.customers import Customer,  CustomerNotFound, RetrievedCustomer
 from models.customers import Customer as CustomerModel
-from repositories.common import BaseRepository, Persistable, Filter
+from repositories.common import BaseRepository, Persistable, Filter, ReadRepository
 
 
 class PersistableCustomer(Customer, Persistable):
@@ -30,25 +32,37 @@ class Repository(BaseRepository):
 
     CUSTOMER_QUERY = select(CustomerModel).select_from(CustomerModel)
 
+    @traced
     async def create(self, customer: Customer):
         persistable = PersistableCustomer.build_from(customer)
         return await persistable.persist_to(self.async_session)
 
+    @traced
     async def retrieve(self, customer_id: UUID):
         query = self.CUSTOMER_QUERY.where(CustomerModel.id == customer_id)
         res = await self.async_session.execute(query)
         res_all = res.all()
         if len(res_all) > 0:
-            customer_model = res_all[0][0]
-            returnable = RetrievedCustomer(
-                id=customer_model.id,
-                name=customer_model.name,
-                created_at=customer_model.created_at,
-                updated_at=customer_model.updated_at)
-            return returnable
+            return self.retrieve_customer_from_model(res_all[0][0])
         raise CustomerNotFound(customer_id)
 
+    @traced
+    async def retrieve_many(self, customer_ids: List[UUID]) -> Dict[UUID, RetrievedCustomer]:
+        query = self.CUSTOMER_QUERY.where(CustomerModel.id.in_(customer_ids))
+        res = await self.async_session.execute(query)
+        customers = (self.retrieve_customer_from_model(customer_model) for customer_model in res.scalars())
+        return {customer.id: customer for customer in customers}
+
+    @staticmethod
+    def retrieve_customer_from_model(customer_model):
+        return RetrievedCustomer(
+            id=customer_model.id,
+            name=customer_model.name,
+            created_at=customer_model.created_at,
+            updated_at=customer_model.updated_at)
+
 
+    @traced
     async def update(self, customer_id: UUID, customer: Customer):
         query = self.CUSTOMER_QUERY.where(CustomerModel.id == customer_id)
         res = await self.async_session.execute(query)
@@ -60,9 +74,22 @@ class Repository(BaseRepository):
             return
         raise CustomerNotFound(customer_id)
 
+    @traced
     async def list(self, limit: int = 10, sort: SortOrder = SortOrder.ASC, filters: list[Filter] = None):
         if not filters:
             filters = []
         for query_filter in filters:
             query_filter.filter()
-        pass
\ No newline at end of file
+        pass
+
+
+class ReadOnlyRepository(ReadRepository):
+    CUSTOMER_STATEMENT = "SELECT id, name, created_at, updated_at FROM customers WHERE id = $1"
+
+    @traced
+    async def retrieve(self, customer_id: UUID) -> RetrievedCustomer:
+        record = await self.fetch_one(self.CUSTOMER_STATEMENT, customer_id)
+        if record is None:
+            raise CustomerNotFound(customer_id)
+        return RetrievedCustomer.construct(**record)
+
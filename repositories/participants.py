@@ -0,0 +1,46 @@
+from uuid import UUID
+
+from asyncpg import Record
+
+from common.tracing import traced
+from logic.participants import RetrievedParticipant, RetrievedAcademicParticipant, ParticipantNotFound
+from logic.participants.business import get_union_members
+from logic.participants.natural_person import Identification
+from repositories.common import ReadRepository
+
+
+class ReadOnlyRepository(ReadRepository):
+    # Enums are read as text so asyncpg needs no type introspection for them
+    PARTICIPANT_STATEMENT = """
+        SELECT p.id, p.created_at, p.is_verified, p.type::text AS type,
+               np.first_name, np.last_name, i.type::text AS identification_type, i.value AS identification_value,
+               coalesce(g.full_name, c.full_name, a.full_name) AS full_name, g.sector, c.cuit,
+               a.education_level::text AS education_level
+        FROM participants p
+        LEFT JOIN natural_persons np ON np.participant_id = p.id
+        LEFT JOIN identifications i ON i.person_id = np.id
+        LEFT JOIN government_organisms g ON g.participant_id = p.id
+        LEFT JOIN companies c ON c.participant_id = p.id
+        LEFT JOIN academics a ON a.participant_id = p.id
+        WHERE p.id = $1 AND p.disabled_at IS NULL
+    """
+
+    @traced
+    async def retrieve(self, participant_id: UUID) -> RetrievedParticipant:
+        record = await self.fetch_one(self.PARTICIPANT_STATEMENT, participant_id)
+        if record is None:
+            raise ParticipantNotFound(participant_id)
+        return RetrievedParticipant.construct(__root__=self.retrieve_participant_from_record(record))
+
+    @staticmethod
+    def retrieve_participant_from_record(record: Record):
+        model = get_union_members(RetrievedParticipant)[record["type"]]
+        if model is RetrievedAcademicParticipant:
+            model = get_union_members(RetrievedAcademicParticipant)[record["education_level"]]
+            return RetrievedAcademicParticipant.construct(__root__=model.construct(
+                **{name: record[name] for name in model.__fields__}))
+        values = {name: record[name] for name in model.__fields__ if name != "identification"}
+        if "identification" in model.__fields__:
+            values["identification"] = Identification.construct(type=record["identification_type"],
+                                                                 value=record["identification_value"])
+        return model.construct(**values)
@@ -0,0 +1,25 @@
+from uuid import UUID
+
+from common.tracing import traced
+from logic.recharges import RechargeNotFound, RetrievedRecharge
+from repositories.common import ReadRepository
+
+
+class ReadOnlyRepository(ReadRepository):
+    # A recharge's status is its latest status row
+    RECHARGE_STATEMENT = """
+        SELECT r.id, r.created_at, s.status::text AS status, a.public_key AS address
+        FROM recharges r
+        JOIN addresses a ON a.id = r.address_id
+        JOIN LATERAL (
+            SELECT status FROM recharge_statuses WHERE recharge_id = r.id ORDER BY created_at DESC LIMIT 1
+        ) s ON true
+        WHERE r.id = $1
+    """
+
+    @traced
+    async def retrieve(self, recharge_id: UUID) -> RetrievedRecharge:
+        record = await self.fetch_one(self.RECHARGE_STATEMENT, recharge_id)
+        if record is None:
+            raise RechargeNotFound(recharge_id)
+        return RetrievedRecharge.construct(**record)
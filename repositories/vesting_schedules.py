@@ -2,6 +2,7 @@ from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.tracing import traced
 from logic.carry_pools import VestingSchedule, MilestoneBasedVestingSchedule, AcceleratedMilestoneBasedVestingSchedule, TimeBasedVestingSchedule
 from models.carry_pools import VestingSchedule as VestingScheduleModel, MilestoneVestingSchedule as MilestoneBasedVestingScheduleModel, TimeBasedVestingSchedule as TimeBasedVestingScheduleModel, Milestone as MilestoneModel
 from repositories.common import BaseRepository
@@ -31,6 +32,7 @@ class PersistableAcceleratedTimeBasedVestingSchedule(PersistableMilestoneBasedVe
 class PersistableVestingSchedule(VestingSchedule):
     __root__: PersistableTimeBasedVestingSchedule | PersistableAcceleratedTimeBasedVestingSchedule | PersistableMilestoneBasedVestingSchedule
 
+    @traced
     async def persist_to(self, repository):
         return await self.__root__.persist_to(repository)
 
@@ -43,12 +45,15 @@ class Repository(BaseRepository):
 
     RETRIEVE_QUERY = None
 
+    @traced
     async def persist(self, vesting_schedule: VestingSchedule):
         persistable = PersistableVestingSchedule.build_from(vesting_schedule)
         return await persistable.persist_to(self.async_session)
 
+    @traced
     async def retrieve(self, vesting_schedule_id: UUID):
         return
 
+    @traced
     async def list(self):
         pass
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Production entry point: ``python server.py``.
+
+Worker processes import ``main:app`` themselves, so database engines are only created
+inside each worker (lazily, on first use). On SIGTERM uvicorn stops accepting connections,
+waits up to SERVER_GRACEFUL_SHUTDOWN_TIMEOUT seconds for in-flight requests and then runs
+the app lifespan shutdown, which disposes the connection pools.
+"""
+import importlib.util
+import os
+
+import uvicorn
+
+from settings import ServerSettings
+
+
+def available_cpus() -> int:
+    # sched_getaffinity honours container CPU pinning where cpu_count does not
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(settings: ServerSettings) -> int:
+    return settings.server_workers or available_cpus()
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def get_options(settings: ServerSettings) -> dict:
+    return dict(
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=worker_count(settings),
+        loop=event_loop(),
+        http=http_protocol(),
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive,
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_timeout,
+        lifespan="on",
+        proxy_headers=True,
+        access_log=False,
+    )
+
+
+def main():
+    uvicorn.run("main:app", **get_options(ServerSettings()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-from typing import Type
+import os
+from typing import Type, Dict
 
 from fastapi.params import Depends
 from sqlalchemy import URL
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from settings import DatabaseSettings
 
@@ -11,22 +12,58 @@ def get_db_settings():
     return DatabaseSettings()
 
 
-def generate_db_url(settings: DatabaseSettings):
+def generate_db_url(settings: DatabaseSettings, hostname: str | None = None):
+    host, _, port = (hostname or settings.db_hostname).partition(":")
     return URL.create(
         drivername=settings.db_url_prefix,
         username=settings.db_username,
         password=settings.db_password,
-        host=settings.db_hostname,
-        port=settings.db_port,
+        host=host,
+        port=int(port) if port else settings.db_port,
         database=settings.db_name,
     )
 
 
-def get_async_session(database_url: str) -> Type[AsyncSession]:
-    engine = create_async_engine(database_url, echo=True, future=True)
+def generate_replica_db_urls(settings: DatabaseSettings):
+    return [generate_db_url(settings, hostname) for hostname in settings.db_replica_hostnames]
 
+
+_engines: Dict[URL | str, AsyncEngine] = {}
+
+
+def get_engine(database_url: URL | str, statement_timeout_ms: int | None = None) -> AsyncEngine:
+    # Engines (and their pools) are created lazily and kept per process, so a worker forked by the
+    # server never inherits its parent's connections.
+    engine = _engines.get(database_url)
+    if engine is None:
+        connect_args = {}
+        if statement_timeout_ms:
+            # Applies to every transaction on the connection without an extra SET LOCAL roundtrip
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+        engine = create_async_engine(database_url, echo=True, future=True, connect_args=connect_args)
+        _engines[database_url] = engine
+    return engine
+
+
+async def dispose_engines():
+    engines = list(_engines.values())
+    _engines.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+def _forget_engines_after_fork():
+    for engine in _engines.values():
+        engine.sync_engine.dispose(close=False)
+    _engines.clear()
+
+
+os.register_at_fork(after_in_child=_forget_engines_after_fork)
+
+
+def get_async_session(database_url: str, statement_timeout_ms: int | None = None) -> Type[AsyncSession]:
     async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+        get_engine(database_url, statement_timeout_ms), class_=AsyncSession, expire_on_commit=False, autoflush=False
     )
 
     return async_session
@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCount:
+    def __init__(self):
+        self.statements = 0
+        self.roundtrips = 0
+
+    def __repr__(self):
+        return f"QueryCount(statements={self.statements}, roundtrips={self.roundtrips})"
+
+
+class QueryBudget:
+    def __init__(self, statements: int, roundtrips: int):
+        self.statements = statements
+        self.roundtrips = roundtrips
+
+    def is_exceeded_by(self, count: QueryCount):
+        return count.statements > self.statements or count.roundtrips > self.roundtrips
+
+    def __repr__(self):
+        return f"QueryBudget(statements={self.statements}, roundtrips={self.roundtrips})"
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, route: str, budget: QueryBudget, count: QueryCount):
+        super().__init__(f"{route} exceeded its query budget: {count} > {budget}")
+        self.route = route
+        self.budget = budget
+        self.count = count
+
+
+_current_count: ContextVar[QueryCount | None] = ContextVar("query_count", default=None)
+
+
+def _on_statement(*_):
+    count = _current_count.get()
+    if count is not None:
+        count.statements += 1
+        count.roundtrips += 1
+
+
+def record_statement():
+    """Counts a statement sent without going through an Engine, such as on a raw driver connection."""
+    _on_statement()
+
+
+def _on_transaction_control(*_):
+    count = _current_count.get()
+    if count is not None:
+        count.roundtrips += 1
+
+
+def install_listeners():
+    if event.contains(Engine, "before_cursor_execute", _on_statement):
+        return
+    event.listen(Engine, "before_cursor_execute", _on_statement)
+    for name in ("begin", "commit", "rollback", "savepoint", "rollback_savepoint", "release_savepoint"):
+        event.listen(Engine, name, _on_transaction_control)
+
+
+@contextmanager
+def count_queries():
+    install_listeners()
+    count = QueryCount()
+    token = _current_count.set(count)
+    try:
+        yield count
+    finally:
+        _current_count.reset(token)
+
+
+def query_budget(statements: int, roundtrips: int | None = None):
+    """Declares how many SQL statements (and roundtrips, including BEGIN/COMMIT) a route may issue."""
+    budget = QueryBudget(statements, statements + 2 if roundtrips is None else roundtrips)
+
+    def decorator(endpoint):
+        endpoint.query_budget = budget
+        return endpoint
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """Counts the statements each request issues and reports routes that exceed their declared budget."""
+
+    def __init__(self, app, on_violation: Callable[[QueryBudgetExceeded], None]):
+        self.app = app
+        self.on_violation = on_violation
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with count_queries() as count:
+            await self.app(scope, receive, send)
+        budget = getattr(scope.get("endpoint"), "query_budget", None)
+        if budget is not None and budget.is_exceeded_by(count):
+            route = getattr(scope.get("route"), "path", None) or scope["endpoint"].__name__
+            self.on_violation(QueryBudgetExceeded(f"{scope['method']} {route}", budget, count))
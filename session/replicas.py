@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import itertools
+import math
+import time
+from typing import Dict, List, Mapping
+
+from pydantic import BaseModel
+from sqlalchemy import URL, text
+
+from enums import ReplicaStrategy
+from session.connection import get_engine
+
+# Seconds the replica is behind. A replica that is streaming and has replayed everything it received is caught up
+# even if the primary has been idle, and a server that is not in recovery has nothing to replay. One whose WAL
+# receiver is not streaming may be missing any amount of WAL, so it is only as fresh as its last replayed
+# transaction. The receiver's status is only visible to roles with pg_read_all_stats; without it, replicas of an
+# idle primary look as old as their last replayed transaction.
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            AND EXISTS (SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+STICKY_COOKIE = "primary_until"
+
+
+class ReplicaStats(BaseModel):
+    host: str
+    lag_s: float | None
+    healthy: bool
+    checked_out: int
+    reads: int
+
+
+class ReplicaRouterStats(BaseModel):
+    strategy: ReplicaStrategy
+    max_lag_s: float
+    primary_reads: int
+    replicas: List[ReplicaStats]
+
+
+class ReplicaRouter:
+    """Picks the database a read-only request runs on.
+
+    Reads are spread over the replicas whose last measured lag is within ``max_lag`` seconds, and go to the
+    primary when there are none. Lag is measured in the background at most every ``lag_check_interval``
+    seconds per replica; an unreachable replica is skipped until a later check succeeds.
+    """
+
+    def __init__(self, primary_url: URL, replica_urls: List[URL], strategy: ReplicaStrategy, max_lag: float,
+                 lag_check_interval: float, sticky_window: float, statement_timeout_ms: int | None = None):
+        self.primary_url = primary_url
+        self.replica_urls = replica_urls
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.sticky_window = sticky_window
+        self.statement_timeout_ms = statement_timeout_ms
+        self._lags: Dict[URL, float | None] = dict.fromkeys(replica_urls)
+        self._checked_at: Dict[URL, float] = dict.fromkeys(replica_urls, -math.inf)
+        self._checking: Dict[URL, asyncio.Task] = {}
+        self._turn = itertools.count()
+        self._reads: Dict[URL, int] = dict.fromkeys(replica_urls, 0)
+        self.primary_reads = 0
+
+    def choose(self) -> URL:
+        for url in self.replica_urls:
+            self._check_if_stale(url)
+        healthy = [url for url in self.replica_urls if self.is_healthy(url)]
+        if not healthy:
+            self.primary_reads += 1
+            return self.primary_url
+        if self.strategy == ReplicaStrategy.LEAST_CONNECTIONS:
+            url = min(healthy, key=self.checked_out)
+        else:
+            url = healthy[next(self._turn) % len(healthy)]
+        self._reads[url] += 1
+        return url
+
+    def is_healthy(self, url: URL) -> bool:
+        lag = self._lags[url]
+        return lag is not None and lag <= self.max_lag
+
+    def checked_out(self, url: URL) -> int:
+        return get_engine(url, self.statement_timeout_ms).pool.checkedout()
+
+    def is_sticky(self, cookies: Mapping[str, str]) -> bool:
+        """Whether the client wrote recently enough that a replica might not show the write yet."""
+        try:
+            return float(cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def stick(self, response):
+        response.set_cookie(STICKY_COOKIE, str(time.time() + self.sticky_window), max_age=math.ceil(self.sticky_window),
+                            httponly=True, samesite="lax")
+
+    def _check_if_stale(self, url: URL):
+        if url in self._checking or time.monotonic() - self._checked_at[url] < self.lag_check_interval:
+            return
+        # A fresh context keeps the check's statement out of whichever request happened to trigger it
+        task = asyncio.get_running_loop().create_task(self.check_lag(url), context=contextvars.Context())
+        self._checking[url] = task
+        task.add_done_callback(lambda _: self._checking.pop(url, None))
+
+    async def check_lag(self, url: URL):
+        try:
+            async with get_engine(url, self.statement_timeout_ms).connect() as connection:
+                lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar()
+            self._lags[url] = float(lag) if lag is not None else None
+        except Exception:
+            self._lags[url] = None
+        finally:
+            self._checked_at[url] = time.monotonic()
+
+    def stats(self) -> ReplicaRouterStats:
+        return ReplicaRouterStats(strategy=self.strategy, max_lag_s=self.max_lag, primary_reads=self.primary_reads,
+                                  replicas=[ReplicaStats(host=f"{url.host}:{url.port}", lag_s=self._lags[url],
+                                                         healthy=self.is_healthy(url),
+                                                         checked_out=self.checked_out(url), reads=self._reads[url])
+                                            for url in self.replica_urls])
+
+
+replica_routers: Dict[URL, ReplicaRouter] = {}
+
+
+def get_replica_router(primary_url: URL, build) -> ReplicaRouter:
+    router = replica_routers.get(primary_url)
+    if router is None:
+        router = replica_routers[primary_url] = build()
+    return router
@@ -0,0 +1,163 @@
+import json
+import logging
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
+
+from common.routing import match_route
+from exceptions import Forbidden
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+EXPLAINABLE = ("SELECT", "WITH")
+
+_current_route: ContextVar[str | None] = ContextVar("slow_query_route", default=None)
+
+
+class SlowQueriesForbidden(Forbidden):
+    def __init__(self):
+        super().__init__("Slow queries require a valid X-Slow-Query-Token")
+
+
+class SlowQuery(BaseModel):
+    route: str | None
+    statement: str
+    parameters: List[str] | Dict[str, str] | None
+    duration_ms: float
+    recorded_at: datetime
+    plan: Any = None
+
+
+class SlowQueryLogStats(BaseModel):
+    threshold_ms: float
+    explain_sample_rate: float
+    slow: int
+    explained: int
+    entries: List[SlowQuery]
+
+
+def is_write(context) -> bool:
+    """Whether the statement writes, including a SELECT whose CTEs insert, update or delete."""
+    if context.isinsert or context.isupdate or context.isdelete:
+        return True
+    compiled = context.compiled
+    return compiled is not None and any(isinstance(cte.element, UpdateBase) for cte in compiled.ctes or ())
+
+
+def redact(parameters) -> List[str] | Dict[str, str] | None:
+    """Parameter types without their values, which may hold personal data."""
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """Logs statements slower than ``threshold_ms`` and keeps the latest ``size`` of them.
+
+    A ``explain_sample_rate`` fraction of the slow reads is re-run under ``EXPLAIN (ANALYZE, BUFFERS)`` inside a
+    savepoint that is rolled back, and the plan is kept with the entry.
+    """
+
+    def __init__(self, threshold_ms: float, explain_sample_rate: float, size: int):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.entries: deque[SlowQuery] = deque(maxlen=size)
+        self.slow = 0
+        self.explained = 0
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, which is dropped with the statement even when it raises
+        context.slow_query_started = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - context.slow_query_started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        self.slow += 1
+        route = _current_route.get()
+        redacted = redact(parameters) if not executemany else None
+        logger.warning("Slow query on %s took %.1f ms: %s %s", route, duration_ms, statement, redacted)
+        plan = None
+        # Only reads are re-run; the savepoint still undoes anything a function called by the query might write
+        if not executemany and not getattr(context, "is_server_side", False) and not is_write(context) \
+                and statement.lstrip().upper().startswith(EXPLAINABLE) \
+                and random.random() < self.explain_sample_rate:
+            plan = self.explain(conn, statement, parameters)
+        self.entries.append(SlowQuery(route=route, statement=statement, parameters=redacted,
+                                      duration_ms=round(duration_ms, 3), recorded_at=datetime.now(timezone.utc),
+                                      plan=plan))
+
+    def explain(self, conn, statement, parameters):
+        # A raw cursor so the re-run neither fires these events again nor counts against the request's budget
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        except Exception:
+            logger.exception("Could not explain slow query on %s", _current_route.get())
+            return None
+        finally:
+            cursor.close()
+        self.explained += 1
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+    def stats(self) -> SlowQueryLogStats:
+        return SlowQueryLogStats(threshold_ms=self.threshold_ms, explain_sample_rate=self.explain_sample_rate,
+                                 slow=self.slow, explained=self.explained, entries=list(reversed(self.entries)))
+
+    def install(self):
+        event.listen(Engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def uninstall(self):
+        event.remove(Engine, "before_cursor_execute", self.before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", self.after_cursor_execute)
+
+
+class SlowQueryRouteMiddleware:
+    """Tags the statements each request issues with its method and route template."""
+
+    def __init__(self, app, routes: List):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route, _ = match_route(self.routes, scope)
+        token = _current_route.set(f"{scope['method']} {getattr(route, 'path', scope['path'])}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_route.reset(token)
+
+
+slow_query_logs: List[SlowQueryLog] = []
+
+
+def install_slow_query_log(app, settings):
+    for slow_query_log in slow_query_logs:
+        slow_query_log.uninstall()
+    slow_query_logs.clear()
+    slow_query_log = SlowQueryLog(settings.slow_query_threshold_ms, settings.slow_query_explain_sample_rate,
+                                  settings.slow_query_log_size)
+    slow_query_log.install()
+    slow_query_logs.append(slow_query_log)
+    app.add_middleware(SlowQueryRouteMiddleware, routes=app.router.routes)
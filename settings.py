@@ -2,6 +2,8 @@ from typing import Sequence
 
 from pydantic import BaseSettings, SecretStr, AnyHttpUrl, PositiveInt
 
+from enums import ReplicaStrategy, TracingExporter
+
 
 class DatabaseSettings(BaseSettings):
     db_url_prefix: str = "postgresql+asyncpg"
@@ -13,13 +15,67 @@ class DatabaseSettings(BaseSettings):
     db_schema: str = "banking_db"
     db_secret: SecretStr
     db_secret_key: SecretStr
+    db_statement_timeout_ms: PositiveInt | None = 5000
+    # "host" or "host:port" of streaming replicas that GET requests may read from
+    db_replica_hostnames: Sequence[str] = ()
+    db_replica_strategy: ReplicaStrategy = ReplicaStrategy.ROUND_ROBIN
+    db_replica_max_lag_s: float = 1.0
+    db_replica_lag_check_interval_s: float = 1.0
+    db_replica_sticky_window_s: float = 5.0
 
 
 class AppSettings(BaseSettings):
     sentry_dsn: str | None = None
     path_prefix: str = ""
     api_cors_origins: Sequence[AnyHttpUrl] = ()
+    disabled_routers: Sequence[str] = ()
+    admission_control: bool = True
+    admission_read_limit: PositiveInt = 8
+    admission_read_queue: PositiveInt = 200
+    admission_write_limit: PositiveInt = 6
+    admission_write_queue: PositiveInt = 200
+    admission_bulk_limit: PositiveInt = 1
+    admission_bulk_queue: PositiveInt = 10
+    admission_queue_timeout: float = 1.0
+    admission_retry_after: PositiveInt = 1
+    write_coalescing: bool = False
+    write_coalescing_max_batch: PositiveInt = 128
+    write_coalescing_max_delay_ms: float = 3.0
+    stats_cache_ttl: float = 30.0
+    database_json_rendering: bool = False
+    raw_reads: bool = False
+    # Statements slower than this are logged, and a sample of them explained; unset disables the log
+    slow_query_threshold_ms: float | None = None
+    slow_query_explain_sample_rate: float = 0.1
+    slow_query_log_size: PositiveInt = 100
+    # GET /admin/slow-queries requires it in X-Slow-Query-Token; unset disables the route
+    slow_query_token: SecretStr | None = None
+    profiling: bool = False
+    profiling_interval_ms: float = 5.0
+    # Profile every request and keep the profiles of the ones slower than this
+    profiling_latency_threshold_ms: float | None = None
+    # Requests carrying it in X-Profile-Token are profiled, and /admin/profiles requires it; unset disables both
+    profiling_token: SecretStr | None = None
+    profiling_keep: PositiveInt = 20
+    tracing: bool = False
+    # Fraction of new traces that are recorded
+    tracing_sample_ratio: float = 1.0
+    tracing_exporter: TracingExporter = TracingExporter.OTLP
+    # Where the file exporter appends one JSON span per line
+    tracing_file: str = "spans.jsonl"
 
 
 class AccountsSettings(BaseSettings):
     balance_limit: PositiveInt = 100000000
+    address_cache_size: PositiveInt = 100000
+    address_cache_negative_ttl: float = 5.0
+    address_cache_warm_up: bool = False
+
+
+class ServerSettings(BaseSettings):
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: PositiveInt | None = None
+    server_backlog: PositiveInt = 2048
+    server_keep_alive: PositiveInt = 5
+    server_graceful_shutdown_timeout: PositiveInt = 30
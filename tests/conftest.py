@@ -10,8 +10,10 @@ from sqlalchemy.orm import Session
 
 from app import get_app
 from common import ObjRef
+from dependencies.db import get_app_settings
 from logic.customers import Customer
-from session.connection import Base
+from session.connection import Base, dispose_engines
+from session.query_budget import QueryBudgetMiddleware
 from settings import DatabaseSettings, AppSettings
 
 
@@ -30,8 +32,13 @@ class PrefixTestClient(TestClient):
 
 
 @pytest.fixture
-def app_settings():
-    return AppSettings()
+def app_settings(request):
+    return getattr(request, "param", None) or AppSettings()
+
+
+# Runs a single-entity lookup test against both the ORM and the raw asyncpg read paths
+both_read_paths = pytest.mark.parametrize("app_settings", [AppSettings(), AppSettings(raw_reads=True)],
+                                          indirect=True, ids=["orm_reads", "raw_reads"])
 
 
 @pytest.fixture
@@ -55,17 +62,28 @@ def db_session_tests(db_test_settings):
     session.close()
 
 
+@pytest.fixture
+def query_budget_violations():
+    violations = []
+    yield violations
+    assert not violations, "\n".join(str(violation) for violation in violations)
+
+
 @pytest.fixture
 def client(
     app_settings,
     db_settings,
-    db_session_tests
+    db_session_tests,
+    query_budget_violations
 ) -> TestClient:
 
     async def lifespan(application: FastAPI):
         yield
+        await dispose_engines()
 
     app = get_app(app_settings, lifespan)
+    app.dependency_overrides[get_app_settings] = lambda: app_settings
+    app.add_middleware(QueryBudgetMiddleware, on_violation=query_budget_violations.append)
     with PrefixTestClient(app, app_settings.path_prefix) as client:
         # Default customer for most unit tests
         yield client
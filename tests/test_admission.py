@@ -0,0 +1,39 @@
+import asyncio
+import http
+
+from starlette.testclient import TestClient
+
+from common.admission import ConcurrencyLimiter
+from enums import RouteClass
+
+
+def test_limiter_queues_then_sheds_excess_requests():
+    limiter = ConcurrencyLimiter(RouteClass.READ, limit=2, queue_size=2, timeout=0.2)
+
+    async def request(duration):
+        if not await limiter.acquire():
+            return "shed"
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            limiter.release()
+        return "ok"
+
+    async def burst():
+        return await asyncio.gather(*(request(0.1) for _ in range(6)))
+
+    assert sorted(asyncio.run(burst())) == ["ok"] * 4 + ["shed"] * 2
+    stats = limiter.stats()
+    assert (stats.in_flight, stats.admitted, stats.queued, stats.shed) == (0, 4, 2, 2)
+
+
+def test_admission_stats_are_exposed(client: TestClient):
+    res = client.get("/participants")
+    assert res.status_code == http.HTTPStatus.OK
+
+    res_admission = client.get("/admin/admission")
+    assert res_admission.status_code == http.HTTPStatus.OK
+    stats = {limiter["route_class"]: limiter for limiter in res_admission.json()}
+    assert set(stats) == {"read", "write", "bulk"}
+    assert stats["read"]["admitted"] >= 1
+    assert stats["read"]["in_flight"] == 1
@@ -0,0 +1,79 @@
+import asyncio
+import http
+
+from sqlalchemy.exc import DataError, OperationalError
+from starlette.testclient import TestClient
+
+from common import ObjRef
+from common.coalescer import WriteCoalescer, coalescers
+from dependencies.coalescers import get_app_settings
+from logic.participants import CompanyParticipant, RetrievedCompanyParticipant
+from settings import AppSettings
+
+
+def test_coalescer_batches_and_isolates_failures():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        if "bad" in items:
+            raise DataError("INSERT", {}, ValueError("bad item"))
+        return [item.upper() for item in items]
+
+    coalescer = WriteCoalescer("test", flush, max_batch=4, max_delay=0.01)
+
+    async def submit(item):
+        try:
+            return await coalescer.submit(item)
+        except DataError:
+            return "failed"
+
+    async def burst():
+        return await asyncio.gather(*(submit(item) for item in ["a", "b", "bad", "c", "d", "e"]))
+
+    assert asyncio.run(burst()) == ["A", "B", "failed", "C", "D", "E"]
+    # A full batch flushes right away, the rest after the delay; the failing batch is bisected
+    assert batches[0] == ["a", "b", "bad", "c"]
+    assert sorted(batches[1:]) == [["a", "b"], ["bad"], ["bad", "c"], ["c"], ["d", "e"]]
+    stats = coalescer.stats()
+    assert (stats.submitted, stats.largest_batch, stats.splits) == (6, 4, 2)
+
+
+
+def test_coalescer_fails_the_whole_batch_on_other_errors():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        raise OperationalError("INSERT", {}, ConnectionError("connection lost"))
+
+    coalescer = WriteCoalescer("test", flush, max_batch=4, max_delay=0.01)
+
+    async def submit(item):
+        try:
+            return await coalescer.submit(item)
+        except OperationalError:
+            return "failed"
+
+    async def burst():
+        return await asyncio.gather(*(submit(item) for item in ["a", "b", "c", "d"]))
+
+    assert asyncio.run(burst()) == ["failed"] * 4
+    assert batches == [["a", "b", "c", "d"]]
+    assert coalescer.stats().splits == 0
+
+def test_participant_creation_through_coalescer(client: TestClient):
+    client.app.dependency_overrides[get_app_settings] = lambda: AppSettings(write_coalescing=True)
+    coalescers.clear()
+    try:
+        participant_creation_data = CompanyParticipant(full_name="A company", cuit="20379931694", type="COMPANY")
+        res = client.post("/participants", data=participant_creation_data.json())
+        assert res.status_code == http.HTTPStatus.CREATED
+        participant_id = ObjRef.parse_raw(res.content).id
+
+        get_res = client.get(f"/participants/{participant_id}")
+        participant = RetrievedCompanyParticipant.parse_raw(get_res.content)
+        assert participant.is_named("A company")
+        assert coalescers["participants"].stats().batches == 1
+    finally:
+        coalescers.clear()
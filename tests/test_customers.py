@@ -4,8 +4,9 @@ from starlette.testclient import TestClient
 
 from common import ObjRef
 from enums import SortOrder
-from logic.customers import Customer
+from logic.customers import Customer, CustomerListing
 from logic.participants import ParticipantListing
+from tests.conftest import both_read_paths
 
 
 def test_retrieve_non_existent_customer(client: TestClient):
@@ -15,6 +16,7 @@ def test_retrieve_non_existent_customer(client: TestClient):
     assert content["detail"] == 'Customer not found. ID: 9515d9bb-d4d6-4952-9003-9d7e0436fe58'
 
 
+@both_read_paths
 def test_customer_flow(client: TestClient):
     customer = Customer.parse_obj(dict(name="My Customer"))
     res = client.post("/customers", data=customer.json())
@@ -37,6 +39,18 @@ def test_customer_flow(client: TestClient):
     assert customer.is_named("My updated name")
 
 
+def test_multi_get(client: TestClient):
+    ids = []
+    for name in ("Customer A", "Customer B", "Customer C"):
+        res = client.post("/customers", data=Customer(name=name).json())
+        ids.append(str(ObjRef.parse_raw(res.content).id))
+    missing = "9515d9bb-d4d6-4952-9003-9d7e0436fe58"
+    res = client.get("/customers", params={"ids": [ids[2], missing, ids[0], ids[2]]})
+    assert res.status_code == http.HTTPStatus.OK
+    listing = CustomerListing.parse_raw(res.content)
+    assert [customer.name for customer in listing.results] == ["Customer C", "Customer A"]
+
+
 def test_all_listing(client: TestClient, customers_example):
     params = {
         "limit": 10,
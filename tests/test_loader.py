@@ -0,0 +1,21 @@
+import asyncio
+
+from common.loader import DataLoader
+
+
+def test_loads_in_one_tick_share_one_batch():
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(sorted(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = DataLoader(batch_load)
+
+    async def load():
+        first = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+        second = await loader.load_many([2, 4])
+        return first, second
+
+    assert asyncio.run(load()) == ([10, 20, 10, None], [20, 40])
+    assert batches == [[1, 2, 3], [4]]
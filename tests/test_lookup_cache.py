@@ -0,0 +1,55 @@
+import asyncio
+import http
+
+import pytest
+from starlette.testclient import TestClient
+
+from common.cache import LookupCache, registry
+
+
+@pytest.fixture
+def lookup_cache():
+    cache = LookupCache("test_lookups", max_size=2, negative_ttl=60)
+    yield cache
+    registry.pop(cache.name, None)
+
+
+def test_loads_once_and_caches_misses(lookup_cache):
+    loads = []
+
+    async def scenario():
+        async def load(key):
+            loads.append(key)
+            return None if key == "unknown" else f"id-{key}"
+
+        return [await lookup_cache.get_or_load(key, lambda: load(key)) for key in ("a", "a", "unknown", "unknown")]
+
+    assert asyncio.run(scenario()) == ["id-a", "id-a", None, None]
+    assert loads == ["a", "unknown"]
+    stats = lookup_cache.stats()
+    assert (stats.hits, stats.negative_hits, stats.misses) == (1, 1, 2)
+
+
+def test_evicts_least_recently_used(lookup_cache):
+    lookup_cache.put("a", 1)
+    lookup_cache.put("b", 2)
+    assert lookup_cache.get("a") == 1
+    lookup_cache.put("c", 3)
+    assert not lookup_cache.contains("b")
+    assert lookup_cache.contains("a") and lookup_cache.contains("c")
+    assert lookup_cache.stats().evictions == 1
+
+
+def test_invalidated_miss_is_loaded_again(lookup_cache):
+    lookup_cache.put("a", None)
+    assert lookup_cache.contains("a")
+    lookup_cache.invalidate("a")
+    assert not lookup_cache.contains("a")
+
+
+def test_caches_are_listed(client: TestClient, lookup_cache):
+    lookup_cache.put("a", 1)
+    res = client.get("/admin/caches")
+    assert res.status_code == http.HTTPStatus.OK
+    stats = next(cache for cache in res.json() if cache["name"] == "test_lookups")
+    assert stats["size"] == 1
@@ -1,17 +1,23 @@
 import http
 
+import pytest
+from sqlalchemy import text
 from starlette.testclient import TestClient
 
 from common import ObjRef
-from enums import SortOrder
+from common.cache import refreshing_caches
+from dependencies.coalescers import get_app_settings
+from enums import SortOrder, ParticipantType
 from logic.participants import CompanyParticipant, RetrievedCompanyParticipant, UpdateCompanyParticipant
 from logic.participants import GovernmentOrganismParticipant, RetrievedGovernmentOrganismParticipant, \
     UpdateGovernmentOrganismParticipant
-from logic.participants import ParticipantListing
+from logic.participants import ParticipantListing, ParticipantStats
 from logic.participants import RetrievedAcademicParticipant, UpdateAcademicParticipant, \
     RetrievedSchoolParticipant, UniversityParticipant
 from logic.participants.natural_person import NaturalPersonParticipant, RetrievedNaturalPerson, \
     UpdateNaturalPersonParticipant
+from settings import AppSettings
+from tests.conftest import both_read_paths
 
 
 def test_retrieve_non_existent_participant(client: TestClient):
@@ -21,6 +27,23 @@ def test_retrieve_non_existent_participant(client: TestClient):
     assert content["detail"] == 'Participant not found. ID: 9515d9bb-d4d6-4952-9003-9d7e0436fe58'
 
 
+def test_update_non_existent_participant(client: TestClient):
+    update_data = UpdateCompanyParticipant(full_name="Nobody")
+    update_res = client.patch("/participants/9515d9bb-d4d6-4952-9003-9d7e0436fe58", data=update_data.json())
+    assert update_res.status_code == http.HTTPStatus.NOT_FOUND
+    content = update_res.json()
+    assert content["detail"] == 'Participant not found. ID: 9515d9bb-d4d6-4952-9003-9d7e0436fe58'
+
+
+def test_invalid_participant_reports_only_its_type(client: TestClient):
+    res = client.post("/participants", json={"type": "COMPANY", "full_name": "A company"})
+    assert res.status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+    errors = res.json()["detail"]
+    assert len(errors) == 1
+    assert errors[0]["loc"][-1] == "cuit"
+
+
+@both_read_paths
 def test_natural_person_participant_flow(client: TestClient):
     participant_creation_data = NaturalPersonParticipant.parse_obj(dict(first_name="John Sunday", last_name="Peron", type="NATURAL_PERSON", identification=dict(type="DNI", value="37993169")))
     res = client.post("/participants", data=participant_creation_data.json())
@@ -115,6 +138,167 @@ def test_university_participant_flow(client: TestClient):
     assert participant.is_named("UBA")
     assert not participant.is_verified
 
+def test_disabled_participant_is_hidden(client: TestClient):
+    participant_creation_data = CompanyParticipant(full_name="A company", cuit="20379931694", type="COMPANY")
+    res = client.post("/participants", data=participant_creation_data.json())
+    participant_id = ObjRef.parse_raw(res.content).id
+
+    delete_res = client.delete(f"/participants/{participant_id}")
+    assert delete_res.status_code == http.HTTPStatus.ACCEPTED
+    assert ObjRef.parse_raw(delete_res.content).id == participant_id
+
+    get_res = client.get(f"/participants/{participant_id}")
+    assert get_res.status_code == http.HTTPStatus.NOT_FOUND
+    listing = ParticipantListing.parse_raw(client.get("/participants").content)
+    assert len(listing.results) == 0
+
+    delete_res = client.delete(f"/participants/{participant_id}")
+    assert delete_res.status_code == http.HTTPStatus.NOT_FOUND
+
+
+def test_disabled_participant_cannot_be_updated(client: TestClient):
+    res = client.post("/participants", data=NaturalPersonParticipant.parse_obj(dict(
+        first_name="John", last_name="Peron", identification=dict(type="DNI", value="37993169"))).json())
+    participant_id = ObjRef.parse_raw(res.content).id
+    assert client.delete(f"/participants/{participant_id}").status_code == http.HTTPStatus.ACCEPTED
+
+    for patch in ({"type": "NATURAL_PERSON", "first_name": "Juan"},
+                  {"type": "NATURAL_PERSON", "identification": {"value": "37993170"}},
+                  {"type": "NATURAL_PERSON"}):
+        res = client.patch(f"/participants/{participant_id}", json=patch)
+        assert res.status_code == http.HTTPStatus.NOT_FOUND
+
+
+def test_multi_get(client: TestClient):
+    ids = []
+    for name in ("First", "Second", "Third"):
+        res = client.post("/participants", data=CompanyParticipant(full_name=name, cuit="20379931694").json())
+        ids.append(str(ObjRef.parse_raw(res.content).id))
+
+    res = client.get("/participants", params={"ids": [ids[2], ids[0]]})
+    assert res.status_code == http.HTTPStatus.OK
+    listing = ParticipantListing.parse_raw(res.content)
+    assert [participant.__root__.full_name for participant in listing.results] == ["Third", "First"]
+
+
+def test_sparse_fields(client: TestClient):
+    for participant in (NaturalPersonParticipant.parse_obj(dict(first_name="John", last_name="Peron",
+                                                                identification=dict(type="DNI", value="37993169"))),
+                        CompanyParticipant(full_name="Peron Holdings", cuit="20379931694")):
+        client.post("/participants", data=participant.json())
+
+    res = client.get("/participants", params={"fields": ["type", "full_name", "identification"], "sort": "asc"})
+    assert res.status_code == http.HTTPStatus.OK
+    assert res.json()["results"] == [
+        {"type": "NATURAL_PERSON", "identification": {"type": "DNI", "value": "37993169"}},
+        {"type": "COMPANY", "full_name": "Peron Holdings"},
+    ]
+
+    res = client.get("/participants", params={"fields": ["id"]})
+    assert [set(participant) for participant in res.json()["results"]] == [{"id"}, {"id"}]
+
+    res = client.get("/participants", params={"fields": ["password"]})
+    assert res.status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_database_json_rendering_matches_orm_encoding(client: TestClient, app_settings, db_session_tests):
+    for participant in (NaturalPersonParticipant.parse_obj(dict(first_name="Jöhn \"Sunday\"", last_name="Perón\\\n\t",
+                                                                identification=dict(type="DNI", value="37993169"))),
+                        CompanyParticipant(full_name="A company", cuit="20379931694"),
+                        GovernmentOrganismParticipant(full_name="Some direction", sector="National \u2028"),
+                        UniversityParticipant(full_name="A university")):
+        client.post("/participants", data=participant.json())
+    with db_session_tests.bind.connect() as connection:
+        # isoformat() leaves out zero microseconds
+        connection.execute(text("UPDATE participants SET created_at = date_trunc('second', created_at) - interval '1 day' "
+                                 "WHERE type = 'COMPANY'"))
+        connection.commit()
+
+    for params in ({}, {"sort": "asc", "limit": 3}, {"verified": True}):
+        orm = client.get("/participants", params=params)
+        client.app.dependency_overrides[get_app_settings] = lambda: AppSettings(database_json_rendering=True)
+        rendered = client.get("/participants", params=params)
+        client.app.dependency_overrides[get_app_settings] = lambda: app_settings
+        assert rendered.status_code == http.HTTPStatus.OK
+        assert rendered.headers["content-type"] == orm.headers["content-type"]
+        assert rendered.content == orm.content
+
+
+def test_identification_lookup(client: TestClient):
+    participant_creation_data = NaturalPersonParticipant.parse_obj(dict(first_name="John", last_name="Peron",
+                                                                        identification=dict(type="DNI", value="37993169")))
+    res = client.post("/participants", data=participant_creation_data.json())
+    participant_id = ObjRef.parse_raw(res.content).id
+
+    res = client.get("/participants/by-identification/DNI/37993169")
+    assert res.status_code == http.HTTPStatus.OK
+    assert RetrievedNaturalPerson.parse_raw(res.content).id == participant_id
+
+    res = client.get("/participants/by-identification/CUIT/37993169")
+    assert res.status_code == http.HTTPStatus.NOT_FOUND
+    assert res.json()["detail"] == "Participant not found. Identification: CUIT 37993169"
+
+    res = client.post("/participants/by-identification", json={"identifications": [
+        {"type": "CUIT", "value": "37993169"}, {"type": "DNI", "value": "37993169"}]})
+    assert res.status_code == http.HTTPStatus.OK
+    assert res.json() == {"results": [
+        {"type": "CUIT", "value": "37993169", "participant_id": None},
+        {"type": "DNI", "value": "37993169", "participant_id": str(participant_id)}]}
+
+
+def test_identification_already_registered(client: TestClient):
+    participant_creation_data = NaturalPersonParticipant.parse_obj(dict(first_name="John", last_name="Peron",
+                                                                        identification=dict(type="DNI", value="37993169")))
+    res = client.post("/participants", data=participant_creation_data.json())
+    assert res.status_code == http.HTTPStatus.CREATED
+
+    res = client.post("/participants", data=participant_creation_data.json())
+    assert res.status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+    assert res.json()["detail"] == "Identification already registered: DNI 37993169"
+
+
+def test_stats(client: TestClient):
+    refreshing_caches.clear()
+    for participant in (CompanyParticipant(full_name="First", cuit="20379931694"),
+                        CompanyParticipant(full_name="Second", cuit="20379931694"),
+                        GovernmentOrganismParticipant(full_name="Ministry", sector="National")):
+        client.post("/participants", data=participant.json())
+
+    res = client.get("/stats/participants")
+    assert res.status_code == http.HTTPStatus.OK
+    stats = ParticipantStats.parse_raw(res.content)
+    assert not stats.estimated
+    assert stats.total == 3
+    assert [(count.type, count.is_verified, count.count) for count in stats.counts] == [
+        (ParticipantType.GOVERNMENT_ORGANISM, False, 1), (ParticipantType.COMPANY, False, 2)]
+
+    res = client.get("/stats/participants", params={"estimated": True})
+    stats = ParticipantStats.parse_raw(res.content)
+    assert stats.estimated
+    assert stats.counts is None
+
+
+def test_search(client: TestClient, db_session_tests):
+    with db_session_tests.bind.connect() as connection:
+        if not connection.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first():
+            pytest.skip("pg_trgm is not installed in the test database")
+    ids = [client.post("/participants", data=participant.json()).json()["id"] for participant in (
+        NaturalPersonParticipant.parse_obj(dict(first_name="John", last_name="Peron",
+                                                identification=dict(type="DNI", value="37993169"))),
+        CompanyParticipant(full_name="Peron Holdings", cuit="30714582296"),
+        CompanyParticipant(full_name="Unrelated", cuit="30111111110"))]
+
+    res = client.get("/participants/search", params={"q": "peron"})
+    assert res.status_code == http.HTTPStatus.OK
+    assert sorted(participant["id"] for participant in res.json()["results"]) == sorted(ids[:2])
+
+    res = client.get("/participants/search", params={"q": "3799316"})
+    assert [participant["id"] for participant in res.json()["results"]] == ids[:1]
+
+    res = client.get("/participants/search", params={"q": "pe"})
+    assert res.status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 def test_all_listing(client: TestClient, customers_example):
     params = {
         "limit": 10,
@@ -0,0 +1,91 @@
+import asyncio
+import http
+import time
+
+import pytest
+from starlette.testclient import TestClient
+
+from common.profiling import Profiler, PROFILE_HEADER
+from enums import ProfileTrigger
+from settings import AppSettings
+
+ADMIN = {"X-Profile-Token": "s3cret"}
+
+
+@pytest.fixture
+def app_settings():
+    return AppSettings(profiling=True, profiling_token="s3cret")
+
+
+def busy_handler(duration):
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_samples_are_attributed_to_the_profiled_task():
+    profiler = Profiler(interval=0.001, latency_threshold=None, token=None, keep=10)
+
+    async def request():
+        profile = profiler.start("GET /busy", ProfileTrigger.ARMED)
+        busy_handler(0.05)
+        await asyncio.sleep(0.05)
+        profiler.stop(profile)
+        return profile
+
+    profile = asyncio.run(request())
+    collapsed = profile.collapsed()
+    assert "busy_handler" in collapsed
+    assert "<suspended>" in collapsed
+    assert profiler.profiles[-1] is profile
+
+
+def test_profiles_only_what_it_is_asked_to():
+    profiler = Profiler(interval=0.001, latency_threshold=None, token=None, keep=10)
+    assert not profiler.enabled
+
+    profiler = Profiler(interval=0.001, latency_threshold=None, token="s3cret", keep=10)
+    assert profiler.trigger_for("GET /participants", [(PROFILE_HEADER, b"s3cret")]) == ProfileTrigger.HEADER
+    assert profiler.trigger_for("GET /participants", [(PROFILE_HEADER, b"guess")]) is None
+
+    profiler = Profiler(interval=0.001, latency_threshold=1000, token=None, keep=10)
+
+    async def fast_request():
+        profiler.stop(profiler.start("GET /participants", ProfileTrigger.LATENCY))
+
+    asyncio.run(fast_request())
+    assert not profiler.profiles
+
+
+def test_armed_route_is_profiled_and_downloadable(client: TestClient):
+    res = client.post("/admin/profiles/arm", json={"route": "GET /participants", "requests": 1}, headers=ADMIN)
+    assert res.status_code == http.HTTPStatus.OK
+    assert res.json()[0]["armed"] == {"GET /participants": 1}
+
+    assert client.get("/participants").status_code == http.HTTPStatus.OK
+    assert client.get("/participants").status_code == http.HTTPStatus.OK
+
+    [stats] = client.get("/admin/profiles", headers=ADMIN).json()
+    assert stats["armed"] == {}
+    # The admin calls carry the token, so they are profiled too
+    [profile] = [profile for profile in stats["profiles"] if profile["route"] == "GET /participants"]
+    assert profile["trigger"] == "armed"
+
+    res_speedscope = client.get(f"/admin/profiles/{profile['id']}", headers=ADMIN)
+    assert res_speedscope.status_code == http.HTTPStatus.OK
+    assert res_speedscope.json()["profiles"][0]["type"] == "sampled"
+    res_collapsed = client.get(f"/admin/profiles/{profile['id']}?format=collapsed", headers=ADMIN)
+    assert res_collapsed.status_code == http.HTTPStatus.OK
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in res_collapsed.text.splitlines()) == profile["samples"]
+
+    assert client.get("/admin/profiles/0", headers=ADMIN).status_code == http.HTTPStatus.NOT_FOUND
+    res_unknown = client.post("/admin/profiles/arm", json={"route": "GET /nowhere"}, headers=ADMIN)
+    assert res_unknown.status_code == http.HTTPStatus.NOT_FOUND
+
+
+def test_profiling_admin_requires_the_token(client: TestClient):
+    res = client.post("/admin/profiles/arm", json={"route": "GET /participants"})
+    assert res.status_code == http.HTTPStatus.FORBIDDEN
+    res = client.get("/admin/profiles", headers={"X-Profile-Token": "guess"})
+    assert res.status_code == http.HTTPStatus.FORBIDDEN
+    assert client.get("/admin/profiles/1").status_code == http.HTTPStatus.FORBIDDEN
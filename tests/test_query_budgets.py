@@ -0,0 +1,31 @@
+import http
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.testclient import TestClient
+
+from api.participants import list_participants
+from app import get_app
+from session.query_budget import QueryBudget
+
+
+def test_every_route_declares_a_query_budget(app_settings):
+    async def lifespan(application: FastAPI):
+        yield
+
+    app = get_app(app_settings, lifespan)
+    missing = [route.path for route in app.routes
+               if isinstance(route, APIRoute) and not hasattr(route.endpoint, "query_budget")]
+    assert missing == []
+
+
+def test_route_exceeding_its_query_budget_is_reported(client: TestClient, query_budget_violations, monkeypatch):
+    monkeypatch.setattr(list_participants, "query_budget", QueryBudget(statements=0, roundtrips=2))
+    res = client.get("/participants")
+    assert res.status_code == http.HTTPStatus.OK
+
+    assert len(query_budget_violations) == 1
+    violation = query_budget_violations.pop()
+    assert violation.route == "GET /participants"
+    assert violation.count.statements == 1
+    assert violation.count.roundtrips == 3
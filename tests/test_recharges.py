@@ -1,4 +1,5 @@
 import http
+from urllib.parse import parse_qs
 
 from fastapi.testclient import TestClient
 
@@ -7,8 +8,10 @@ from enums import SortOrder, RechargeStatus
 from logic.accounts.business import RetrievedAccount
 from logic.recharges.recharge import RetrievedWaitingRecharge, RetrievedSatisfiedRecharge, RetrievedRejectedRecharge, \
     RechargeListing
+from tests.conftest import both_read_paths
 
 
+@both_read_paths
 def test_satisfied_recharge_flow(client: TestClient, address_from_natural_person_participant):
 
     res_recharges = client.post(f"/accounts/{address_from_natural_person_participant}/recharges")
@@ -98,9 +101,35 @@ def test_list_recharges_flow(client: TestClient, recharges_example):
     assert {recharge.id for recharge in third_listing.results} == only_satisfied_recharges
 
 
+def test_list_recharges_with_participants_keeps_the_participant_filter(client: TestClient, recharges_example):
+    res = client.get("/recharges", params={"with_participants": True, "limit": 1})
+    participant_id = RechargeListing.parse_raw(res.content).participants[0].__root__.id
+
+    res = client.get("/recharges", params={"participant_ids": [participant_id], "with_participants": True,
+                                           "limit": 1})
+    assert res.status_code == http.HTTPStatus.OK
+    listing = RechargeListing.parse_raw(res.content)
+    # The next page filters on the caller's participants, not on the ones found on this page
+    assert listing.next_url is not None
+    assert parse_qs(listing.next_url)["participant_ids"] == [str(participant_id)]
+
+
 def test_list_recharges_flow_empty(client: TestClient):
     res = client.get("/recharges")
     assert res.status_code == http.HTTPStatus.OK
     listing = RechargeListing.parse_raw(res.content)
 
     assert len(listing.results) == 0
+
+
+def test_recharge_for_unknown_address_is_negatively_cached(client: TestClient):
+    unknown_address = "0x000000000000000000000000000000000000dEaD"
+    for _ in range(2):
+        res_recharges = client.post(f"/accounts/{unknown_address}/recharges")
+        assert res_recharges.status_code == http.HTTPStatus.NOT_FOUND
+
+    res_caches = client.get("/admin/caches")
+    assert res_caches.status_code == http.HTTPStatus.OK
+    address_cache = next(cache for cache in res_caches.json() if cache["name"] == "address_ids")
+    assert address_cache["negative_hits"] >= 1
+
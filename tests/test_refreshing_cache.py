@@ -0,0 +1,43 @@
+import asyncio
+
+from common.cache import RefreshingCache
+
+
+def test_concurrent_first_gets_share_one_load():
+    loads = []
+
+    async def load(key):
+        loads.append(key)
+        await asyncio.sleep(0.01)
+        return f"value-{len(loads)}"
+
+    async def scenario():
+        cache = RefreshingCache("test", ttl=60, load=load)
+        return await asyncio.gather(*(cache.get("key") for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["value-1"] * 5
+    assert loads == ["key"]
+
+
+def test_expired_value_is_served_while_refreshing():
+    loads = []
+
+    async def load(key):
+        loads.append(key)
+        if len(loads) > 2:
+            raise RuntimeError("database unavailable")
+        return len(loads)
+
+    async def scenario():
+        cache = RefreshingCache("test", ttl=0, load=load)
+        values = [await cache.get("key")]
+        # Expired: the stale value is returned and a reload starts in the background
+        values.append(await cache.get("key"))
+        await asyncio.sleep(0)
+        values.append(await cache.get("key"))
+        await asyncio.sleep(0)
+        # A failed refresh keeps the last good value
+        values.append(await cache.get("key"))
+        return values
+
+    assert asyncio.run(scenario()) == [1, 1, 2, 2]
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from starlette.testclient import TestClient
+
+from dependencies.db import get_db_settings
+from enums import ReplicaStrategy
+from logic.participants import CompanyParticipant
+from session.connection import generate_db_url, dispose_engines, get_engine
+from session.replicas import ReplicaRouter, STICKY_COOKIE, replica_routers
+from settings import DatabaseSettings
+
+
+def get_router(db_settings, hostnames, strategy=ReplicaStrategy.ROUND_ROBIN):
+    # Both local hostnames reach the test database, which is not in recovery and so reports no lag
+    return ReplicaRouter(generate_db_url(db_settings, "primary"),
+                         [generate_db_url(db_settings, hostname) for hostname in hostnames], strategy,
+                         max_lag=1, lag_check_interval=60, sticky_window=5)
+
+
+def test_reads_go_to_caught_up_replicas_in_turn(db_settings):
+    async def scenario():
+        router = get_router(db_settings, ["localhost", "127.0.0.1", "localhost:1"])
+        # Nothing measured yet
+        assert router.choose() == router.primary_url
+        for url in router.replica_urls:
+            await router.check_lag(url)
+        chosen = [router.choose().host for _ in range(4)]
+        await dispose_engines()
+        return chosen, router.stats()
+
+    chosen, stats = asyncio.run(scenario())
+    assert chosen == ["localhost", "127.0.0.1", "localhost", "127.0.0.1"]
+    assert [replica.healthy for replica in stats.replicas] == [True, True, False]
+    assert stats.primary_reads == 1
+
+
+def test_least_connections_avoids_busy_replica(db_settings):
+    async def scenario():
+        router = get_router(db_settings, ["localhost", "127.0.0.1"], ReplicaStrategy.LEAST_CONNECTIONS)
+        for url in router.replica_urls:
+            await router.check_lag(url)
+        async with get_engine(router.replica_urls[0]).connect():
+            chosen = [router.choose().host for _ in range(2)]
+        await dispose_engines()
+        return chosen
+
+    assert asyncio.run(scenario()) == ["127.0.0.1", "127.0.0.1"]
+
+
+def test_reads_stick_to_primary_after_a_write(client: TestClient, db_settings):
+    client.app.dependency_overrides[get_db_settings] = lambda: DatabaseSettings(db_replica_hostnames=["127.0.0.1"])
+
+    def routed_reads():
+        stats = client.get("/admin/replicas").json()[0]
+        return stats["primary_reads"] + sum(replica["reads"] for replica in stats["replicas"])
+
+    try:
+        res = client.post("/participants", data=CompanyParticipant(full_name="A company", cuit="20379931694").json())
+        assert STICKY_COOKIE in res.cookies
+        participant_id = res.json()["id"]
+
+        before = routed_reads()
+        assert client.get(f"/participants/{participant_id}").status_code == 200
+        assert routed_reads() == before
+
+        client.cookies.clear()
+        assert client.get(f"/participants/{participant_id}").status_code == 200
+        assert routed_reads() == before + 1
+    finally:
+        replica_routers.clear()
+
+
+def test_configured_replicas_report_lag(db_settings):
+    if not db_settings.db_replica_hostnames:
+        pytest.skip("No replicas configured")
+
+    async def scenario():
+        router = get_router(db_settings, db_settings.db_replica_hostnames)
+        for url in router.replica_urls:
+            await router.check_lag(url)
+        await dispose_engines()
+        return router.stats()
+
+    assert all(replica.lag_s is not None for replica in asyncio.run(scenario()).replicas)
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from common.single_flight import SingleFlightMiddleware, normalize_query, single_flight
+
+
+def get_counting_app(bypass_cookies=()):
+    app = FastAPI()
+    calls = []
+
+    @app.get("/items")
+    @single_flight
+    async def list_items(limit: int = 10, sort: str = "desc"):
+        calls.append((limit, sort))
+        await asyncio.sleep(0.05)
+        return {"limit": limit, "sort": sort}
+
+    @app.get("/other")
+    async def other():
+        calls.append("other")
+        await asyncio.sleep(0.05)
+        return {}
+
+    app.add_middleware(SingleFlightMiddleware, routes=app.router.routes, bypass_cookies=bypass_cookies)
+    return app, calls
+
+
+def test_normalize_query_ignores_parameter_order():
+    assert normalize_query(b"sort=asc&limit=5") == normalize_query(b"limit=5&sort=asc")
+    assert normalize_query(b"limit=5") != normalize_query(b"limit=6")
+
+
+def test_identical_concurrent_gets_share_one_execution():
+    app, calls = get_counting_app()
+
+    async def burst():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await asyncio.gather(
+                *(client.get("/items?limit=5&sort=asc") for _ in range(3)),
+                client.get("/items?sort=asc&limit=5"),
+                client.get("/items?limit=6&sort=asc"),
+                *(client.get("/other") for _ in range(2)),
+            )
+
+    responses = asyncio.run(burst())
+    assert all(response.status_code == 200 for response in responses)
+    assert [response.json() for response in responses[:4]] == [{"limit": 5, "sort": "asc"}] * 4
+    assert responses[4].json() == {"limit": 6, "sort": "asc"}
+    assert sorted(calls, key=str) == [(5, "asc"), (6, "asc"), "other", "other"]
+
+
+def test_requests_with_a_bypass_cookie_run_on_their_own():
+    app, calls = get_counting_app(bypass_cookies=("primary_until",))
+
+    async def burst():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await asyncio.gather(
+                client.get("/items?limit=5"),
+                client.get("/items?limit=5", headers={"cookie": "theme=dark; primary_until=1700000000"}),
+                client.get("/items?limit=5", headers={"cookie": "theme=dark"}),
+            )
+
+    responses = asyncio.run(burst())
+    assert all(response.status_code == 200 for response in responses)
+    assert calls == [(5, "desc"), (5, "desc")]
@@ -0,0 +1,78 @@
+import http
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from starlette.testclient import TestClient
+
+from logic.participants import CompanyParticipant
+from session.slow_queries import slow_query_logs
+from settings import AppSettings
+
+
+ADMIN = {"X-Slow-Query-Token": "s3cret"}
+
+
+@pytest.fixture
+def app_settings():
+    # Every statement is slow and every slow read is explained
+    yield AppSettings(slow_query_threshold_ms=0, slow_query_explain_sample_rate=1, slow_query_token="s3cret")
+    for slow_query_log in slow_query_logs:
+        slow_query_log.uninstall()
+    slow_query_logs.clear()
+
+
+def test_slow_listing_is_logged_and_explained(client: TestClient, caplog):
+    with caplog.at_level(logging.WARNING, logger="session.slow_queries"):
+        res = client.get("/participants?verified=false&timestamp_gt=2020-01-01T00:00:00%2B00:00")
+    assert res.status_code == http.HTTPStatus.OK
+    assert any("GET /participants" in record.getMessage() for record in caplog.records)
+
+    res_slow = client.get("/admin/slow-queries", headers=ADMIN)
+    assert res_slow.status_code == http.HTTPStatus.OK
+    [stats] = res_slow.json()
+    listing = next(entry for entry in stats["entries"] if entry["route"] == "GET /participants")
+    assert "2020" not in str(listing["parameters"])
+    assert listing["plan"][0]["Plan"]["Actual Loops"] >= 1
+    assert "Shared Hit Blocks" in listing["plan"][0]["Plan"]
+
+
+def test_explaining_does_not_disturb_the_transaction(client: TestClient):
+    res = client.post("/participants", data=CompanyParticipant(full_name="A company", cuit="20379931694").json())
+    assert res.status_code == http.HTTPStatus.CREATED
+    participant_id = res.json()["id"]
+
+    assert client.get(f"/participants/{participant_id}").status_code == http.HTTPStatus.OK
+    res_listing = client.get("/participants")
+    assert [participant["id"] for participant in res_listing.json()["results"]] == [participant_id]
+    assert client.get("/admin/slow-queries", headers=ADMIN).json()[0]["explained"] >= 1
+
+
+
+def test_failing_statement_leaves_nothing_on_the_connection(client: TestClient):
+    # The client installs the log, which listens on every engine
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        info = dict(conn.info)
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing"))
+        assert conn.info == info
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_writes_are_not_explained(client: TestClient, caplog):
+    with caplog.at_level(logging.WARNING, logger="session.slow_queries"):
+        res = client.post("/participants", data=CompanyParticipant(full_name="A company", cuit="20379931694").json())
+    assert res.status_code == http.HTTPStatus.CREATED
+    assert not any(record.levelno >= logging.ERROR for record in caplog.records)
+
+    [stats] = client.get("/admin/slow-queries", headers=ADMIN).json()
+    insertions = [entry for entry in stats["entries"] if entry["route"] == "POST /participants"]
+    assert insertions and all(entry["plan"] is None for entry in insertions)
+
+
+def test_slow_queries_require_the_token(client: TestClient):
+    assert client.get("/admin/slow-queries").status_code == http.HTTPStatus.FORBIDDEN
+    res = client.get("/admin/slow-queries", headers={"X-Slow-Query-Token": "wrong"})
+    assert res.status_code == http.HTTPStatus.FORBIDDEN
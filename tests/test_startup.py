@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Only imported when the settings enable them
+OPTIONAL_PACKAGES = ("sentry_sdk", "opentelemetry.sdk", "opentelemetry.instrumentation", "opentelemetry.exporter")
+
+BUILD_APP = """
+import json
+import sys
+
+from app import get_app
+from settings import AppSettings
+
+async def lifespan(_):
+    yield
+
+get_app(AppSettings(), lifespan)
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def imported_modules(**env):
+    root = Path(__file__).parent.parent
+    res = subprocess.run([sys.executable, "-c", BUILD_APP], cwd=root, capture_output=True, text=True,
+                         env={**os.environ, "SENTRY_DSN": "", **env})
+    assert res.returncode == 0, res.stderr
+    return set(json.loads(res.stdout.splitlines()[-1]))
+
+
+def test_default_startup_skips_optional_packages():
+    imported = [module for module in imported_modules() if module.startswith(OPTIONAL_PACKAGES)]
+    assert not imported
+
+
+def test_optional_subsystems_are_not_imported():
+    modules = imported_modules(DISABLED_ROUTERS='["carry_pools", "customers"]')
+    assert "sentry_sdk" not in modules
+    assert "api.carry_pools" not in modules
+    assert "api.customers" not in modules
+    assert "api.participants" in modules
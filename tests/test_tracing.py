@@ -0,0 +1,52 @@
+import http
+import json
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.instrumentation.asyncpg import AsyncPGInstrumentor
+from starlette.testclient import TestClient
+
+from enums import TracingExporter
+from logic.participants import CompanyParticipant, UpdateCompanyParticipant
+from settings import AppSettings
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def spans_file(tmp_path):
+    return tmp_path / "spans.jsonl"
+
+
+@pytest.fixture
+def app_settings(spans_file):
+    yield AppSettings(tracing=True, tracing_exporter=TracingExporter.FILE, tracing_file=str(spans_file),
+                      tracing_sample_ratio=0)
+    trace.get_tracer_provider().shutdown()
+    AsyncPGInstrumentor().uninstrument()
+
+
+def test_spans_follow_the_incoming_trace(client: TestClient, spans_file):
+    res = client.post("/participants", data=CompanyParticipant(full_name="A company", cuit="20379931694").json())
+    assert res.status_code == http.HTTPStatus.CREATED
+    participant_id = res.json()["id"]
+    # Sampled by the caller, so recorded even though no new trace is
+    sampled = {"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"}
+    res = client.get(f"/participants/{participant_id}", headers=sampled)
+    assert res.status_code == http.HTTPStatus.OK
+    res = client.patch(f"/participants/{participant_id}", data=UpdateCompanyParticipant(full_name="Renamed").json(),
+                       headers=sampled)
+    assert res.status_code == http.HTTPStatus.NO_CONTENT
+    assert client.delete(f"/participants/{participant_id}", headers=sampled).status_code == http.HTTPStatus.ACCEPTED
+
+    trace.get_tracer_provider().force_flush()
+    spans = [json.loads(line) for line in spans_file.read_text().splitlines()]
+    assert {span["context"]["trace_id"] for span in spans} == {f"0x{TRACE_ID}"}
+    by_name = {span["name"]: span for span in spans}
+    assert {"UpdateParticipant.update_to_persistance", "RetrievedParticipant.disable"} <= by_name.keys()
+    retrieval = by_name["RetrievedParticipant.from_persistance"]
+    assert retrieval["attributes"]["code.namespace"] == "logic.participants.business"
+    queries = [span for span in spans if span["attributes"].get("db.system") == "postgresql"]
+    assert queries
+    assert any(query["parent_id"] == retrieval["context"]["span_id"] for query in queries)
+